@@ -0,0 +1,115 @@
+"""Benchmark del dispatcher del worker contra un n8n falso local.
+
+Levanta un servidor HTTP que responde tras `--latency-ms` y procesa
+`--messages` mensajes con distintos niveles de concurrencia, sin RabbitMQ
+(una conexión falsa emula `add_callback_threadsafe` y el loop de pika).
+
+Uso (desde backend/):
+    python benchmarks/bench_worker_concurrency.py --messages 200 --latency-ms 50 --concurrency 1 4 16
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from modules.analysis.infrastructure.adapters.automation_notifier_http import HttpAutomationNotifier  # noqa: E402
+from modules.automation.infrastructure.worker import MessageDispatcher, make_notify_handler  # noqa: E402
+
+
+def start_fake_n8n(latency_seconds: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, como un n8n real detrás de un proxy
+        disable_nagle_algorithm = True
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(latency_seconds)
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.callbacks: 'queue.Queue' = queue.Queue()
+
+    def add_callback_threadsafe(self, cb) -> None:
+        self.callbacks.put(cb)
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.acked = 0
+        self.nacked = 0
+
+    def basic_ack(self, delivery_tag: int) -> None:
+        self.acked += 1
+
+    def basic_nack(self, delivery_tag: int, requeue: bool = False) -> None:
+        self.nacked += 1
+
+
+def run_once(url: str, messages: int, concurrency: int) -> float:
+    connection = FakeConnection()
+    channel = FakeChannel()
+    dispatcher = MessageDispatcher(connection, make_notify_handler(HttpAutomationNotifier(base_url=url)), concurrency)
+    body = json.dumps({'document_id': 1, 'company_id': 1, 'name': 'Doc', 'pdf_url': 'http://e.com/a.pdf'}).encode()
+
+    start = time.perf_counter()
+    sent = 0
+    # Emula el loop de pika: entrega mientras haya hueco (prefetch) y procesa callbacks de ack
+    while channel.acked + channel.nacked < messages:
+        while sent < messages and dispatcher.in_flight < concurrency:
+            sent += 1
+            dispatcher.on_message(channel, SimpleNamespace(delivery_tag=sent), None, body)
+        try:
+            connection.callbacks.get(timeout=0.01)()
+        except queue.Empty:
+            pass
+    elapsed = time.perf_counter() - start
+    dispatcher.shutdown()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+    for name in ('httpx', 'modules.automation.infrastructure.worker'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    server = start_fake_n8n(args.latency_ms / 1000.0)
+    url = f'http://127.0.0.1:{server.server_address[1]}/webhook'
+    print(f'messages={args.messages} n8n_latency_ms={args.latency_ms}')
+    for c in args.concurrency:
+        elapsed = run_once(url, args.messages, c)
+        print(f'concurrency={c:<4} elapsed={elapsed:7.2f}s throughput={args.messages / elapsed:8.1f} msg/s')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,7 @@ urlpatterns = [
     path('api/', include('modules.document.api.urls')),
     path('api/', include('modules.signer.api.urls')),
     path('api/', include('modules.analysis.api.urls')),
+    path('api/', include('modules.shared.api.urls')),
     path('api/auth/refresh', TokenRefreshView.as_view(), name='token_refresh'),
     # OpenAPI schema y UIs
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
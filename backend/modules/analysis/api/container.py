@@ -0,0 +1,91 @@
+from typing import Optional
+
+from django.conf import settings
+
+from modules.analysis.application.ports import AnalysisCache, AutomationNotifier
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.application.use_cases.analyze_text_in_chunks import AnalyzeTextInChunksUseCase
+from modules.analysis.application.use_cases.handle_analysis_webhook import HandleAnalysisWebhookUseCase
+from modules.analysis.application.use_cases.handle_analysis_webhook_batch import HandleAnalysisWebhookBatchUseCase
+from modules.analysis.application.use_cases.prescreen_documents import PrescreenDocumentsUseCase
+from modules.analysis.domain.risk_prescreen import DEFAULT_RULES, RiskPrescreenEngine, rules_from_config
+from modules.analysis.infrastructure.adapters.automation_notifier_http import HttpAutomationNotifier
+from modules.analysis.infrastructure.adapters.chunk_analyzer_http import HttpChunkAnalyzer
+from modules.analysis.infrastructure.adapters.pdf_fetcher_http import HttpPdfFetcher
+from modules.analysis.infrastructure.adapters.pdf_text_extractor_local import LocalPdfTextExtractor
+from modules.analysis.infrastructure.repositories.analysis_cache_repository_django import DjangoAnalysisCacheRepository
+from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    if not getattr(settings, 'ANALYSIS_CACHE_ENABLED', True):
+        return None
+    return DjangoAnalysisCacheRepository()
+
+
+def get_model_version() -> str:
+    return getattr(settings, 'ANALYSIS_MODEL_VERSION', 'v1')
+
+
+def get_risk_prescreen_engine() -> RiskPrescreenEngine:
+    config = getattr(settings, 'ANALYSIS_PRESCREEN_RULES', None)
+    return RiskPrescreenEngine(rules_from_config(config) if config else DEFAULT_RULES)
+
+
+def make_analyze_text_in_chunks_use_case() -> Optional[AnalyzeTextInChunksUseCase]:
+    if not getattr(settings, 'ANALYSIS_CHUNK_URL', ''):
+        return None
+    return AnalyzeTextInChunksUseCase(
+        chunk_analyzer=HttpChunkAnalyzer(),
+        cache=get_analysis_cache(),
+        model_version=get_model_version(),
+        chunk_chars=getattr(settings, 'ANALYSIS_CHUNK_CHARS', 8000),
+        overlap_chars=getattr(settings, 'ANALYSIS_CHUNK_OVERLAP_CHARS', 400),
+        concurrency=getattr(settings, 'ANALYSIS_CHUNK_CONCURRENCY', 4),
+    )
+
+
+def make_analyze_document_use_case(notifier: Optional[AutomationNotifier] = None) -> AnalyzeDocumentUseCase:
+    cache = get_analysis_cache()
+    extractor = LocalPdfTextExtractor() if getattr(settings, 'ANALYSIS_LOCAL_EXTRACTION', False) else None
+    return AnalyzeDocumentUseCase(
+        # El worker usa best_effort=False para que los fallos vayan a la cola de reintentos
+        notifier=notifier or HttpAutomationNotifier(best_effort=False),
+        analysis_commands=DjangoAnalysisRepository(),
+        # Solo se descarga el PDF si algo lo necesita (caché o extracción local)
+        pdf_fetcher=HttpPdfFetcher() if cache is not None or extractor is not None else None,
+        cache=cache,
+        text_extractor=extractor,
+        chunked=make_analyze_text_in_chunks_use_case() if extractor is not None else None,
+        chunk_threshold_chars=getattr(settings, 'ANALYSIS_CHUNK_THRESHOLD_CHARS', 20000),
+        model_version=get_model_version(),
+        # Sin extracción local no hay texto que puntuar
+        prescreen=(
+            get_risk_prescreen_engine()
+            if extractor is not None and getattr(settings, 'ANALYSIS_PRESCREEN_ENABLED', False) else None
+        ),
+        prescreen_policy=getattr(settings, 'ANALYSIS_PRESCREEN_POLICY', 'none'),
+        prescreen_threshold=getattr(settings, 'ANALYSIS_PRESCREEN_THRESHOLD', 0.2),
+    )
+
+
+def make_prescreen_documents_use_case() -> PrescreenDocumentsUseCase:
+    return PrescreenDocumentsUseCase(engine=get_risk_prescreen_engine(), analysis_commands=DjangoAnalysisRepository())
+
+
+def make_handle_analysis_webhook_use_case() -> HandleAnalysisWebhookUseCase:
+    return HandleAnalysisWebhookUseCase(
+        analysis_commands=DjangoAnalysisRepository(),
+        analysis_queries=DjangoAnalysisRepository(),
+        analysis_cache=get_analysis_cache(),
+        model_version=get_model_version(),
+    )
+
+
+def make_handle_analysis_webhook_batch_use_case() -> HandleAnalysisWebhookBatchUseCase:
+    return HandleAnalysisWebhookBatchUseCase(
+        analysis_commands=DjangoAnalysisRepository(),
+        chunk_size=getattr(settings, 'ANALYSIS_BATCH_CHUNK_SIZE', 500),
+        analysis_cache=get_analysis_cache(),
+        model_version=get_model_version(),
+    )
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import analysis_webhook
+from .views import analysis_batch_webhook, analysis_webhook
 
 
 urlpatterns = [
     path('webhooks/analysis/', analysis_webhook),
+    path('webhooks/analysis/batch/', analysis_batch_webhook),
 ]
 
@@ -2,20 +2,24 @@ from django.http import JsonResponse, HttpRequest
 from django.views.decorators.csrf import csrf_exempt
 import json
 
-from modules.analysis.application.use_cases.handle_analysis_webhook import HandleAnalysisWebhookUseCase
-from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+from modules.analysis.api.container import make_handle_analysis_webhook_batch_use_case, make_handle_analysis_webhook_use_case
+from modules.automation.infrastructure.webhook_dedup import get_webhook_dedup_store, webhook_key
 from django.conf import settings
 
 
+def _authorized(request: HttpRequest) -> bool:
+    expected = getattr(settings, 'AUTOMATION_API_KEY', None)
+    provided = request.headers.get('X-Automation-Key')
+    return bool(expected) and provided == expected
+
+
 @csrf_exempt
 def analysis_webhook(request: HttpRequest):
     if request.method != 'POST':
         return JsonResponse({'detail': 'Method not allowed'}, status=405)
 
     # Auth header
-    expected = getattr(settings, 'AUTOMATION_API_KEY', None)
-    provided = request.headers.get('X-Automation-Key')
-    if not expected or provided != expected:
+    if not _authorized(request):
         return JsonResponse({'detail': 'Unauthorized'}, status=401)
 
     try:
@@ -23,12 +27,18 @@ def analysis_webhook(request: HttpRequest):
     except Exception:
         return JsonResponse({'detail': 'Invalid JSON'}, status=400)
 
+    # Solo con X-Event-Id: tras un re-análisis n8n puede devolver el mismo payload y
+    # hay que aplicarlo; el upsert ya no escribe nada si la fila no cambia
+    dedup = get_webhook_dedup_store()
+    event_id = request.headers.get('X-Event-Id')
+    dedup_key = None
+    if dedup and event_id and isinstance(body, dict):
+        dedup_key = webhook_key('analysis', body, event_id)
+        if dedup.seen('analysis', dedup_key):
+            return JsonResponse({}, status=200)
+
     try:
-        use_case = HandleAnalysisWebhookUseCase(
-            analysis_commands=DjangoAnalysisRepository(),
-            analysis_queries=DjangoAnalysisRepository(),
-        )
-        result = use_case.execute(body)
+        result = make_handle_analysis_webhook_use_case().execute(body)
     except ValueError:
         return JsonResponse({'detail': 'Invalid payload'}, status=400)
     except Exception:
@@ -37,5 +47,57 @@ def analysis_webhook(request: HttpRequest):
 
     if result is None:
         return JsonResponse({}, status=204)
+    if dedup_key:
+        dedup.remember('analysis', dedup_key)
     return JsonResponse({}, status=200)
 
+
+
+def _parse_batch_body(request: HttpRequest) -> list:
+    """Elementos de un lote: array JSON, {"results": [...]} o NDJSON (una línea inválida cuenta como elemento inválido)."""
+    raw = request.body.decode('utf-8')
+    if 'ndjson' in (request.content_type or ''):
+        items = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+        return items
+    body = json.loads(raw or '[]')
+    if isinstance(body, dict) and isinstance(body.get('results'), list):
+        return body['results']
+    if not isinstance(body, list):
+        raise ValueError('Expected a list of results')
+    return body
+
+
+@csrf_exempt
+def analysis_batch_webhook(request: HttpRequest):
+    if request.method != 'POST':
+        return JsonResponse({'detail': 'Method not allowed'}, status=405)
+    if not _authorized(request):
+        return JsonResponse({'detail': 'Unauthorized'}, status=401)
+
+    try:
+        payloads = _parse_batch_body(request)
+    except ValueError:
+        return JsonResponse({'detail': 'Invalid JSON'}, status=400)
+    max_items = getattr(settings, 'ANALYSIS_BATCH_MAX_ITEMS', 5000)
+    if len(payloads) > max_items:
+        return JsonResponse({'detail': f'Too many results (max {max_items})'}, status=413)
+
+    items = make_handle_analysis_webhook_batch_use_case().execute(payloads)
+
+    counts: dict = {}
+    for item in items:
+        counts[item.status] = counts.get(item.status, 0) + 1
+    return JsonResponse({
+        'counts': counts,
+        'results': [
+            {k: v for k, v in (('index', i.index), ('document_id', i.document_id), ('status', i.status), ('error', i.error)) if v is not None}
+            for i in items
+        ],
+    }, status=200)
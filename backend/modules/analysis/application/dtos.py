@@ -2,6 +2,10 @@ from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
 
+# Estados de un análisis terminado con éxito (los workflows de n8n envían 'done'); solo estos se cachean
+COMPLETED_STATUSES = ('done', 'completed')
+
+
 @dataclass
 class AnalysisResultDTO:
     document_id: int
@@ -14,3 +18,20 @@ class AnalysisResultDTO:
     insights: List[Dict[str, Any]] = None       # list de hallazgos
     model_info: Dict[str, Any] = None           # metadatos del modelo
 
+
+
+@dataclass
+class AnalysisBatchItemDTO:
+    """Resultado de un elemento del webhook por lotes, en el mismo orden de entrada."""
+    index: int
+    status: str  # created | updated | unchanged | not_found | superseded | invalid
+    document_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class FetchedPdfDTO:
+    """PDF descargado a un fichero temporal; solo es válido dentro del `fetch` que lo devolvió."""
+    path: str
+    content_hash: str
+    size: int
@@ -1,9 +1,11 @@
-from typing import Protocol, Optional
-from .dtos import AnalysisResultDTO
+from typing import ContextManager, Protocol, Optional, List, Dict
+from .dtos import AnalysisResultDTO, FetchedPdfDTO
 
 
 class AnalysisResultCommandRepository(Protocol):
     def upsert(self, dto: AnalysisResultDTO) -> AnalysisResultDTO: ...
+    def upsert_many(self, dtos: List[AnalysisResultDTO]) -> Dict[int, str]: ...
+    def insert_provisional_many(self, dtos: List[AnalysisResultDTO]) -> int: ...
 
 
 class AnalysisResultQueryRepository(Protocol):
@@ -11,5 +13,30 @@ class AnalysisResultQueryRepository(Protocol):
 
 
 class AutomationNotifier(Protocol):
-    def notify_document_created(self, *, document_id: int, company_id: int, name: str, pdf_url: str) -> None: ...
+    def notify_document_created(
+        self, *, document_id: int, company_id: int, name: str, pdf_url: str, text: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> None: ...
 
+
+
+class PdfFetcher(Protocol):
+    def fetch(self, pdf_url: str) -> ContextManager[Optional[FetchedPdfDTO]]: ...
+
+
+class PdfTextExtractor(Protocol):
+    def extract(self, pdf: FetchedPdfDTO) -> Optional[str]: ...
+
+
+class AnalysisCache(Protocol):
+    def get(self, content_hash: str, model_version: str) -> Optional[AnalysisResultDTO]: ...
+    def bind_document(self, document_id: int, content_hash: str) -> None: ...
+    def put_for_documents(self, model_version: str, dtos: List[AnalysisResultDTO]) -> int: ...
+    def get_many(
+        self, content_hashes: List[str], model_version: str, kind: str = 'document',
+    ) -> Dict[str, AnalysisResultDTO]: ...
+    def put_many(self, model_version: str, results: Dict[str, AnalysisResultDTO]) -> None: ...
+
+
+class ChunkAnalyzer(Protocol):
+    def analyze_chunk(self, *, document_id: int, index: int, total: int, text: str) -> AnalysisResultDTO: ...
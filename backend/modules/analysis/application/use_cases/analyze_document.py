@@ -0,0 +1,88 @@
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from modules.analysis.application.ports import (
+    AnalysisCache,
+    AnalysisResultCommandRepository,
+    AutomationNotifier,
+    PdfFetcher,
+    PdfTextExtractor,
+)
+from modules.analysis.application.use_cases.analyze_text_in_chunks import AnalyzeTextInChunksUseCase
+from modules.analysis.application.use_cases.prescreen_documents import provisional_result
+from modules.analysis.domain.risk_prescreen import RiskPrescreenEngine
+
+
+@dataclass
+class AnalyzeDocumentUseCase:
+    """Procesa un DocumentCreatedEvent en el worker.
+
+    Si el mismo PDF (por hash de contenido) ya se analizó con la versión de
+    modelo actual, copia ese resultado al documento y no llama a n8n. Si no,
+    asocia el hash al documento (el webhook de análisis rellenará la caché),
+    extrae el texto en local si hay extractor y delega en n8n. Los textos de
+    más de `chunk_threshold_chars` se analizan por trozos (`chunked`) sin
+    pasar por el webhook.
+
+    Con `prescreen`, el texto extraído se puntúa en local y se guarda como
+    análisis provisional si el documento aún no tiene ninguno. En ese caso,
+    por debajo de `prescreen_threshold`, la política 'skip' se queda con
+    ese resultado (no llama a n8n) y 'deprioritise' lo envía con prioridad
+    baja. Devuelve 'cached', 'prescreened', 'chunked' o 'notified'.
+    """
+
+    notifier: AutomationNotifier
+    analysis_commands: AnalysisResultCommandRepository
+    pdf_fetcher: Optional[PdfFetcher] = None
+    cache: Optional[AnalysisCache] = None
+    text_extractor: Optional[PdfTextExtractor] = None
+    chunked: Optional[AnalyzeTextInChunksUseCase] = None
+    chunk_threshold_chars: int = 20000
+    model_version: str = 'v1'
+    prescreen: Optional[RiskPrescreenEngine] = None
+    prescreen_policy: str = 'none'  # none | skip | deprioritise
+    prescreen_threshold: float = 0.2
+
+    def execute(self, *, document_id: int, company_id: int, name: str, pdf_url: str) -> str:
+        text: Optional[str] = None
+        if self.pdf_fetcher is not None:
+            with self.pdf_fetcher.fetch(pdf_url) as pdf:
+                if pdf is not None:
+                    if self.cache is not None:
+                        cached = self.cache.get(pdf.content_hash, self.model_version)
+                        if cached is not None:
+                            self.analysis_commands.upsert(replace(cached, document_id=document_id))
+                            return 'cached'
+                        self.cache.bind_document(document_id, pdf.content_hash)
+                    if self.text_extractor is not None:
+                        # Sin texto (PDF escaneado o fallo) n8n sigue extrayéndolo desde pdf_url
+                        text = self.text_extractor.extract(pdf) or None
+
+        priority: Optional[str] = None
+        if text and self.prescreen is not None:
+            risk, labels = self.prescreen.score(text)
+            created = self.analysis_commands.insert_provisional_many([provisional_result(document_id, risk, labels)])
+            # Si ya había análisis (p. ej. reanálisis pedido por el usuario) no se salta n8n:
+            # el provisional no se guardó y el análisis quedaría en 'running' para siempre
+            if created and risk < self.prescreen_threshold:
+                if self.prescreen_policy == 'skip':
+                    return 'prescreened'
+                if self.prescreen_policy == 'deprioritise':
+                    priority = 'low'
+
+        if text and self.chunked is not None and len(text) > self.chunk_threshold_chars:
+            result = self.chunked.execute(document_id, text)
+            self.analysis_commands.upsert(result)
+            if self.cache is not None:
+                self.cache.put_for_documents(self.model_version, [result])
+            return 'chunked'
+
+        self.notifier.notify_document_created(
+            document_id=document_id,
+            company_id=company_id,
+            name=name,
+            pdf_url=pdf_url,
+            text=text,
+            priority=priority,
+        )
+        return 'notified'
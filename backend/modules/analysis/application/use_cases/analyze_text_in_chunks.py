@@ -0,0 +1,119 @@
+import contextvars
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from modules.analysis.application.dtos import COMPLETED_STATUSES, AnalysisResultDTO
+from modules.analysis.application.ports import AnalysisCache, ChunkAnalyzer
+from modules.analysis.domain.chunking import split_text
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(b'chunk\0' + text.encode('utf-8')).hexdigest()
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _unique(items: List[Any]) -> List[Any]:
+    seen = set()
+    out = []
+    for item in items:
+        key = _canonical(item)
+        if key not in seen:
+            seen.add(key)
+            out.append(item)
+    return out
+
+
+def merge_chunk_results(document_id: int, results: List[AnalysisResultDTO]) -> AnalysisResultDTO:
+    """Une los resultados parciales en orden de trozo; el mismo input da siempre el mismo resultado.
+
+    - summary: resúmenes no vacíos y distintos, en orden.
+    - labels, entities, insights: unión sin duplicados, en orden de aparición.
+    - risk_score: el máximo (una cláusula de riesgo basta para todo el documento).
+    - missing_topics: solo los que faltan en todos los trozos.
+    - status: el primero que no sea de éxito; si todos terminaron, el del primer trozo.
+    """
+    lists = [r.missing_topics for r in results]
+    if lists and all(isinstance(m, list) for m in lists):
+        common = set.intersection(*[{_canonical(t) for t in m} for m in lists])
+        missing_topics: Any = [t for t in _unique(lists[0]) if _canonical(t) in common]
+    else:
+        missing_topics = next((m for m in lists if m), [])
+    insights = [i for r in results if isinstance(r.insights, list) for i in r.insights]
+    first = results[0] if results else None
+    statuses = [r.status for r in results if r.status]
+    status = next((s for s in statuses if s.lower() not in COMPLETED_STATUSES), statuses[0] if statuses else None)
+    return AnalysisResultDTO(
+        document_id=document_id,
+        summary='\n\n'.join(_unique([r.summary.strip() for r in results if r.summary and r.summary.strip()])),
+        labels=_unique([label for r in results for label in (r.labels or [])]),
+        entities=_unique([e for r in results for e in (r.entities or [])]),
+        risk_score=max((r.risk_score for r in results), default=0.0),
+        status=status,
+        missing_topics=missing_topics,
+        insights=_unique(insights) if insights else (first.insights if first else []),
+        model_info={**((first.model_info or {}) if first else {}), 'chunks': len(results)},
+    )
+
+
+@dataclass
+class AnalyzeTextInChunksUseCase:
+    """Análisis map-reduce de documentos largos.
+
+    Trocea el texto, analiza en paralelo (como mucho `concurrency` a la vez)
+    los trozos que no están en caché y une los resultados. Si algún trozo
+    falla se relanza el primer error, pero los que sí terminaron quedan en
+    caché: el reintento solo repite los que faltan.
+    """
+
+    chunk_analyzer: ChunkAnalyzer
+    cache: Optional[AnalysisCache] = None
+    model_version: str = 'v1'
+    chunk_chars: int = 8000
+    overlap_chars: int = 400
+    concurrency: int = 4
+
+    def execute(self, document_id: int, text: str) -> AnalysisResultDTO:
+        chunks = split_text(text, self.chunk_chars, self.overlap_chars)
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        cached: Dict[str, AnalysisResultDTO] = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(sorted(set(hashes)), self.model_version, kind='chunk')
+
+        pending: List[int] = []
+        for i, h in enumerate(hashes):
+            # Trozos repetidos en el mismo documento se analizan una vez
+            if h not in cached and all(hashes[j] != h for j in pending):
+                pending.append(i)
+        outcomes = self._fan_out(document_id, chunks, pending)
+        fresh = {hashes[i]: r for i, r in zip(pending, outcomes) if not isinstance(r, Exception)}
+        if self.cache is not None and fresh:
+            self.cache.put_many(self.model_version, fresh)
+        errors = [r for r in outcomes if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+
+        return merge_chunk_results(document_id, [cached.get(h) or fresh[h] for h in hashes])
+
+    def _fan_out(self, document_id: int, chunks: List[str], indexes: List[int]) -> list:
+        def _analyze(index: int) -> AnalysisResultDTO | Exception:
+            try:
+                return self.chunk_analyzer.analyze_chunk(
+                    document_id=document_id, index=index, total=len(chunks), text=chunks[index],
+                )
+            except Exception as exc:
+                return exc
+
+        if not indexes:
+            return []
+        workers = max(1, min(int(self.concurrency), len(indexes)))
+        if workers == 1:
+            return [_analyze(i) for i in indexes]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-chunks') as pool:
+            futures = [pool.submit(contextvars.copy_context().run, _analyze, i) for i in indexes]
+            return [f.result() for f in futures]
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from modules.analysis.application.dtos import AnalysisBatchItemDTO, AnalysisResultDTO
+from modules.analysis.application.ports import AnalysisCache, AnalysisResultCommandRepository
+from modules.analysis.application.use_cases.handle_analysis_webhook import parse_analysis_payload
+
+
+@dataclass
+class HandleAnalysisWebhookBatchUseCase:
+    """Aplica un lote de resultados de análisis con upserts masivos por bloques.
+
+    Cada elemento se valida por separado: uno inválido no rechaza el lote.
+    Si un documento aparece varias veces gana el último resultado.
+    """
+
+    analysis_commands: AnalysisResultCommandRepository
+    chunk_size: int = 500
+    analysis_cache: Optional[AnalysisCache] = None
+    model_version: str = 'v1'
+
+    def execute(self, payloads: List[Any]) -> List[AnalysisBatchItemDTO]:
+        items: List[AnalysisBatchItemDTO] = []
+        latest: Dict[int, AnalysisResultDTO] = {}
+        latest_index: Dict[int, int] = {}
+        for index, payload in enumerate(payloads):
+            if not isinstance(payload, dict):
+                items.append(AnalysisBatchItemDTO(index=index, status='invalid', error='Invalid payload'))
+                continue
+            try:
+                dto = parse_analysis_payload(payload)
+            except (ValueError, TypeError) as exc:
+                items.append(AnalysisBatchItemDTO(index=index, status='invalid', error=str(exc)))
+                continue
+            previous = latest_index.get(dto.document_id)
+            if previous is not None:
+                items[previous].status = 'superseded'
+            latest[dto.document_id] = dto
+            latest_index[dto.document_id] = index
+            items.append(AnalysisBatchItemDTO(index=index, status='pending', document_id=dto.document_id))
+
+        dtos = list(latest.values())
+        outcomes: Dict[int, str] = {}
+        for start in range(0, len(dtos), self.chunk_size):
+            chunk = dtos[start:start + self.chunk_size]
+            chunk_outcomes = self.analysis_commands.upsert_many(chunk)
+            outcomes.update(chunk_outcomes)
+            if self.analysis_cache is not None:
+                written = [dto for dto in chunk if chunk_outcomes.get(dto.document_id) in ('created', 'updated')]
+                self.analysis_cache.put_for_documents(self.model_version, written)
+
+        for document_id, index in latest_index.items():
+            items[index].status = outcomes.get(document_id, 'not_found')
+        return items
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+from modules.analysis.application.dtos import AnalysisResultDTO
+from modules.analysis.application.ports import AnalysisResultCommandRepository
+from modules.analysis.domain.risk_prescreen import RiskPrescreenEngine
+
+
+PRESCREEN_STATUS = 'prescreened'
+
+
+def provisional_result(document_id: int, risk: float, labels: List[str]) -> AnalysisResultDTO:
+    return AnalysisResultDTO(
+        document_id=document_id,
+        summary='',
+        labels=labels,
+        entities=[],
+        risk_score=risk,
+        status=PRESCREEN_STATUS,
+        model_info={'engine': 'prescreen'},
+    )
+
+
+@dataclass
+class PrescreenDocumentsUseCase:
+    """Puntúa en lote textos ya extraídos y guarda un análisis provisional.
+
+    Solo se crea el análisis de los documentos que aún no tienen ninguno: el
+    resultado del análisis remoto nunca se pisa con uno provisional.
+    Devuelve cuántos se crearon.
+    """
+
+    engine: RiskPrescreenEngine
+    analysis_commands: AnalysisResultCommandRepository
+
+    def execute(self, texts: Dict[int, str]) -> int:
+        document_ids = list(texts)
+        scores = self.engine.score_many([texts[i] for i in document_ids])
+        return self.analysis_commands.insert_provisional_many([
+            provisional_result(document_id, risk, labels)
+            for document_id, (risk, labels) in zip(document_ids, scores)
+        ])
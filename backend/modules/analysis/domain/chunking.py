@@ -0,0 +1,60 @@
+"""Troceado de texto para el análisis map-reduce de documentos largos.
+
+Los cortes dependen del contenido (CRC de cada línea), no de posiciones
+absolutas: editar una sección solo cambia los trozos que la contienen y el
+resto conserva su hash, así que sus resultados salen de la caché.
+"""
+import zlib
+from typing import List
+
+
+# Un corte "natural" tras ~1 de cada BOUNDARY_DIVISOR líneas, una vez superado el mínimo
+BOUNDARY_DIVISOR = 4
+
+
+def _split_long_line(line: str, max_chars: int) -> List[str]:
+    parts: List[str] = []
+    while len(line) > max_chars:
+        cut = line.rfind(' ', max_chars // 2, max_chars)
+        cut = cut if cut > 0 else max_chars
+        parts.append(line[:cut].strip())
+        line = line[cut:].strip()
+    if line:
+        parts.append(line)
+    return parts
+
+
+def split_text(text: str, chunk_chars: int, overlap_chars: int = 0) -> List[str]:
+    """Trozos de como mucho ~`chunk_chars` caracteres (más el solape) en orden.
+
+    Cada trozo empieza con el final (hasta `overlap_chars`) de la última
+    línea del anterior, para no perder contexto en las fronteras.
+    """
+    units: List[str] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            units.extend(_split_long_line(line, chunk_chars))
+    if not units:
+        return []
+
+    min_chars = chunk_chars // 2
+    groups: List[List[str]] = [[]]
+    size = 0
+    for index, unit in enumerate(units):
+        groups[-1].append(unit)
+        size += len(unit) + 1
+        following = len(units[index + 1]) + 1 if index + 1 < len(units) else 0
+        natural_cut = size >= min_chars and zlib.crc32(unit.encode('utf-8')) % BOUNDARY_DIVISOR == 0
+        if following and (natural_cut or size + following > chunk_chars):
+            groups.append([])
+            size = 0
+
+    chunks: List[str] = []
+    for index, group in enumerate(groups):
+        body = '\n'.join(group)
+        if index and overlap_chars > 0:
+            tail = groups[index - 1][-1][-overlap_chars:]
+            body = f'{tail}\n{body}'
+        chunks.append(body)
+    return chunks
@@ -0,0 +1,105 @@
+"""Pre-evaluación local de riesgo por reglas de cláusulas/palabras clave.
+
+Cada regla tiene un peso (0-1) y una lista de términos; se activa si alguno
+aparece en el texto. El riesgo combina las reglas activas como un OR
+probabilístico: 1 - Π(1 - peso). Para lotes se construye la matriz
+documentos × términos y se puntúa con productos matriciales (NumPy si está
+instalado; si no, el mismo cálculo en Python puro).
+"""
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+@dataclass(frozen=True)
+class RiskRule:
+    label: str
+    weight: float
+    terms: Tuple[str, ...]
+
+
+# Reglas por defecto para contratos en español (ANALYSIS_PRESCREEN_RULES las sustituye)
+DEFAULT_RULES: Tuple[RiskRule, ...] = (
+    RiskRule('penalizacion', 0.35, ('penalizacion', 'penalidad', 'clausula penal', 'multa')),
+    RiskRule('indemnizacion', 0.3, ('indemnizacion', 'indemnizara', 'daños y perjuicios')),
+    RiskRule('responsabilidad_ilimitada', 0.45, ('responsabilidad ilimitada', 'sin limite de responsabilidad')),
+    RiskRule('renovacion_automatica', 0.2, ('renovacion automatica', 'prorroga automatica', 'se renovara automaticamente')),
+    RiskRule('exclusividad', 0.2, ('exclusividad', 'en exclusiva', 'no competencia')),
+    RiskRule('rescision_unilateral', 0.3, ('rescision unilateral', 'resolver unilateralmente', 'terminacion unilateral')),
+    RiskRule('cesion_datos', 0.25, ('cesion de datos', 'datos personales', 'transferencia internacional')),
+    RiskRule('jurisdiccion_extranjera', 0.2, ('jurisdiccion extranjera', 'arbitraje internacional', 'leyes de')),
+)
+
+
+def normalize(text: str) -> str:
+    """Minúsculas sin tildes y con espacios colapsados: los términos se comparan así."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', stripped)
+
+
+def rules_from_config(config: Iterable[dict]) -> Tuple[RiskRule, ...]:
+    return tuple(
+        RiskRule(str(item['label']), float(item['weight']), tuple(normalize(t) for t in item['terms']))
+        for item in config
+    )
+
+
+class RiskPrescreenEngine:
+    def __init__(self, rules: Sequence[RiskRule] = DEFAULT_RULES) -> None:
+        self.rules = tuple(rules)
+        self.terms: List[str] = sorted({normalize(t) for rule in self.rules for t in rule.terms})
+        index = {term: i for i, term in enumerate(self.terms)}
+        # Términos más largos primero: "clausula penal" antes que "clausula"
+        alternation = '|'.join(re.escape(t) for t in sorted(self.terms, key=len, reverse=True))
+        self._pattern = re.compile(rf'\b(?:{alternation})\b') if self.terms else None
+        self._term_index = index
+        self._rule_terms = [[index[normalize(t)] for t in rule.terms] for rule in self.rules]
+        # log(1 - peso) por regla; el riesgo es 1 - exp(Σ log(1 - peso) de las activas)
+        self._log_keep = [math.log1p(-min(rule.weight, 0.999999)) for rule in self.rules]
+
+    def term_matrix(self, texts: Sequence[str]) -> List[List[int]]:
+        """Ocurrencias de cada término (columnas) en cada texto (filas)."""
+        rows: List[List[int]] = []
+        for text in texts:
+            row = [0] * len(self.terms)
+            if self._pattern is not None:
+                for match in self._pattern.finditer(normalize(text)):
+                    row[self._term_index[match.group(0)]] += 1
+            rows.append(row)
+        return rows
+
+    def score_many(self, texts: Sequence[str]) -> List[Tuple[float, List[str]]]:
+        """(riesgo 0-1, etiquetas de las reglas activas) para cada texto."""
+        if not texts:
+            return []
+        counts = self.term_matrix(texts)
+        if np is not None:
+            fired, risks = self._score_numpy(counts)
+        else:
+            fired = [[any(row[t] for t in terms) for terms in self._rule_terms] for row in counts]
+            risks = [1.0 - math.exp(sum(lk for lk, on in zip(self._log_keep, row) if on)) for row in fired]
+        return [
+            (round(float(risk), 4), [rule.label for rule, on in zip(self.rules, row) if on])
+            for risk, row in zip(risks, fired)
+        ]
+
+    def _score_numpy(self, counts: List[List[int]]) -> Tuple[List[List[bool]], List[float]]:
+        presence = (np.asarray(counts, dtype=np.float64) > 0).astype(np.float64)
+        membership = np.zeros((len(self.terms), len(self.rules)), dtype=np.float64)
+        for r, terms in enumerate(self._rule_terms):
+            membership[terms, r] = 1.0
+        # (docs × términos) · (términos × reglas) → reglas activas; · log(1 - peso) → riesgo
+        fired = (presence @ membership) > 0
+        risks = 1.0 - np.exp(fired.astype(np.float64) @ np.asarray(self._log_keep, dtype=np.float64))
+        return fired.tolist(), risks.tolist()
+
+    def score(self, text: str) -> Tuple[float, List[str]]:
+        return self.score_many([text])[0]
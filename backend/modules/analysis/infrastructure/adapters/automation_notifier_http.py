@@ -1,16 +1,23 @@
 from typing import Optional
-import httpx
 from django.conf import settings
 
 from modules.analysis.application.ports import AutomationNotifier
+from modules.shared.infrastructure.deadline import timeout_for
+from modules.shared.infrastructure.http_clients import get_http_client
+from modules.shared.infrastructure.resilience import get_upstream_guard
 
 
 class HttpAutomationNotifier(AutomationNotifier):
-    def __init__(self, base_url: Optional[str] = None, timeout_seconds: float = 10.0) -> None:
+    def __init__(self, base_url: Optional[str] = None, timeout_seconds: float = 10.0, best_effort: bool = True) -> None:
         self.base_url = (base_url or getattr(settings, 'N8N_WEBHOOK_URL', '')).rstrip('/')
         self.timeout_seconds = timeout_seconds
+        # El worker usa best_effort=False para que los fallos vayan a la cola de reintentos
+        self.best_effort = best_effort
 
-    def notify_document_created(self, *, document_id: int, company_id: int, name: str, pdf_url: str) -> None:
+    def notify_document_created(
+        self, *, document_id: int, company_id: int, name: str, pdf_url: str, text: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> None:
         if not self.base_url:
             return
         headers = {
@@ -26,10 +33,25 @@ class HttpAutomationNotifier(AutomationNotifier):
                 'pdf_url': pdf_url,
             }
         }
+        if text is not None:
+            # Texto ya extraído por el worker: n8n puede saltarse la extracción remota
+            body['document']['text'] = text
+        if priority is not None:
+            # 'low' si la pre-evaluación local lo ve de bajo riesgo: n8n puede encolarlo detrás
+            body['document']['priority'] = priority
         try:
-            with httpx.Client(timeout=self.timeout_seconds) as client:
-                client.post(self.base_url, json=body, headers=headers)
+            client = get_http_client(self.base_url)
+            timeout = timeout_for(self.timeout_seconds, 'n8n')
+            # Con el circuito abierto se lanza UpstreamUnavailable sin llamar a n8n
+            with get_upstream_guard('n8n').protect() as call:
+                resp = client.post(self.base_url, json=body, headers=headers, timeout=timeout)
+                if resp.status_code >= 500:
+                    call.mark_failure()
+            if not self.best_effort:
+                resp.raise_for_status()
         except Exception:
+            if not self.best_effort:
+                raise
             # Best-effort: no levantar excepción al flujo de creación
             return
 
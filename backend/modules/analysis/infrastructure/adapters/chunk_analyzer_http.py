@@ -0,0 +1,44 @@
+from typing import Optional
+
+from django.conf import settings
+
+from modules.analysis.application.dtos import AnalysisResultDTO
+from modules.analysis.application.ports import ChunkAnalyzer
+from modules.analysis.application.use_cases.handle_analysis_webhook import parse_analysis_payload
+from modules.shared.infrastructure.deadline import timeout_for
+from modules.shared.infrastructure.http_clients import get_http_client
+from modules.shared.infrastructure.resilience import get_upstream_guard
+
+
+class HttpChunkAnalyzer(ChunkAnalyzer):
+    """Analiza un trozo de texto con una llamada síncrona a n8n (ANALYSIS_CHUNK_URL).
+
+    El flujo responde en la misma petición con el JSON que enviaría al
+    webhook de análisis (summary, labels, entities, risk_score...).
+    """
+
+    def __init__(self, url: Optional[str] = None, timeout_seconds: float = 120.0) -> None:
+        self.url = url or getattr(settings, 'ANALYSIS_CHUNK_URL', '')
+        self.timeout_seconds = timeout_seconds
+
+    def analyze_chunk(self, *, document_id: int, index: int, total: int, text: str) -> AnalysisResultDTO:
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Automation-Key': getattr(settings, 'AUTOMATION_API_KEY', ''),
+        }
+        body = {
+            'event': 'analyze_chunk',
+            'document_id': document_id,
+            'chunk': {'index': index, 'total': total, 'text': text},
+        }
+        client = get_http_client(self.url)
+        timeout = timeout_for(self.timeout_seconds, 'n8n')
+        with get_upstream_guard('n8n').protect() as call:
+            resp = client.post(self.url, json=body, headers=headers, timeout=timeout)
+            if resp.status_code >= 500:
+                call.mark_failure()
+        resp.raise_for_status()
+        payload = resp.json()
+        if not isinstance(payload, dict):
+            raise ValueError('Chunk analysis response must be a JSON object')
+        return parse_analysis_payload({**payload, 'document_id': document_id})
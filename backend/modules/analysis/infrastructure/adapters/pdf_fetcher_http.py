@@ -0,0 +1,68 @@
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+from modules.analysis.application.dtos import FetchedPdfDTO
+from modules.analysis.application.ports import PdfFetcher
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.deadline import timeout_for
+from modules.shared.infrastructure.http_clients import get_http_client
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class PdfTooLarge(Exception):
+    pass
+
+
+class HttpPdfFetcher(PdfFetcher):
+    """Descarga el PDF en streaming a un fichero temporal calculando su sha256.
+
+    El fichero se borra al salir del `with`; nunca se carga entero en memoria.
+    """
+
+    def __init__(self, timeout_seconds: float = 30.0, max_bytes: Optional[int] = None) -> None:
+        self.timeout_seconds = timeout_seconds
+        self.max_bytes = max_bytes or getattr(settings, 'ANALYSIS_PDF_MAX_BYTES', 50 * 1024 * 1024)
+
+    @contextmanager
+    def fetch(self, pdf_url: str) -> Iterator[Optional[FetchedPdfDTO]]:
+        """Produce el PDF descargado, o None si no se pudo descargar (el análisis sigue sin él)."""
+        fd, path = tempfile.mkstemp(prefix='analysis-', suffix='.pdf')
+        try:
+            try:
+                pdf = self._download(pdf_url, fd, path)
+            except DeadlineExceeded:
+                raise
+            except Exception:
+                logger.warning('Could not download PDF %s for analysis', pdf_url, exc_info=True)
+                pdf = None
+            yield pdf
+        finally:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def _download(self, pdf_url: str, fd: int, path: str) -> FetchedPdfDTO:
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, 'wb') as out:
+            client = get_http_client(pdf_url)
+            with client.stream('GET', pdf_url, timeout=timeout_for(self.timeout_seconds, 'pdf')) as resp:
+                resp.raise_for_status()
+                for chunk in resp.iter_bytes(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise PdfTooLarge(f'PDF larger than {self.max_bytes} bytes')
+                    digest.update(chunk)
+                    out.write(chunk)
+        return FetchedPdfDTO(path=path, content_hash=digest.hexdigest(), size=size)
@@ -0,0 +1,180 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional
+
+from django.conf import settings
+
+from modules.analysis.application.dtos import FetchedPdfDTO
+from modules.analysis.application.ports import PdfTextExtractor
+from modules.analysis.infrastructure.pdf_text import extract_text
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.deadline import timeout_for
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_evict_lock = threading.Lock()
+_last_evict = 0.0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: el worker tiene hilos (pika, dispatcher) y fork con hilos no es seguro
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'ANALYSIS_EXTRACT_PROCESSES', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _recycle_pool(pool: ProcessPoolExecutor) -> None:
+    """Mata los procesos del pool y lo descarta; el siguiente submit crea otro.
+
+    `future.cancel()` no para una extracción que ya está en marcha: un PDF
+    patológico dejaría ocupado el proceso y las siguientes se encolarían
+    detrás hasta su timeout.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((getattr(pool, '_processes', None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+    metrics.inc('pdf_text_extraction_pool_recycles_total')
+
+
+def evict_text_cache(cache_dir: str, max_bytes: int, ttl_seconds: float) -> int:
+    """Borra los textos caducados y, si se supera `max_bytes`, los de uso más antiguo. Devuelve cuántos."""
+    entries = []
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    cutoff = time.time() - ttl_seconds
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    # El mtime se actualiza en cada acierto: ordenar por él es LRU
+    for mtime, size, path in sorted(entries):
+        if mtime > cutoff and total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        metrics.inc('pdf_text_cache_evictions_total', removed)
+    return removed
+
+
+class LocalPdfTextExtractor(PdfTextExtractor):
+    """Extrae el texto en un pool de procesos (CPU) y lo guarda en disco por hash de contenido.
+
+    El mismo PDF subido por varios documentos se extrae una sola vez. Un
+    fallo o timeout devuelve None: el análisis sigue con el PDF.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        cache_max_bytes: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        evict_interval_seconds: Optional[float] = None,
+    ) -> None:
+        self.cache_dir = str(cache_dir or getattr(settings, 'ANALYSIS_TEXT_CACHE_DIR'))
+        self.timeout_seconds = timeout_seconds or getattr(settings, 'ANALYSIS_EXTRACT_TIMEOUT_SECONDS', 60.0)
+        self.cache_max_bytes = cache_max_bytes or getattr(settings, 'ANALYSIS_TEXT_CACHE_MAX_BYTES', 1024 ** 3)
+        self.cache_ttl_seconds = cache_ttl_seconds or getattr(settings, 'ANALYSIS_TEXT_CACHE_TTL_SECONDS', 30 * 86400.0)
+        self.evict_interval_seconds = (
+            evict_interval_seconds if evict_interval_seconds is not None
+            else getattr(settings, 'ANALYSIS_TEXT_CACHE_EVICT_SECONDS', 300.0)
+        )
+
+    def _cache_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, content_hash[:2], f'{content_hash}.txt')
+
+    def cached_text(self, content_hash: str) -> Optional[str]:
+        path = self._cache_path(content_hash)
+        try:
+            with open(path, encoding='utf-8') as fh:
+                text = fh.read()
+            # Marca de uso para la expulsión LRU
+            os.utime(path)
+            return text
+        except FileNotFoundError:
+            return None
+
+    def extract(self, pdf: FetchedPdfDTO) -> Optional[str]:
+        cached = self.cached_text(pdf.content_hash)
+        if cached is not None:
+            metrics.inc('pdf_text_extractions_total', outcome='cache_hit')
+            return cached
+        path = self._cache_path(pdf.content_hash)
+
+        started = time.monotonic()
+        future = None
+        pool = _get_pool()
+        try:
+            future = pool.submit(extract_text, pdf.path)
+            text = future.result(timeout=timeout_for(self.timeout_seconds, 'pdf_extract'))
+        except DeadlineExceeded:
+            raise
+        except FutureTimeout:
+            logger.warning('Local text extraction timed out for %s; recycling the pool', pdf.content_hash)
+            _recycle_pool(pool)
+            metrics.inc('pdf_text_extractions_total', outcome='timeout')
+            return None
+        except Exception:
+            if future is not None:
+                # Si ya empezó, el proceso termina la extracción y el resultado se descarta
+                future.cancel()
+            logger.warning('Local text extraction failed for %s', pdf.content_hash, exc_info=True)
+            metrics.inc('pdf_text_extractions_total', outcome='failed')
+            return None
+        metrics.observe('pdf_text_extraction_seconds', time.monotonic() - started)
+        metrics.inc('pdf_text_extractions_total', outcome='extracted')
+        self._store(path, text)
+        self._maybe_evict()
+        return text
+
+    def _store(self, path: str, text: str) -> None:
+        # Escritura atómica: otro worker nunca lee un fichero a medias
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+
+    def _maybe_evict(self) -> None:
+        global _last_evict
+        with _evict_lock:
+            now = time.monotonic()
+            if now - _last_evict < self.evict_interval_seconds:
+                return
+            _last_evict = now
+        evict_text_cache(self.cache_dir, self.cache_max_bytes, self.cache_ttl_seconds)
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from modules.analysis.api.container import make_prescreen_documents_use_case
+from modules.analysis.infrastructure.adapters.pdf_text_extractor_local import LocalPdfTextExtractor
+from modules.document.infrastructure.django_app.models import Document
+
+
+class Command(BaseCommand):
+    help = 'Score documents without analysis with the local risk pre-screen (text from the extraction cache)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--company-id', type=int, default=None)
+
+    def handle(self, *args, **options):
+        use_case = make_prescreen_documents_use_case()
+        extractor = LocalPdfTextExtractor()
+        docs = Document.objects.filter(content_hash__isnull=False, analysis__isnull=True)  # type: ignore[attr-defined]
+        if options['company_id'] is not None:
+            docs = docs.filter(company_id=options['company_id'])
+
+        started = time.monotonic()
+        last_id, created, without_text = 0, 0, 0
+        while True:
+            # Paginación por id: los ya puntuados salen del filtro, pero los que no tienen texto no
+            batch = list(
+                docs.filter(id__gt=last_id).order_by('id').values_list('id', 'content_hash')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            texts = {}
+            for document_id, content_hash in batch:
+                text = extractor.cached_text(content_hash)
+                if text:
+                    texts[document_id] = text
+                else:
+                    without_text += 1
+            if texts:
+                created += use_case.execute(texts)
+        self.stdout.write(self.style.SUCCESS(
+            f'Pre-screened {created} documents in {time.monotonic() - started:.1f}s '
+            f'({without_text} without extracted text)'
+        ))
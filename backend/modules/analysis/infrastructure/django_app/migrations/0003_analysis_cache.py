@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0002_documentanalysis_insights_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('model_version', models.CharField(max_length=50)),
+                ('summary', models.TextField(blank=True, default='')),
+                ('labels', models.JSONField(default=list)),
+                ('entities', models.JSONField(default=list)),
+                ('risk_score', models.FloatField(default=0.0)),
+                ('missing_topics', models.JSONField(default=list)),
+                ('insights', models.JSONField(default=list)),
+                ('model_info', models.JSONField(default=dict)),
+                ('status', models.CharField(blank=True, max_length=50, null=True)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'analysis_result_cache',
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'model_version'), name='uniq_analysis_cache_key')],
+            },
+        ),
+    ]
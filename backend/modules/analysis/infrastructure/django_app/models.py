@@ -17,3 +17,31 @@ class DocumentAnalysis(models.Model):
     class Meta:
         db_table = 'document_analysis'
 
+
+
+class AnalysisCacheEntry(models.Model):
+    """Resultado de análisis por contenido del PDF (sha256) y versión de modelo.
+
+    Lo comparten todos los documentos y empresas con el mismo PDF. Se expulsa
+    por TTL y, por encima de ANALYSIS_CACHE_MAX_ENTRIES, por último uso (LRU).
+    """
+
+    content_hash = models.CharField(max_length=64)
+    model_version = models.CharField(max_length=50)
+    summary = models.TextField(blank=True, default='')
+    labels = models.JSONField(default=list)
+    entities = models.JSONField(default=list)
+    risk_score = models.FloatField(default=0.0)
+    missing_topics = models.JSONField(default=list)
+    insights = models.JSONField(default=list)
+    model_info = models.JSONField(default=dict)
+    status = models.CharField(max_length=50, null=True, blank=True)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'analysis_result_cache'
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'model_version'], name='uniq_analysis_cache_key'),
+        ]
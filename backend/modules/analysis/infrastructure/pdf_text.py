@@ -0,0 +1,29 @@
+"""Extracción de texto de PDFs sin Django (se ejecuta en procesos del pool).
+
+Usa `pypdf`, que resuelve las codificaciones de fuente y los mapas ToUnicode.
+Si el resultado no parece texto legible (PDF escaneado, fuentes sin mapa
+Unicode) se devuelve '' para que n8n siga extrayéndolo desde pdf_url.
+"""
+import unicodedata
+
+from pypdf import PdfReader
+
+
+# Por encima de esta proporción de caracteres de control o no decodificables, el texto no es fiable
+MAX_UNREADABLE_RATIO = 0.05
+
+
+def extract_text(path: str) -> str:
+    reader = PdfReader(path)
+    text = '\n'.join((page.extract_text() or '') for page in reader.pages).strip()
+    return text if is_readable(text) else ''
+
+
+def is_readable(text: str) -> bool:
+    if not text:
+        return False
+    unreadable = sum(
+        1 for c in text
+        if c == '\ufffd' or (unicodedata.category(c) in ('Cc', 'Co', 'Cs') and c not in '\n\r\t')
+    )
+    return unreadable / len(text) <= MAX_UNREADABLE_RATIO
@@ -0,0 +1,153 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from modules.analysis.application.dtos import COMPLETED_STATUSES, AnalysisResultDTO
+from modules.analysis.application.ports import AnalysisCache
+from modules.analysis.infrastructure.django_app.models import AnalysisCacheEntry
+from modules.document.infrastructure.django_app.models import Document
+from modules.shared.infrastructure.metrics import metrics
+
+
+CACHED_FIELDS = ('summary', 'labels', 'entities', 'risk_score', 'missing_topics', 'insights', 'model_info', 'status')
+
+_evict_lock = threading.Lock()
+_last_evict = 0.0
+
+
+# Prefijo de métricas por tipo de entrada: PDFs completos o trozos del análisis map-reduce
+METRIC_PREFIXES = {'document': 'analysis_cache', 'chunk': 'analysis_chunk_cache'}
+
+
+def _cacheable(dto: AnalysisResultDTO) -> bool:
+    # Un resultado fallido o parcial se serviría como 'cached' y el documento no volvería a n8n
+    return (dto.status or '').lower() in COMPLETED_STATUSES
+
+
+def _record_lookup(outcome: str, kind: str) -> None:
+    prefix = METRIC_PREFIXES[kind]
+    metrics.inc(f'{prefix}_total', outcome=outcome)
+    hits = metrics.counter_value(f'{prefix}_total', outcome='hit')
+    misses = metrics.counter_value(f'{prefix}_total', outcome='miss')
+    metrics.set_gauge(f'{prefix}_hit_ratio', hits / (hits + misses))
+
+
+class DjangoAnalysisCacheRepository(AnalysisCache):
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        evict_interval_seconds: Optional[float] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else getattr(settings, 'ANALYSIS_CACHE_TTL_SECONDS', 30 * 86400.0)
+        self.max_entries = max_entries if max_entries is not None else getattr(settings, 'ANALYSIS_CACHE_MAX_ENTRIES', 100000)
+        self.evict_interval_seconds = (
+            evict_interval_seconds if evict_interval_seconds is not None
+            else getattr(settings, 'ANALYSIS_CACHE_EVICT_SECONDS', 300.0)
+        )
+
+    def get(self, content_hash: str, model_version: str) -> Optional[AnalysisResultDTO]:
+        return self.get_many([content_hash], model_version).get(content_hash)
+
+    def get_many(
+        self, content_hashes: List[str], model_version: str, kind: str = 'document',
+    ) -> Dict[str, AnalysisResultDTO]:
+        """Entradas vigentes para los hashes pedidos; las encontradas cuentan como uso (LRU)."""
+        if not content_hashes:
+            return {}
+        now = timezone.now()
+        entries = list(
+            AnalysisCacheEntry.objects.filter(  # type: ignore[attr-defined]
+                content_hash__in=content_hashes,
+                model_version=model_version,
+                created_at__gt=now - timedelta(seconds=self.ttl_seconds),
+            ).only('id', 'content_hash', *CACHED_FIELDS)
+        )
+        if entries:
+            AnalysisCacheEntry.objects.filter(id__in=[e.id for e in entries]).update(  # type: ignore[attr-defined]
+                hits=F('hits') + 1, last_used_at=now,
+            )
+        found = {
+            # document_id lo pone quien copia el resultado
+            e.content_hash: AnalysisResultDTO(document_id=0, **{name: getattr(e, name) for name in CACHED_FIELDS})
+            for e in entries
+        }
+        for content_hash in set(content_hashes):
+            _record_lookup('hit' if content_hash in found else 'miss', kind)
+        return found
+
+    def bind_document(self, document_id: int, content_hash: str) -> None:
+        Document.objects.filter(id=document_id).update(content_hash=content_hash)  # type: ignore[attr-defined]
+
+    def put_for_documents(self, model_version: str, dtos: List[AnalysisResultDTO]) -> int:
+        """Guarda en caché los resultados terminados de los documentos con hash conocido. Devuelve cuántos."""
+        dtos = [dto for dto in dtos if _cacheable(dto)]
+        if not dtos:
+            return 0
+        hashes = dict(
+            Document.objects.filter(  # type: ignore[attr-defined]
+                id__in=[dto.document_id for dto in dtos], content_hash__isnull=False,
+            ).values_list('id', 'content_hash')
+        )
+        results = {hashes[dto.document_id]: dto for dto in dtos if hashes.get(dto.document_id)}
+        self.put_many(model_version, results)
+        return len(results)
+
+    def put_many(self, model_version: str, results: Dict[str, AnalysisResultDTO]) -> None:
+        results = {content_hash: dto for content_hash, dto in results.items() if _cacheable(dto)}
+        if not results:
+            return
+        now = timezone.now()
+        AnalysisCacheEntry.objects.bulk_create(  # type: ignore[attr-defined]
+            [
+                AnalysisCacheEntry(
+                    content_hash=content_hash,
+                    model_version=model_version,
+                    summary=dto.summary,
+                    labels=dto.labels,
+                    entities=dto.entities,
+                    risk_score=dto.risk_score,
+                    missing_topics=dto.missing_topics or [],
+                    insights=dto.insights or [],
+                    model_info=dto.model_info or {},
+                    status=dto.status,
+                    last_used_at=now,
+                )
+                for content_hash, dto in results.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['content_hash', 'model_version'],
+            update_fields=list(CACHED_FIELDS) + ['created_at', 'last_used_at'],
+        )
+        self._maybe_evict()
+
+    def _maybe_evict(self) -> None:
+        global _last_evict
+        with _evict_lock:
+            now = time.monotonic()
+            if now - _last_evict < self.evict_interval_seconds:
+                return
+            _last_evict = now
+        self.evict()
+
+    def evict(self) -> int:
+        """Borra las entradas caducadas y, si sobran, las de uso más antiguo."""
+        cutoff = timezone.now() - timedelta(seconds=self.ttl_seconds)
+        expired, _ = AnalysisCacheEntry.objects.filter(created_at__lte=cutoff).delete()  # type: ignore[attr-defined]
+        overflow_ids = list(
+            AnalysisCacheEntry.objects.order_by('-last_used_at', '-id')  # type: ignore[attr-defined]
+            .values_list('id', flat=True)[self.max_entries:]
+        )
+        overflow = 0
+        if overflow_ids:
+            overflow, _ = AnalysisCacheEntry.objects.filter(id__in=overflow_ids).delete()  # type: ignore[attr-defined]
+        if expired:
+            metrics.inc('analysis_cache_evictions_total', expired, reason='ttl')
+        if overflow:
+            metrics.inc('analysis_cache_evictions_total', overflow, reason='lru')
+        return expired + overflow
@@ -1,4 +1,7 @@
-from typing import Optional
+from typing import Dict, List, Optional
+
+from django.db import connection
+from django.utils import timezone
 
 from modules.analysis.application.dtos import AnalysisResultDTO
 from modules.analysis.application.ports import AnalysisResultCommandRepository, AnalysisResultQueryRepository
@@ -6,51 +9,150 @@ from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
 from modules.document.infrastructure.django_app.models import Document
 
 
+# Columnas de contenido: solo se reescribe la fila si alguna cambia
+CONTENT_FIELDS = ('summary', 'labels', 'entities', 'risk_score', 'missing_topics', 'insights', 'model_info', 'status')
+RETURNED_FIELDS = ('document_id',) + CONTENT_FIELDS
+# Operador "distinto, tratando NULL como valor" de cada motor con INSERT ... ON CONFLICT
+DISTINCT_OPERATORS = {'postgresql': 'IS DISTINCT FROM', 'sqlite': 'IS NOT'}
+
+
+def _values(dto: AnalysisResultDTO) -> dict:
+    return {
+        'summary': dto.summary,
+        'labels': dto.labels,
+        'entities': dto.entities,
+        'risk_score': dto.risk_score,
+        'missing_topics': dto.missing_topics or [],
+        'insights': dto.insights or [],
+        'model_info': dto.model_info or {},
+        'status': dto.status,
+    }
+
+
+def _to_dto(obj: DocumentAnalysis) -> AnalysisResultDTO:
+    return AnalysisResultDTO(
+        document_id=obj.document_id,  # type: ignore[attr-defined]
+        summary=obj.summary,
+        labels=obj.labels,
+        entities=obj.entities,
+        risk_score=obj.risk_score,
+        status=obj.status,
+        missing_topics=obj.missing_topics,
+        insights=obj.insights,
+        model_info=obj.model_info,
+    )
+
+
 class DjangoAnalysisRepository(AnalysisResultCommandRepository, AnalysisResultQueryRepository):
     def upsert(self, dto: AnalysisResultDTO) -> AnalysisResultDTO:
+        if connection.vendor in DISTINCT_OPERATORS:
+            return self._upsert_single_statement(dto)
         # Si el documento no existe, no persistimos pero devolvemos el DTO para evitar 500 en el webhook
         doc = Document.objects.filter(id=dto.document_id).first()  # type: ignore[attr-defined]
         if not doc:
             return dto
-        obj, _ = DocumentAnalysis.objects.update_or_create(  # type: ignore[attr-defined]
-            document=doc,
-            defaults={
-                'summary': dto.summary,
-                'labels': dto.labels,
-                'entities': dto.entities,
-                'risk_score': dto.risk_score,
-                'missing_topics': dto.missing_topics or [],
-                'insights': dto.insights or [],
-                'model_info': dto.model_info or {},
-                'status': dto.status,
-            }
+        obj, _ = DocumentAnalysis.objects.update_or_create(document=doc, defaults=_values(dto))  # type: ignore[attr-defined]
+        return _to_dto(obj)
+
+    def _upsert_single_statement(self, dto: AnalysisResultDTO) -> AnalysisResultDTO:
+        """INSERT ... SELECT ... ON CONFLICT (document_id) DO UPDATE ... WHERE <cambió> RETURNING.
+
+        Un solo viaje a la BD: el SELECT sobre `document` sustituye la
+        comprobación previa de existencia y el WHERE evita reescribir (y tocar
+        updated_at) cuando el contenido es el mismo. Sin filas devueltas el
+        documento no existe o el análisis no cambió; en ambos casos vale `dto`.
+        """
+        meta = DocumentAnalysis._meta  # type: ignore[attr-defined]
+        now = timezone.now()
+        values = _values(dto)
+        columns = list(CONTENT_FIELDS) + ['created_at', 'updated_at']
+        params = [meta.get_field(name).get_db_prep_save(values[name], connection) for name in CONTENT_FIELDS]
+        params += [meta.get_field(name).get_db_prep_save(now, connection) for name in ('created_at', 'updated_at')]
+        params.append(dto.document_id)
+
+        qn = connection.ops.quote_name
+        table = qn(meta.db_table)
+        distinct = DISTINCT_OPERATORS[connection.vendor]
+        sql = (
+            f"INSERT INTO {table} ({qn('document_id')}, {', '.join(qn(c) for c in columns)}) "
+            f"SELECT {qn('id')}, {', '.join(['%s'] * len(columns))} "
+            f"FROM {qn(Document._meta.db_table)} WHERE {qn('id')} = %s "  # type: ignore[attr-defined]
+            f"ON CONFLICT ({qn('document_id')}) DO UPDATE SET "
+            + ', '.join(f"{qn(c)} = excluded.{qn(c)}" for c in CONTENT_FIELDS + ('updated_at',))
+            + " WHERE "
+            + ' OR '.join(f"{table}.{qn(c)} {distinct} excluded.{qn(c)}" for c in CONTENT_FIELDS)
+            + f" RETURNING {', '.join(qn(c) for c in RETURNED_FIELDS)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            return dto
+
+        fields = {}
+        for name, value in zip(RETURNED_FIELDS, row):
+            field = meta.get_field('document' if name == 'document_id' else name)
+            from_db = getattr(field, 'from_db_value', None)
+            fields[name] = from_db(value, None, connection) if from_db else value
+        return AnalysisResultDTO(**fields)
+
+    def upsert_many(self, dtos: List[AnalysisResultDTO]) -> Dict[int, str]:
+        """Upsert de un bloque en tres consultas. Devuelve created/updated/unchanged por document_id.
+
+        Los documentos inexistentes no aparecen en el resultado; los resultados
+        idénticos a lo guardado no se reescriben.
+        """
+        if not dtos:
+            return {}
+        existing_docs = set(
+            Document.objects.filter(id__in=[dto.document_id for dto in dtos]).values_list('id', flat=True)  # type: ignore[attr-defined]
         )
-        return AnalysisResultDTO(
-            document_id=obj.document_id,  # type: ignore[attr-defined]
-            summary=obj.summary,
-            labels=obj.labels,
-            entities=obj.entities,
-            risk_score=obj.risk_score,
-            status=obj.status,
-            missing_topics=obj.missing_topics,
-            insights=obj.insights,
-            model_info=obj.model_info,
+        current = {
+            obj.document_id: obj  # type: ignore[attr-defined]
+            for obj in DocumentAnalysis.objects.filter(document_id__in=existing_docs)  # type: ignore[attr-defined]
+        }
+        outcomes: Dict[int, str] = {}
+        to_write: List[DocumentAnalysis] = []
+        for dto in dtos:
+            if dto.document_id not in existing_docs:
+                continue
+            values = _values(dto)
+            existing = current.get(dto.document_id)
+            if existing is None:
+                outcomes[dto.document_id] = 'created'
+            elif any(getattr(existing, name) != values[name] for name in CONTENT_FIELDS):
+                outcomes[dto.document_id] = 'updated'
+            else:
+                outcomes[dto.document_id] = 'unchanged'
+                continue
+            to_write.append(DocumentAnalysis(document_id=dto.document_id, **values))
+        if to_write:
+            DocumentAnalysis.objects.bulk_create(  # type: ignore[attr-defined]
+                to_write,
+                update_conflicts=True,
+                unique_fields=['document'],
+                update_fields=list(CONTENT_FIELDS) + ['updated_at'],
+            )
+        return outcomes
+
+    def insert_provisional_many(self, dtos: List[AnalysisResultDTO]) -> int:
+        """Crea el análisis solo de los documentos que existen y aún no tienen ninguno. Devuelve cuántos."""
+        if not dtos:
+            return 0
+        pending = set(
+            Document.objects.filter(  # type: ignore[attr-defined]
+                id__in=[dto.document_id for dto in dtos], analysis__isnull=True,
+            ).values_list('id', flat=True)
         )
+        to_create = [DocumentAnalysis(document_id=dto.document_id, **_values(dto)) for dto in dtos if dto.document_id in pending]
+        if to_create:
+            # ignore_conflicts: si el análisis real llega entre las dos consultas, gana el real
+            DocumentAnalysis.objects.bulk_create(to_create, ignore_conflicts=True)  # type: ignore[attr-defined]
+        return len(to_create)
 
     def get_by_document_id(self, document_id: int) -> Optional[AnalysisResultDTO]:
         try:
             obj = DocumentAnalysis.objects.get(document_id=document_id)  # type: ignore[attr-defined]
         except DocumentAnalysis.DoesNotExist:  # type: ignore[attr-defined]
             return None
-        return AnalysisResultDTO(
-            document_id=obj.document_id,  # type: ignore[attr-defined]
-            summary=obj.summary,
-            labels=obj.labels,
-            entities=obj.entities,
-            risk_score=obj.risk_score,
-            status=obj.status,
-            missing_topics=obj.missing_topics,
-            insights=obj.insights,
-            model_info=obj.model_info,
-        )
-
+        return _to_dto(obj)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -9,5 +10,11 @@ class DocumentCreatedEvent:
     pdf_url: str
 
 
- 
+@dataclass
+class PublishResult:
+    event: DocumentCreatedEvent
+    ok: bool
+    error: Optional[str] = None
 
+
+ 
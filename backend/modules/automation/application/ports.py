@@ -1,9 +1,10 @@
-from typing import Protocol
-from .dtos import DocumentCreatedEvent
+from typing import Protocol, Sequence
+from .dtos import DocumentCreatedEvent, PublishResult
 
 
 class EventPublisher(Protocol):
     def publish_document_created(self, event: DocumentCreatedEvent) -> None: ...
+    def publish_many(self, events: Sequence[DocumentCreatedEvent]) -> list[PublishResult]: ...
 
 
 class DocumentCreatedProcessor(Protocol):
@@ -11,4 +12,3 @@ class DocumentCreatedProcessor(Protocol):
 
 
  
-
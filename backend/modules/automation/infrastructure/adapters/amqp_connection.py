@@ -0,0 +1,237 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def _default_connection_factory(url: str) -> Any:
+    # Import perezoso para no requerir dependencia en pruebas sin cola
+    import pika  # type: ignore
+    return pika.BlockingConnection(pika.URLParameters(url))
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    try:
+        import pika  # type: ignore
+    except ImportError:  # pragma: no cover
+        return False
+    return isinstance(exc, (pika.exceptions.AMQPError, ConnectionError, OSError))
+
+
+class ConfirmChannel:
+    """Canal en modo publisher confirms que permite publicar en pipeline.
+
+    `BlockingChannel.basic_publish` con confirms espera el ack de cada mensaje;
+    aquí se publica sobre el canal subyacente y los acks/nacks se recogen por
+    ventanas, atendiendo la conexión hasta que llegan o vence el timeout.
+    """
+
+    def __init__(self, connection: Any, channel: Any, timeout_seconds: float = 30.0) -> None:
+        self._connection = connection
+        self.channel = channel
+        self._impl = channel._impl
+        self._seq = 0
+        self._pending: set[int] = set()
+        self._outcomes: Dict[int, bool] = {}
+        self._select_ok = False
+        self._impl.confirm_delivery(ack_nack_callback=self._on_confirm, callback=self._on_select_ok)
+        if not self._wait(lambda: self._select_ok, timeout_seconds):
+            raise TimeoutError('Timed out enabling publisher confirms')
+
+    @property
+    def is_open(self) -> bool:
+        return getattr(self.channel, 'is_open', False)
+
+    def _on_select_ok(self, _frame: Any) -> None:
+        self._select_ok = True
+
+    def _on_confirm(self, frame: Any) -> None:
+        import pika  # type: ignore
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        tag = method.delivery_tag
+        tags = [t for t in self._pending if t <= tag] if method.multiple else [tag]
+        for t in tags:
+            # Acks tardíos de mensajes ya dados por perdidos (timeout) se ignoran
+            if t in self._pending:
+                self._pending.discard(t)
+                self._outcomes[t] = acked
+
+    def _wait(self, predicate: Callable[[], bool], timeout_seconds: float) -> bool:
+        deadline = time.monotonic() + timeout_seconds
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._connection.process_data_events(time_limit=min(remaining, 0.05))
+        return True
+
+    def publish(self, exchange: str, routing_key: str, body: bytes, properties: Any = None) -> int:
+        self._impl.basic_publish(exchange=exchange, routing_key=routing_key, body=body, properties=properties)
+        self._seq += 1
+        self._pending.add(self._seq)
+        return self._seq
+
+    def wait_for_confirms(self, tags: list[int], timeout_seconds: float) -> Dict[int, bool]:
+        """Devuelve `{delivery_tag: confirmado}`; lo no confirmado a tiempo cuenta como fallo."""
+        wanted = set(tags)
+        self._wait(lambda: not (self._pending & wanted), timeout_seconds)
+        self._pending -= wanted
+        return {t: self._outcomes.pop(t, False) for t in tags}
+
+
+class AmqpConnectionManager:
+    """Conexión y canal AMQP de larga duración, compartidos por proceso.
+
+    `BlockingConnection` no es thread-safe: todas las operaciones se
+    serializan con un lock. Si la conexión se pierde (reinicio del broker,
+    heartbeat vencido) se reabre de forma transparente y se reintenta una vez.
+    """
+
+    def __init__(self, url: str, connection_factory: Optional[Callable[[str], Any]] = None) -> None:
+        self.url = url
+        self._factory = connection_factory or _default_connection_factory
+        self._lock = threading.RLock()
+        self._connection: Any = None
+        self._channel: Any = None
+        self._confirm_channel: Optional[ConfirmChannel] = None
+        self._declared: set[str] = set()
+        self._pid = os.getpid()
+        self.connections_opened = 0
+        self.connection_reuses = 0
+        self.reconnects = 0
+
+    def _is_open(self) -> bool:
+        return (
+            self._connection is not None
+            and getattr(self._connection, 'is_open', False)
+            and self._channel is not None
+            and getattr(self._channel, 'is_open', False)
+        )
+
+    def _reset(self) -> None:
+        confirm_channel = self._confirm_channel.channel if self._confirm_channel else None
+        for obj in (confirm_channel, self._channel, self._connection):
+            if obj is None:
+                continue
+            try:
+                if getattr(obj, 'is_open', False):
+                    obj.close()
+            except Exception:
+                pass
+        self._channel = None
+        self._confirm_channel = None
+        self._connection = None
+        self._declared.clear()
+
+    def _ensure_channel(self) -> Any:
+        # Tras un fork (supervisor de workers) el socket heredado no es usable
+        if self._pid != os.getpid():
+            self._connection = None
+            self._channel = None
+            self._confirm_channel = None
+            self._declared.clear()
+            self._pid = os.getpid()
+
+        if self._is_open():
+            try:
+                # Atiende heartbeats pendientes; detecta conexiones muertas antes de publicar
+                self._connection.process_data_events(time_limit=0)
+            except Exception as exc:
+                if not _is_connection_error(exc):
+                    raise
+                logger.warning('AMQP connection lost (%s); reconnecting', exc)
+                self._reset()
+            else:
+                self.connection_reuses += 1
+                metrics.inc('amqp_connection_reuses_total')
+                return self._channel
+
+        if self._connection is not None:
+            self._reset()
+        had_connection = self.connections_opened > 0
+        logger.debug('AMQP connecting to %s', self.url)
+        self._connection = self._factory(self.url)
+        self._channel = self._connection.channel()
+        self.connections_opened += 1
+        metrics.inc('amqp_connections_opened_total')
+        if had_connection:
+            self.reconnects += 1
+            metrics.inc('amqp_reconnects_total')
+        return self._channel
+
+    def declare_queue(self, channel: Any, queue: str) -> None:
+        if queue in self._declared:
+            return
+        channel.queue_declare(queue=queue, durable=True)
+        self._declared.add(queue)
+        logger.debug('AMQP declared queue %s', queue)
+
+    def _ensure_confirm_channel(self, timeout_seconds: float) -> ConfirmChannel:
+        self._ensure_channel()
+        if self._confirm_channel is None or not self._confirm_channel.is_open:
+            self._confirm_channel = ConfirmChannel(self._connection, self._connection.channel(), timeout_seconds)
+        return self._confirm_channel
+
+    def _run(self, operation: Callable[[Any], T], get_channel: Callable[[], Any]) -> T:
+        with self._lock:
+            try:
+                return operation(get_channel())
+            except Exception as exc:
+                if not _is_connection_error(exc):
+                    raise
+                logger.warning('AMQP operation failed (%s); reconnecting and retrying once', exc)
+                self._reset()
+                return operation(get_channel())
+
+    def run(self, operation: Callable[[Any], T]) -> T:
+        """Ejecuta `operation(channel)` bajo el lock, reconectando una vez si falla la conexión."""
+        return self._run(operation, self._ensure_channel)
+
+    def run_confirmed(self, operation: Callable[[ConfirmChannel], T], timeout_seconds: float = 30.0) -> T:
+        """Como `run`, pero sobre un canal dedicado en modo publisher confirms."""
+        return self._run(operation, lambda: self._ensure_confirm_channel(timeout_seconds))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'connections_opened': self.connections_opened,
+            'connection_reuses': self.connection_reuses,
+            'reconnects': self.reconnects,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+_managers: Dict[str, AmqpConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(url: str) -> AmqpConnectionManager:
+    with _managers_lock:
+        manager = _managers.get(url)
+        if manager is None:
+            manager = AmqpConnectionManager(url)
+            _managers[url] = manager
+        return manager
+
+
+def close_all_connections() -> None:
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
+
+
+atexit.register(close_all_connections)
@@ -0,0 +1,28 @@
+from dataclasses import asdict
+from typing import Sequence
+
+from modules.automation.application.dtos import DocumentCreatedEvent, PublishResult
+from modules.automation.application.ports import EventPublisher
+from modules.automation.infrastructure.django_app.models import OutboxEvent
+
+
+EVENT_DOCUMENT_CREATED = 'document_created'
+
+
+class OutboxEventPublisher(EventPublisher):
+    """Escribe el evento en la tabla outbox dentro de la transacción en curso.
+
+    La publicación real a RabbitMQ la hace el relay (`run_outbox_relay`).
+    """
+
+    def publish_document_created(self, event: DocumentCreatedEvent) -> None:
+        OutboxEvent.objects.create(  # type: ignore[attr-defined]
+            event_type=EVENT_DOCUMENT_CREATED,
+            payload=asdict(event),
+        )
+
+    def publish_many(self, events: Sequence[DocumentCreatedEvent]) -> list[PublishResult]:
+        OutboxEvent.objects.bulk_create([  # type: ignore[attr-defined]
+            OutboxEvent(event_type=EVENT_DOCUMENT_CREATED, payload=asdict(e)) for e in events
+        ])
+        return [PublishResult(event=e, ok=True) for e in events]
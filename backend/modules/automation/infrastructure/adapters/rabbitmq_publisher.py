@@ -1,57 +1,124 @@
 import json
 import logging
 from dataclasses import asdict
-from typing import Optional
+from typing import Optional, Sequence
 
 from django.conf import settings
 
-from modules.automation.application.dtos import DocumentCreatedEvent
+from modules.automation.application.dtos import DocumentCreatedEvent, PublishResult
 from modules.automation.application.ports import EventPublisher
+from modules.automation.infrastructure.adapters.amqp_connection import AmqpConnectionManager, ConfirmChannel, get_connection_manager
+from modules.shared.infrastructure.metrics import metrics
 
 
 logger = logging.getLogger(__name__)
 
 
 class RabbitMqEventPublisher(EventPublisher):
-    def __init__(self, url: Optional[str] = None, queue: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        queue: Optional[str] = None,
+        connection: Optional[AmqpConnectionManager] = None,
+        best_effort: bool = True,
+        confirm_window: Optional[int] = None,
+        confirm_timeout_seconds: Optional[float] = None,
+    ) -> None:
         self.url = url or getattr(settings, 'RABBITMQ_URL', '')
         self.queue = queue or getattr(settings, 'AUTOMATION_QUEUE', 'document_created')
+        # Conexión/canal compartidos por proceso; evita el handshake TCP+AMQP por publicación
+        self._connection = connection
+        # El relay del outbox necesita que los fallos se propaguen para reintentar
+        self.best_effort = best_effort
+        self.confirm_window = confirm_window or getattr(settings, 'RABBITMQ_CONFIRM_WINDOW', 500)
+        self.confirm_timeout_seconds = confirm_timeout_seconds or getattr(settings, 'RABBITMQ_CONFIRM_TIMEOUT_SECONDS', 30.0)
+
+    @property
+    def connection(self) -> AmqpConnectionManager:
+        if self._connection is None:
+            self._connection = get_connection_manager(self.url)
+        return self._connection
 
     def publish_document_created(self, event: DocumentCreatedEvent) -> None:
         if not self.url or not self.queue:
+            if not self.best_effort:
+                raise RuntimeError('RabbitMQ publisher not configured')
             logger.warning("RabbitMQ publisher disabled: missing url or queue (url=%s queue=%s)", bool(self.url), self.queue)
             return
+        body = json.dumps(asdict(event)).encode('utf-8')
         try:
-            # Import perezoso para no requerir dependencia en pruebas sin cola
             import pika  # type: ignore
-            params = pika.URLParameters(self.url)
-            logger.debug("RabbitMQ connecting to %s", self.url)
-            connection = pika.BlockingConnection(params)
-            channel = connection.channel()
-            channel.queue_declare(queue=self.queue, durable=True)
-            logger.debug("RabbitMQ declared queue '%s'", self.queue)
-            body = json.dumps(asdict(event)).encode('utf-8')
-            channel.basic_publish(
-                exchange='',
-                routing_key=self.queue,
-                body=body,
-                properties=pika.BasicProperties(delivery_mode=2),  # persistente
-            )
+
+            def _publish(channel) -> None:
+                self.connection.declare_queue(channel, self.queue)
+                channel.basic_publish(
+                    exchange='',
+                    routing_key=self.queue,
+                    body=body,
+                    properties=pika.BasicProperties(delivery_mode=2),  # persistente
+                )
+
+            self.connection.run(_publish)
             logger.info(
                 "RabbitMQ published DocumentCreatedEvent queue=%s document_id=%s company_id=%s",
                 self.queue,
                 getattr(event, 'document_id', None),
                 getattr(event, 'company_id', None),
             )
-            channel.close()
-            connection.close()
         except Exception:
+            if not self.best_effort:
+                raise
             # Best-effort: no bloquear el flujo si falla la publicación
             logger.exception(
                 "RabbitMQ publish failed queue=%s event=%s", self.queue, asdict(event)
             )
             return
 
-    
+    def publish_many(self, events: Sequence[DocumentCreatedEvent]) -> list[PublishResult]:
+        """Publica en pipeline con publisher confirms, esperando los acks por ventanas.
 
+        Devuelve un resultado por evento (mismo orden). Un evento sin ack a
+        tiempo o con nack se reporta como fallido; reintentarlo puede duplicarlo.
+        """
+        if not events:
+            return []
+        if not self.url or not self.queue:
+            return [PublishResult(event=e, ok=False, error='RabbitMQ publisher not configured') for e in events]
+
+        results: list[PublishResult] = []
+        for start in range(0, len(events), self.confirm_window):
+            window = list(events[start:start + self.confirm_window])
+            try:
+                outcomes = self.connection.run_confirmed(
+                    lambda channel: self._publish_window(channel, window),
+                    timeout_seconds=self.confirm_timeout_seconds,
+                )
+                results.extend(
+                    PublishResult(event=e, ok=ok, error=None if ok else 'not confirmed by broker')
+                    for e, ok in zip(window, outcomes)
+                )
+            except Exception as exc:
+                logger.exception("RabbitMQ publish_many window failed queue=%s size=%s", self.queue, len(window))
+                results.extend(PublishResult(event=e, ok=False, error=str(exc)) for e in window)
+
+        confirmed = sum(1 for r in results if r.ok)
+        metrics.inc('amqp_confirmed_total', confirmed)
+        metrics.inc('amqp_unconfirmed_total', len(results) - confirmed)
+        logger.info("RabbitMQ publish_many queue=%s confirmed=%s failed=%s", self.queue, confirmed, len(results) - confirmed)
+        return results
 
+    def _publish_window(self, channel: ConfirmChannel, window: list[DocumentCreatedEvent]) -> list[bool]:
+        import pika  # type: ignore
+        self.connection.declare_queue(channel.channel, self.queue)
+        properties = pika.BasicProperties(delivery_mode=2, content_type='application/json')
+        tags = [
+            channel.publish(
+                exchange='',
+                routing_key=self.queue,
+                body=json.dumps(asdict(e)).encode('utf-8'),
+                properties=properties,
+            )
+            for e in window
+        ]
+        confirmed = channel.wait_for_confirms(tags, self.confirm_timeout_seconds)
+        return [confirmed[t] for t in tags]
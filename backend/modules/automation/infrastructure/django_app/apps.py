@@ -10,20 +10,25 @@ class AutomationConfig(AppConfig):
     label = 'automation'
 
     _worker_started = False
+    _relay_started = False
 
     def ready(self):
-        # Arrancar worker en segundo plano solo si está habilitado por env y evitar doble inicio por el autoreloader
-        if not getattr(settings, 'START_AUTOMATION_WORKER', False):
-            return
+        # Evitar doble inicio por el autoreloader
         if os.environ.get('RUN_MAIN') != 'true':
             return
-        if AutomationConfig._worker_started:
-            return
 
-        from modules.automation.infrastructure.worker import run_worker
+        # Arrancar worker en segundo plano solo si está habilitado por env
+        if getattr(settings, 'START_AUTOMATION_WORKER', False) and not AutomationConfig._worker_started:
+            from modules.automation.infrastructure.worker import run_worker
 
-        t = threading.Thread(target=run_worker, name='automation-worker', daemon=True)
-        t.start()
-        AutomationConfig._worker_started = True
+            t = threading.Thread(target=run_worker, name='automation-worker', daemon=True)
+            t.start()
+            AutomationConfig._worker_started = True
 
+        # Relay del outbox (publica eventos pendientes en RabbitMQ)
+        if getattr(settings, 'START_OUTBOX_RELAY', False) and not AutomationConfig._relay_started:
+            from modules.automation.infrastructure.outbox_relay import run_outbox_relay
 
+            t = threading.Thread(target=run_outbox_relay, name='outbox-relay', daemon=True)
+            t.start()
+            AutomationConfig._relay_started = True
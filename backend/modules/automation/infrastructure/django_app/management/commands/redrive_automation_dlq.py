@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.automation.infrastructure.dlq import inspect_dlq, redrive_dlq
+from modules.automation.infrastructure.retry_topology import RetryTopology
+
+
+class Command(BaseCommand):
+    help = 'Inspect the automation dead-letter queue or move its messages back to the main queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', default=None, help='Main queue (default: AUTOMATION_QUEUE)')
+        parser.add_argument('--redrive', action='store_true', help='Move messages back instead of inspecting')
+        parser.add_argument('--limit', type=int, default=None, help='Max messages to show/redrive')
+        parser.add_argument('--rate', type=float, default=10.0, help='Redrive rate (messages per second, 0 = unlimited)')
+
+    def handle(self, *args, **options):
+        amqp_url = getattr(settings, 'RABBITMQ_URL', '')
+        if not amqp_url:
+            raise CommandError('RABBITMQ_URL is not configured')
+        import pika  # type: ignore
+        topology = RetryTopology(options['queue'] or getattr(settings, 'AUTOMATION_QUEUE', 'document_created'))
+        connection = pika.BlockingConnection(pika.URLParameters(amqp_url))
+        try:
+            channel = connection.channel()
+            topology.declare(channel)
+            if options['redrive']:
+                moved = redrive_dlq(channel, topology, limit=options['limit'], rate_per_second=options['rate'])
+                self.stdout.write(self.style.SUCCESS(f'Redrove {moved} messages from {topology.dlq} to {topology.queue}'))
+                return
+            depth, samples = inspect_dlq(channel, topology, limit=options['limit'] or 20)
+            self.stdout.write(f'{topology.dlq}: {depth} messages')
+            for dl in samples:
+                body = dl.body.decode('utf-8', errors='replace')
+                self.stdout.write(f'- retries={dl.retry_count} error={dl.last_error!r} body={body}')
+        finally:
+            connection.close()
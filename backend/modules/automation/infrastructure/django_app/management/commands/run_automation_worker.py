@@ -1,11 +1,29 @@
+import functools
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from modules.automation.infrastructure.worker import run_worker
+from modules.automation.infrastructure.supervisor import WorkerSupervisor, default_worker_target
 
 
 class Command(BaseCommand):
     help = 'Run automation worker (RabbitMQ consumer)'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None, help='Mensajes en vuelo por consumidor')
+        parser.add_argument('--processes', type=int, default=None, help='Modo supervisor: N procesos consumidores')
+        parser.add_argument('--status-file', default=None, help='Ruta JSON con la vivacidad de cada proceso (modo supervisor)')
+
     def handle(self, *args, **options):
+        processes = options['processes'] or getattr(settings, 'AUTOMATION_WORKER_PROCESSES', 0)
+        if processes:
+            self.stdout.write(self.style.SUCCESS(f'Starting automation worker supervisor with {processes} processes...'))
+            WorkerSupervisor(
+                processes=processes,
+                target=functools.partial(default_worker_target, concurrency=options['concurrency']),
+                drain_seconds=getattr(settings, 'AUTOMATION_WORKER_DRAIN_SECONDS', 30.0),
+                status_file=options['status_file'] or getattr(settings, 'AUTOMATION_SUPERVISOR_STATUS_FILE', '') or None,
+            ).run()
+            return
         self.stdout.write(self.style.SUCCESS('Starting automation worker...'))
-        run_worker()
-
+        run_worker(concurrency=options['concurrency'], install_signal_handlers=True)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from modules.automation.infrastructure.outbox_relay import run_outbox_relay
+
+
+class Command(BaseCommand):
+    help = 'Run outbox relay (publishes pending outbox events to RabbitMQ)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--poll-seconds', type=float, default=None)
+        parser.add_argument('--once', action='store_true', help='Drain pending events and exit')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Starting outbox relay...'))
+        total = run_outbox_relay(
+            batch_size=options['batch_size'],
+            poll_seconds=options['poll_seconds'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Outbox relay published {total} events'))
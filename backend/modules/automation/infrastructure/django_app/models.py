@@ -0,0 +1,36 @@
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    # failed: no se puede convertir en evento; dead: agotó OUTBOX_MAX_ATTEMPTS publicaciones
+    STATUS_FAILED = 'failed'
+    STATUS_DEAD = 'dead'
+
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    # Tras un fallo de publicación no se reintenta antes de esta hora (backoff exponencial)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'automation_outbox'
+        indexes = [
+            models.Index(fields=['status', 'id'], name='idx_outbox_status_id'),
+        ]
+
+
+class ProcessedWebhook(models.Model):
+    """Huella de un webhook ya aplicado; evita reprocesar los reintentos del proveedor."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    source = models.CharField(max_length=30)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'automation_webhook_dedup'
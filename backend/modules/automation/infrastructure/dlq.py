@@ -0,0 +1,78 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from modules.automation.infrastructure.retry_topology import LAST_ERROR_HEADER, RETRY_COUNT_HEADER, RetryTopology
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeadLetter:
+    body: bytes
+    retry_count: int
+    last_error: Optional[str]
+
+
+def inspect_dlq(channel: Any, topology: RetryTopology, limit: int = 20) -> tuple[int, list[DeadLetter]]:
+    """Devuelve (mensajes en la DLQ, primeros `limit` mensajes) sin consumirlos."""
+    depth = channel.queue_declare(queue=topology.dlq, durable=True, passive=True).method.message_count
+    samples: list[DeadLetter] = []
+    tags: list[int] = []
+    for _ in range(min(limit, depth)):
+        method, properties, body = channel.basic_get(queue=topology.dlq, auto_ack=False)
+        if method is None:
+            break
+        tags.append(method.delivery_tag)
+        headers = getattr(properties, 'headers', None) or {}
+        samples.append(DeadLetter(body=body, retry_count=RetryTopology.retry_count(properties),
+                                  last_error=headers.get(LAST_ERROR_HEADER)))
+    if tags:
+        # Devolver todo lo leído a la DLQ en su orden original
+        channel.basic_nack(delivery_tag=tags[-1], multiple=True, requeue=True)
+    return depth, samples
+
+
+def redrive_dlq(
+    channel: Any,
+    topology: RetryTopology,
+    limit: Optional[int] = None,
+    rate_per_second: float = 10.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Mueve mensajes de la DLQ a la cola principal con el contador de reintentos a cero.
+
+    Publica con confirms antes de hacer ack en la DLQ, así un fallo a mitad no
+    pierde mensajes. `rate_per_second` limita el ritmo para no saturar n8n.
+    """
+    import pika  # type: ignore
+    channel.confirm_delivery()
+    interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+    moved = 0
+    while limit is None or moved < limit:
+        method, properties, body = channel.basic_get(queue=topology.dlq, auto_ack=False)
+        if method is None:
+            break
+        headers = dict(getattr(properties, 'headers', None) or {})
+        headers.pop(LAST_ERROR_HEADER, None)
+        headers[RETRY_COUNT_HEADER] = 0
+        props = pika.BasicProperties(
+            delivery_mode=2,
+            content_type=getattr(properties, 'content_type', None),
+            headers=headers,
+        )
+        try:
+            channel.basic_publish(exchange='', routing_key=topology.queue, body=body, properties=props)
+        except Exception:
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            raise
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        moved += 1
+        metrics.inc('dlq_redriven_total', queue=topology.queue)
+        if interval:
+            sleep(interval)
+    logger.info('Redrove %s messages from %s to %s', moved, topology.dlq, topology.queue)
+    return moved
@@ -0,0 +1,127 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from modules.automation.application.dtos import DocumentCreatedEvent
+from modules.automation.application.ports import EventPublisher
+from modules.automation.infrastructure.adapters.outbox_publisher import EVENT_DOCUMENT_CREATED
+from modules.automation.infrastructure.django_app.models import OutboxEvent
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+def _to_event(row: OutboxEvent) -> DocumentCreatedEvent:
+    if row.event_type != EVENT_DOCUMENT_CREATED:
+        raise ValueError(f'Unknown outbox event_type={row.event_type}')
+    return DocumentCreatedEvent(**row.payload)
+
+
+def _retry_delay(attempts: int) -> float:
+    base = getattr(settings, 'OUTBOX_RELAY_POLL_SECONDS', 1.0)
+    return min(getattr(settings, 'OUTBOX_RETRY_BACKOFF_MAX_SECONDS', 300.0), base * (2 ** (attempts - 1)))
+
+
+def relay_outbox_batch(publisher: EventPublisher, batch_size: int = 100, max_attempts: Optional[int] = None) -> int:
+    """Publica un lote de eventos pendientes y los marca como enviados.
+
+    Las filas se bloquean con `FOR UPDATE SKIP LOCKED`, así varias instancias
+    del relay pueden drenar la tabla en paralelo sin publicar dos veces el
+    mismo lote. Entrega at-least-once: si el proceso cae tras publicar y antes
+    del commit, el evento se vuelve a publicar. Las filas que no se pueden
+    convertir en evento pasan a `failed` y las que fallan `max_attempts`
+    veces a `dead`, para que no bloqueen la cabeza de la cola.
+    """
+    limit = max_attempts or getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 10)
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)  # type: ignore[attr-defined]
+            .filter(status=OutboxEvent.STATUS_PENDING)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('id')[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        publishable, events = [], []
+        for row in rows:
+            try:
+                events.append(_to_event(row))
+            except Exception as exc:
+                logger.error('Outbox row id=%s is not a valid event: %s', row.id, exc)
+                OutboxEvent.objects.filter(id=row.id).update(  # type: ignore[attr-defined]
+                    status=OutboxEvent.STATUS_FAILED,
+                    last_error=f'{type(exc).__name__}: {exc}'[:1000],
+                )
+                metrics.inc('outbox_invalid_events_total')
+                continue
+            publishable.append(row)
+        if not publishable:
+            return 0
+
+        # El lote se publica en pipeline con publisher confirms; solo lo confirmado se marca como enviado
+        results = publisher.publish_many(events)
+        sent_ids = [row.id for row, r in zip(publishable, results) if r.ok]
+        failed = [(row, r) for row, r in zip(publishable, results) if not r.ok]
+
+        if failed:
+            failed_ids = [row.id for row, _ in failed]
+            logger.warning('Outbox relay publish failed count=%s error=%s', len(failed), failed[0][1].error)
+            # Un backoff común para el lote, calculado con el intento más alto
+            delay = _retry_delay(max(row.attempts for row, _ in failed) + 1)
+            OutboxEvent.objects.filter(id__in=failed_ids).update(  # type: ignore[attr-defined]
+                attempts=F('attempts') + 1,
+                last_error=(failed[0][1].error or '')[:1000],
+                next_attempt_at=now + timedelta(seconds=delay),
+            )
+            metrics.inc('outbox_publish_failures_total', len(failed))
+            dead = OutboxEvent.objects.filter(id__in=failed_ids, attempts__gte=limit).update(  # type: ignore[attr-defined]
+                status=OutboxEvent.STATUS_DEAD,
+            )
+            if dead:
+                logger.error('Outbox relay gave up on %s events after %s attempts', dead, limit)
+                metrics.inc('outbox_dead_events_total', dead)
+
+        if sent_ids:
+            OutboxEvent.objects.filter(id__in=sent_ids).update(  # type: ignore[attr-defined]
+                status=OutboxEvent.STATUS_SENT,
+                sent_at=timezone.now(),
+            )
+            metrics.inc('outbox_published_total', len(sent_ids))
+        return len(sent_ids)
+
+
+def run_outbox_relay(
+    publisher: Optional[EventPublisher] = None,
+    batch_size: Optional[int] = None,
+    poll_seconds: Optional[float] = None,
+    once: bool = False,
+) -> int:
+    if publisher is None:
+        from modules.automation.infrastructure.adapters.rabbitmq_publisher import RabbitMqEventPublisher
+        publisher = RabbitMqEventPublisher(best_effort=False)
+    size = batch_size or getattr(settings, 'OUTBOX_RELAY_BATCH_SIZE', 100)
+    interval = poll_seconds if poll_seconds is not None else getattr(settings, 'OUTBOX_RELAY_POLL_SECONDS', 1.0)
+
+    total = 0
+    logger.info('Outbox relay started batch_size=%s poll_seconds=%s', size, interval)
+    while True:
+        try:
+            sent = relay_outbox_batch(publisher, size)
+        except Exception:
+            logger.exception('Outbox relay batch failed')
+            sent = 0
+        total += sent
+        if once and sent < size:
+            return total
+        # Lote completo: seguir drenando sin esperar
+        if sent < size:
+            time.sleep(interval)
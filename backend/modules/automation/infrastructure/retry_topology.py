@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Optional, Sequence
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_COUNT_HEADER = 'x-retry-count'
+LAST_ERROR_HEADER = 'x-last-error'
+
+
+class RetryTopology:
+    """Colas de reintento con TTL creciente y una DLQ final para una cola de trabajo.
+
+    `<queue>.retry.<n>` retiene el mensaje `delays[n]` segundos y lo
+    devuelve (dead-letter) a `<queue>`. Tras agotar los reintentos el mensaje
+    va a `<queue>.dlq`. La cola principal no cambia de argumentos, así que es
+    compatible con colas ya declaradas.
+    """
+
+    def __init__(self, queue: str, retry_delays_seconds: Optional[Sequence[float]] = None) -> None:
+        self.queue = queue
+        delays = retry_delays_seconds
+        if delays is None:
+            delays = getattr(settings, 'AUTOMATION_RETRY_DELAYS_SECONDS', [5, 30, 120, 600])
+        self.retry_delays_seconds = [float(d) for d in delays]
+
+    @property
+    def max_retries(self) -> int:
+        return len(self.retry_delays_seconds)
+
+    @property
+    def dlq(self) -> str:
+        return f'{self.queue}.dlq'
+
+    def retry_queue(self, tier: int) -> str:
+        return f'{self.queue}.retry.{tier}'
+
+    def declare(self, channel: Any) -> None:
+        channel.queue_declare(queue=self.queue, durable=True)
+        for tier, delay in enumerate(self.retry_delays_seconds):
+            channel.queue_declare(
+                queue=self.retry_queue(tier),
+                durable=True,
+                arguments={
+                    'x-message-ttl': int(delay * 1000),
+                    'x-dead-letter-exchange': '',
+                    'x-dead-letter-routing-key': self.queue,
+                },
+            )
+        channel.queue_declare(queue=self.dlq, durable=True)
+
+    @staticmethod
+    def retry_count(properties: Any) -> int:
+        headers = getattr(properties, 'headers', None) or {}
+        try:
+            return int(headers.get(RETRY_COUNT_HEADER, 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def route_failure(self, channel: Any, properties: Any, body: bytes, error: str) -> str:
+        """Republica el mensaje fallido en el siguiente nivel de reintento o en la DLQ.
+
+        Devuelve `'retry'` o `'dead_letter'`. Debe llamarse desde el hilo de la conexión.
+        """
+        import pika  # type: ignore
+        attempt = self.retry_count(properties)
+        headers = dict(getattr(properties, 'headers', None) or {})
+        headers[RETRY_COUNT_HEADER] = attempt + 1
+        headers[LAST_ERROR_HEADER] = error[:500]
+        props = pika.BasicProperties(
+            delivery_mode=2,
+            content_type=getattr(properties, 'content_type', None),
+            headers=headers,
+        )
+        if attempt < self.max_retries:
+            target, outcome = self.retry_queue(attempt), 'retry'
+        else:
+            target, outcome = self.dlq, 'dead_letter'
+        channel.basic_publish(exchange='', routing_key=target, body=body, properties=props)
+        logger.warning('Worker routed failed message to %s (attempt=%s error=%s)', target, attempt + 1, error[:200])
+        return outcome
@@ -0,0 +1,182 @@
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from django import db
+
+
+logger = logging.getLogger(__name__)
+
+# target(index, heartbeat) corre dentro del proceso hijo
+WorkerTarget = Callable[[int, Callable[[], None]], None]
+
+
+def default_worker_target(index: int, heartbeat: Callable[[], None], **worker_kwargs: Any) -> None:
+    from modules.automation.infrastructure.worker import run_worker
+    run_worker(install_signal_handlers=True, on_heartbeat=heartbeat, **worker_kwargs)
+
+
+@dataclass
+class _Slot:
+    index: int
+    process: Any = None
+    started_at: float = 0.0
+    restarts: int = 0
+    backoff: float = 0.0
+    next_start_at: float = 0.0
+
+
+class WorkerSupervisor:
+    """Supervisa N procesos consumidores (fork) del worker de automatización.
+
+    - Reinicia hijos caídos o sin heartbeat con backoff exponencial.
+    - SIGTERM/SIGINT: reenvía SIGTERM a los hijos (dejan de consumir, terminan
+      lo que tienen en vuelo y hacen ack) y espera hasta `drain_seconds`.
+    - `status()` expone la vivacidad por hijo; opcionalmente se escribe en
+      `status_file` para probes externos.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        target: Optional[WorkerTarget] = None,
+        drain_seconds: float = 30.0,
+        heartbeat_timeout_seconds: float = 60.0,
+        backoff_initial_seconds: float = 1.0,
+        backoff_max_seconds: float = 30.0,
+        stable_after_seconds: float = 60.0,
+        status_file: Optional[str] = None,
+        poll_seconds: float = 0.5,
+    ) -> None:
+        self.processes = max(1, int(processes))
+        self.target = target or default_worker_target
+        self.drain_seconds = drain_seconds
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.backoff_initial_seconds = backoff_initial_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.stable_after_seconds = stable_after_seconds
+        self.status_file = status_file
+        self.poll_seconds = poll_seconds
+        self._ctx = multiprocessing.get_context('fork')
+        self._heartbeats = self._ctx.Array('d', self.processes, lock=False)
+        self._slots = [_Slot(index=i) for i in range(self.processes)]
+        self._stopping = threading.Event()
+
+    def _child_main(self, index: int) -> None:
+        # Señales por defecto en el hijo; run_worker instala su propio manejo de drenaje
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        heartbeats = self._heartbeats
+
+        def _beat() -> None:
+            heartbeats[index] = time.time()
+
+        _beat()
+        self.target(index, _beat)
+
+    def _start(self, slot: _Slot) -> None:
+        # Las conexiones de DB no deben compartirse entre procesos
+        db.connections.close_all()
+        self._heartbeats[slot.index] = time.time()
+        slot.process = self._ctx.Process(
+            target=self._child_main, args=(slot.index,), name=f'automation-worker-{slot.index}', daemon=False
+        )
+        slot.process.start()
+        slot.started_at = time.monotonic()
+        logger.info('Supervisor started worker index=%s pid=%s', slot.index, slot.process.pid)
+
+    def _schedule_restart(self, slot: _Slot, reason: str) -> None:
+        uptime = time.monotonic() - slot.started_at
+        if uptime >= self.stable_after_seconds or slot.backoff == 0:
+            slot.backoff = self.backoff_initial_seconds
+        else:
+            slot.backoff = min(slot.backoff * 2, self.backoff_max_seconds)
+        slot.restarts += 1
+        slot.next_start_at = time.monotonic() + slot.backoff
+        logger.warning(
+            'Supervisor worker index=%s pid=%s %s; restarting in %.1fs (restarts=%s)',
+            slot.index, slot.process.pid if slot.process else None, reason, slot.backoff, slot.restarts,
+        )
+        slot.process = None
+
+    def _check(self, slot: _Slot) -> None:
+        now = time.monotonic()
+        if slot.process is None:
+            if now >= slot.next_start_at:
+                self._start(slot)
+            return
+        if not slot.process.is_alive():
+            slot.process.join(timeout=0)
+            self._schedule_restart(slot, f'exited code={slot.process.exitcode}')
+            return
+        age = time.time() - self._heartbeats[slot.index]
+        if age > self.heartbeat_timeout_seconds:
+            slot.process.kill()
+            slot.process.join(timeout=5)
+            self._schedule_restart(slot, f'heartbeat stale ({age:.0f}s)')
+
+    def status(self) -> list[dict]:
+        now = time.time()
+        result = []
+        for slot in self._slots:
+            alive = bool(slot.process and slot.process.is_alive())
+            age = now - self._heartbeats[slot.index] if alive else None
+            result.append({
+                'index': slot.index,
+                'pid': slot.process.pid if slot.process else None,
+                'alive': alive and age is not None and age <= self.heartbeat_timeout_seconds,
+                'heartbeat_age_seconds': round(age, 3) if age is not None else None,
+                'restarts': slot.restarts,
+            })
+        return result
+
+    def _write_status(self) -> None:
+        if not self.status_file:
+            return
+        tmp = f'{self.status_file}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump({'updated_at': time.time(), 'workers': self.status()}, fh)
+        os.replace(tmp, self.status_file)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _drain(self) -> None:
+        alive = [s.process for s in self._slots if s.process and s.process.is_alive()]
+        logger.info('Supervisor draining %s workers (timeout=%ss)', len(alive), self.drain_seconds)
+        for p in alive:
+            p.terminate()  # SIGTERM → drenaje en el hijo
+        deadline = time.monotonic() + self.drain_seconds
+        for p in alive:
+            p.join(timeout=max(0.0, deadline - time.monotonic()))
+        for p in alive:
+            if p.is_alive():
+                logger.warning('Supervisor killing worker pid=%s after drain timeout', p.pid)
+                p.kill()
+                p.join(timeout=5)
+
+    def run(self) -> None:
+        if threading.current_thread() is threading.main_thread():
+            def _on_signal(signum, frame):  # type: ignore
+                logger.info('Supervisor received signal %s', signum)
+                self.stop()
+            signal.signal(signal.SIGTERM, _on_signal)
+            signal.signal(signal.SIGINT, _on_signal)
+
+        for slot in self._slots:
+            self._start(slot)
+        try:
+            while not self._stopping.is_set():
+                for slot in self._slots:
+                    self._check(slot)
+                self._write_status()
+                self._stopping.wait(self.poll_seconds)
+        finally:
+            self._drain()
+            self._write_status()
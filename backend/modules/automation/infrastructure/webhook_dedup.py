@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from modules.automation.infrastructure.django_app.models import ProcessedWebhook
+from modules.shared.infrastructure.metrics import metrics
+
+
+def webhook_key(source: str, payload: dict, event_id: Optional[str] = None) -> str:
+    """Clave de deduplicación: el id del evento si el proveedor lo envía, si no la huella del payload."""
+    if event_id:
+        material = f'{source}:id:{event_id}'
+    else:
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        material = f'{source}:body:{canonical}'
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class WebhookDedupStore:
+    """Registro de webhooks ya aplicados: LRU en memoria delante de una tabla con TTL.
+
+    `seen` resuelve los reintentos con una consulta por clave primaria como
+    mucho (ninguna si la clave está en la LRU). `remember` se llama solo tras
+    aplicar el webhook: si falla, el reintento del proveedor vuelve a
+    procesarse.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, purge_interval_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.purge_interval_seconds = purge_interval_seconds
+        self._lock = threading.Lock()
+        # clave → expiración (epoch)
+        self._entries: 'OrderedDict[str, float]' = OrderedDict()
+        self._last_purge = time.monotonic()
+
+    def _cache_get(self, key: str) -> bool:
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def _cache_put(self, key: str, expires: float) -> None:
+        with self._lock:
+            self._entries[key] = expires
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def seen(self, source: str, key: str) -> bool:
+        if self._cache_get(key):
+            metrics.inc('webhook_dedup_total', source=source, outcome='hit_memory')
+            return True
+        expires_at = (
+            ProcessedWebhook.objects.filter(key=key, expires_at__gt=timezone.now())  # type: ignore[attr-defined]
+            .values_list('expires_at', flat=True)
+            .first()
+        )
+        if expires_at is None:
+            metrics.inc('webhook_dedup_total', source=source, outcome='miss')
+            return False
+        self._cache_put(key, expires_at.timestamp())
+        metrics.inc('webhook_dedup_total', source=source, outcome='hit_db')
+        return True
+
+    def remember(self, source: str, key: str) -> None:
+        expires = time.time() + self.ttl_seconds
+        expires_at = datetime.fromtimestamp(expires, tz=dt_timezone.utc)
+        ProcessedWebhook.objects.bulk_create(  # type: ignore[attr-defined]
+            [ProcessedWebhook(key=key, source=source, expires_at=expires_at)],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['expires_at'],
+        )
+        self._cache_put(key, expires)
+        self._maybe_purge()
+
+    def _maybe_purge(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_purge < self.purge_interval_seconds:
+                return
+            self._last_purge = now
+        self.purge_expired()
+
+    def purge_expired(self) -> int:
+        deleted, _ = ProcessedWebhook.objects.filter(expires_at__lte=timezone.now()).delete()  # type: ignore[attr-defined]
+        if deleted:
+            metrics.inc('webhook_dedup_purged_total', deleted)
+        return deleted
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_store: Optional[WebhookDedupStore] = None
+_store_lock = threading.Lock()
+
+
+def get_webhook_dedup_store() -> Optional[WebhookDedupStore]:
+    """Store compartido por proceso, o None si WEBHOOK_DEDUP_ENABLED está desactivado."""
+    global _store
+    if not getattr(settings, 'WEBHOOK_DEDUP_ENABLED', True):
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = WebhookDedupStore(
+                ttl_seconds=getattr(settings, 'WEBHOOK_DEDUP_TTL_SECONDS', 86400.0),
+                max_entries=getattr(settings, 'WEBHOOK_DEDUP_MEMORY_SIZE', 10000),
+                purge_interval_seconds=getattr(settings, 'WEBHOOK_DEDUP_PURGE_SECONDS', 300.0),
+            )
+        return _store
+
+
+def reset_webhook_dedup_store() -> None:
+    global _store
+    with _store_lock:
+        _store = None
@@ -1,58 +1,206 @@
+import functools
 import json
+import signal
+import threading
 import time
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 
 from django.conf import settings
 
 from modules.automation.application.dtos import DocumentCreatedEvent
-from modules.analysis.infrastructure.adapters.automation_notifier_http import HttpAutomationNotifier
+from modules.analysis.api.container import make_analyze_document_use_case
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.infrastructure.adapters.pdf_text_extractor_local import shutdown_extraction_pool
+from modules.automation.infrastructure.retry_topology import RetryTopology
+from modules.shared.infrastructure.http_clients import close_all_http_clients
+from modules.shared.infrastructure.deadline import deadline_scope
+from modules.shared.infrastructure.metrics import metrics
 
 
 logger = logging.getLogger(__name__)
 
+# on_failure(ch, properties, body, error) -> outcome; corre en el hilo de la conexión
+FailureRouter = Callable[[Any, Any, bytes, str], str]
 
-def run_worker(url: Optional[str] = None, queue: Optional[str] = None) -> None:
+
+def parse_event(body: bytes) -> DocumentCreatedEvent:
+    payload = json.loads(body.decode('utf-8'))
+    return DocumentCreatedEvent(
+        document_id=int(payload['document_id']),
+        company_id=int(payload['company_id']),
+        name=str(payload['name']),
+        pdf_url=str(payload['pdf_url']),
+    )
+
+
+def make_analysis_handler(use_case: AnalyzeDocumentUseCase) -> Callable[[bytes], None]:
+    def _handle(body: bytes) -> None:
+        ev = parse_event(body)
+        logger.info('Worker received document_created id=%s', ev.document_id)
+        outcome = use_case.execute(
+            document_id=ev.document_id,
+            company_id=ev.company_id,
+            name=ev.name,
+            pdf_url=ev.pdf_url,
+        )
+        metrics.inc('analysis_dispatch_total', outcome=outcome)
+    return _handle
+
+
+class MessageDispatcher:
+    """Procesa mensajes con hasta `concurrency` en vuelo.
+
+    Con `concurrency=1` el handler corre en el hilo de la conexión (modo
+    clásico). Con más, se despacha a un pool acotado y el ack/nack se
+    devuelve al hilo de la conexión con `add_callback_threadsafe`, ya que
+    los canales de pika no son thread-safe.
+
+    Si se pasa `on_failure`, los mensajes fallidos se republican (p. ej. a
+    una cola de reintento) y el original se confirma; sin él se hace nack.
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        handler: Callable[[bytes], None],
+        concurrency: int = 1,
+        on_failure: Optional[FailureRouter] = None,
+    ) -> None:
+        self.connection = connection
+        self.handler = handler
+        self.concurrency = max(1, int(concurrency))
+        self.on_failure = on_failure
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.concurrency > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='automation-dispatch')
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def on_message(self, ch, method, properties, body):  # type: ignore
+        with self._lock:
+            self.in_flight += 1
+            metrics.set_gauge('worker_in_flight', self.in_flight)
+        if self._executor is None:
+            self._settle(ch, method.delivery_tag, properties, body, self._run_handler(body))
+            return
+        self._executor.submit(self._process_in_pool, ch, method.delivery_tag, properties, body)
+
+    def _run_handler(self, body: bytes) -> Optional[str]:
+        """Devuelve None si el handler terminó bien, o el error en texto."""
+        try:
+            with deadline_scope(getattr(settings, 'AUTOMATION_MESSAGE_DEADLINE_SECONDS', 0)):
+                self.handler(body)
+            return None
+        except Exception as exc:
+            logger.exception('Worker failed processing message')
+            return f'{type(exc).__name__}: {exc}'
+
+    def _process_in_pool(self, ch, delivery_tag: int, properties, body: bytes) -> None:  # type: ignore
+        error = self._run_handler(body)
+        self.connection.add_callback_threadsafe(
+            functools.partial(self._settle, ch, delivery_tag, properties, body, error)
+        )
+
+    def _settle(self, ch, delivery_tag: int, properties, body: bytes, error: Optional[str]) -> None:  # type: ignore
+        with self._lock:
+            self.in_flight -= 1
+            metrics.set_gauge('worker_in_flight', self.in_flight)
+        if error is None:
+            ch.basic_ack(delivery_tag=delivery_tag)
+            metrics.inc('worker_messages_total', outcome='ack')
+            return
+        if self.on_failure is None:
+            ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+            metrics.inc('worker_messages_total', outcome='nack')
+            return
+        try:
+            outcome = self.on_failure(ch, properties, body, error)
+        except Exception:
+            # No se pudo republicar: devolver a la cola para no perder el mensaje
+            logger.exception('Worker failed routing message to retry queue; requeueing')
+            ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            metrics.inc('worker_messages_total', outcome='requeue')
+            return
+        ch.basic_ack(delivery_tag=delivery_tag)
+        metrics.inc('worker_messages_total', outcome=outcome)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def drain(self, timeout_seconds: float) -> bool:
+        """Espera a que terminen los mensajes en vuelo y atiende sus acks pendientes."""
+        self.shutdown(wait=True)
+        deadline = time.monotonic() + timeout_seconds
+        while self.in_flight > 0 and time.monotonic() < deadline:
+            self.connection.process_data_events(time_limit=0.1)
+        return self.in_flight == 0
+
+
+def run_worker(
+    url: Optional[str] = None,
+    queue: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    install_signal_handlers: bool = False,
+    on_heartbeat: Optional[Callable[[], None]] = None,
+    heartbeat_seconds: float = 5.0,
+) -> None:
     amqp_url = url or getattr(settings, 'RABBITMQ_URL', '')
     qname = queue or getattr(settings, 'AUTOMATION_QUEUE', 'document_created')
+    in_flight = concurrency or getattr(settings, 'AUTOMATION_WORKER_CONCURRENCY', 1)
+    drain_timeout = getattr(settings, 'AUTOMATION_WORKER_DRAIN_SECONDS', 30.0)
     if not amqp_url or not qname:
         logger.warning('RabbitMQ not configured; worker idle')
         while True:
-            time.sleep(5)
+            if on_heartbeat:
+                on_heartbeat()
+            time.sleep(heartbeat_seconds)
 
     import pika  # type: ignore
     params = pika.URLParameters(amqp_url)
     connection = pika.BlockingConnection(params)
     channel = connection.channel()
-    channel.queue_declare(queue=qname, durable=True)
-    channel.basic_qos(prefetch_count=1)
-
-    notifier = HttpAutomationNotifier()
+    topology = RetryTopology(qname)
+    topology.declare(channel)
+    # prefetch = mensajes en vuelo permitidos por consumidor
+    channel.basic_qos(prefetch_count=in_flight)
 
-    def _cb(ch, method, properties, body):  # type: ignore
-        try:
-            payload = json.loads(body.decode('utf-8'))
-            ev = DocumentCreatedEvent(
-                document_id=int(payload['document_id']),
-                company_id=int(payload['company_id']),
-                name=str(payload['name']),
-                pdf_url=str(payload['pdf_url']),
-            )
-            logger.info('Worker received document_created id=%s', ev.document_id)
-            notifier.notify_document_created(
-                document_id=ev.document_id,
-                company_id=ev.company_id,
-                name=ev.name,
-                pdf_url=ev.pdf_url,
-            )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-        except Exception:
-            # nack y requeue simple; para producción usar DLQ y backoff
-            logger.exception('Worker failed processing message; nacking')
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    dispatcher = MessageDispatcher(
+        connection,
+        make_analysis_handler(make_analyze_document_use_case()),
+        concurrency=in_flight,
+        on_failure=topology.route_failure,
+    )
 
-    channel.basic_consume(queue=qname, on_message_callback=_cb)
-    logger.info('Worker started; waiting for messages on queue=%s', qname)
-    channel.start_consuming()
+    if install_signal_handlers:
+        # SIGTERM/SIGINT: dejar de consumir; el drenaje ocurre al salir de start_consuming
+        def _request_stop(signum, frame):  # type: ignore
+            logger.info('Worker received signal %s; draining', signum)
+            connection.add_callback_threadsafe(channel.stop_consuming)
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
 
+    if on_heartbeat:
+        def _beat() -> None:
+            on_heartbeat()
+            connection.call_later(heartbeat_seconds, _beat)
+        _beat()
 
+    channel.basic_consume(queue=qname, on_message_callback=dispatcher.on_message)
+    logger.info('Worker started; waiting for messages on queue=%s concurrency=%s', qname, in_flight)
+    try:
+        channel.start_consuming()
+    finally:
+        try:
+            if dispatcher.drain(drain_timeout):
+                logger.info('Worker drained in-flight messages')
+            else:
+                logger.warning('Worker drain timed out with %s messages in flight (will be redelivered)', dispatcher.in_flight)
+            connection.close()
+        except Exception:
+            # Conexión ya perdida: los mensajes sin ack vuelven a la cola
+            logger.exception('Worker shutdown without clean drain')
+        close_all_http_clients()
+        shutdown_extraction_pool()
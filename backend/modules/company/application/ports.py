@@ -10,6 +10,7 @@ class CompanyCommandRepository(Protocol):
 
 class CompanyQueryRepository(Protocol):
     def get_by_id(self, company_id: int) -> Optional[CompanyDTO]: ...
+    def get_many(self, company_ids: list[int]) -> list[CompanyDTO]: ...
     def list_all(self) -> list[CompanyDTO]: ...
 
 
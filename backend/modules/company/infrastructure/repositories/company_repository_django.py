@@ -16,6 +16,9 @@ class DjangoCompanyRepository(CompanyCommandRepository, CompanyQueryRepository):
             return None
         return orm_to_dto(obj)
 
+    def get_many(self, company_ids: list[int]) -> list[CompanyDTO]:
+        return [orm_to_dto(o) for o in Company.objects.filter(id__in=company_ids)]
+
     def list_all(self) -> list[CompanyDTO]:
         return [orm_to_dto(o) for o in Company.objects.all().order_by('id')]
 
@@ -0,0 +1,44 @@
+import codecs
+import csv
+import json
+from typing import IO, Any, Iterator
+
+
+# Columnas del CSV: un grupo de firmantes (1 o 2) por fila
+CSV_COLUMNS = (('signer1_name', 'signer1_email'), ('signer2_name', 'signer2_email'))
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[list[dict]]:
+    """Lee el CSV fila a fila sin cargarlo entero en memoria."""
+    reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+    for record in reader:
+        signers = []
+        for name_col, email_col in CSV_COLUMNS:
+            name = (record.get(name_col) or '').strip()
+            email = (record.get(email_col) or '').strip()
+            if name or email:
+                signers.append({'name': name, 'email': email})
+        yield signers
+
+
+def iter_jsonl_rows(stream: IO[bytes]) -> Iterator[Any]:
+    """Una línea JSON por documento: `[{"name", "email"}, ...]` o `{"signers": [...]}`."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            # La fila se reporta como inválida en el resumen de la campaña
+            yield None
+            continue
+        yield row.get('signers') if isinstance(row, dict) else row
+
+
+def iter_upload_rows(upload: Any) -> Iterator[Any]:
+    name = (getattr(upload, 'name', '') or '').lower()
+    content_type = (getattr(upload, 'content_type', '') or '').lower()
+    if name.endswith('.csv') or 'csv' in content_type:
+        return iter_csv_rows(upload)
+    return iter_jsonl_rows(upload)
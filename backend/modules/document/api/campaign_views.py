@@ -0,0 +1,43 @@
+from rest_framework import status, viewsets
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+
+from modules.company.api.token import company_id_from_request
+from modules.document.api.campaign_input import iter_upload_rows
+from modules.document.api.container import make_create_campaign_use_case
+from modules.document.infrastructure.repositories.campaign_repository_django import DjangoCampaignRepository
+from .serializers import CampaignCreateSerializer, CampaignSerializer
+
+
+class CampaignViewSet(viewsets.ViewSet):
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    @extend_schema(tags=["Campaign"], request=CampaignCreateSerializer, responses={201: CampaignSerializer})
+    def create(self, request, *args, **kwargs):
+        cid = company_id_from_request(request)
+        if not cid:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        serializer = CampaignCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        rows = iter_upload_rows(data['signers_file']) if data.get('signers_file') else iter(data['signers'])
+        try:
+            campaign = make_create_campaign_use_case().execute(cid, data['name'], data['pdf_url'], rows)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            CampaignSerializer(campaign).data,
+            status=status.HTTP_201_CREATED,
+            headers={'Location': f'/api/campaigns/{campaign.id}/'},
+        )
+
+    @extend_schema(tags=["Campaign"], responses={200: CampaignSerializer, 404: None})
+    def retrieve(self, request, pk=None, *args, **kwargs):
+        cid = company_id_from_request(request)
+        if not cid:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        campaign = DjangoCampaignRepository().get(int(pk))
+        if not campaign or campaign.company_id != cid:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(CampaignSerializer(campaign).data)
@@ -1,3 +1,7 @@
+from typing import Optional
+
+from django.conf import settings
+
 from modules.document.application.ports import (
     DocumentCommandRepository,
     DocumentQueryRepository,
@@ -7,10 +11,21 @@ from modules.document.application.use_cases.list_documents import ListDocumentsU
 from modules.document.application.use_cases.get_document import GetDocumentUseCase
 from modules.document.application.use_cases.update_document_partial import UpdateDocumentPartialUseCase
 from modules.document.application.use_cases.delete_document import DeleteDocumentUseCase
+from modules.document.application.use_cases.send_document_to_sign import SendDocumentToSignUseCase
+from modules.document.application.use_cases.enqueue_send_to_sign import EnqueueSendToSignUseCase
+from modules.document.application.use_cases.bulk_send_to_sign import BulkSendDocumentsToSignUseCase
+from modules.document.application.use_cases.reconcile_document_statuses import ReconcileDocumentStatusesUseCase
+from modules.document.application.use_cases.backfill_zapsign_documents import BackfillZapSignDocumentsUseCase
+from modules.document.application.use_cases.create_campaign import CreateCampaignUseCase
+from modules.document.application.use_cases.apply_zapsign_webhook_batch import ApplyZapSignWebhookBatchUseCase
 from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.infrastructure.repositories.send_job_repository_django import DjangoSendJobRepository
+from modules.document.infrastructure.repositories.backfill_checkpoint_repository_django import DjangoBackfillCheckpointRepository
+from modules.document.infrastructure.repositories.campaign_repository_django import DjangoCampaignRepository
+from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
 from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
 from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
-from modules.automation.infrastructure.adapters.rabbitmq_publisher import RabbitMqEventPublisher
+from modules.automation.infrastructure.adapters.outbox_publisher import OutboxEventPublisher
 
 
 def get_document_command_repo() -> DocumentCommandRepository:
@@ -22,11 +37,11 @@ def get_document_query_repo() -> DocumentQueryRepository:
 
 
 def make_create_document_use_case() -> CreateDocumentUseCase:
+    # El evento se escribe en el outbox junto con el documento; el relay lo publica
     return CreateDocumentUseCase(
-        document_repository=get_document_command_repo(),
+        document_repository=DjangoDocumentRepository(outbox=OutboxEventPublisher()),
         company_repository=DjangoCompanyRepository(),
         zap_sign_client=HttpZapSignClient(),
-        event_publisher=RabbitMqEventPublisher(),
     )
 
 
@@ -46,3 +61,63 @@ def make_delete_document_use_case() -> DeleteDocumentUseCase:
     return DeleteDocumentUseCase(document_repository=get_document_command_repo())
 
 
+def make_send_document_to_sign_use_case() -> SendDocumentToSignUseCase:
+    return SendDocumentToSignUseCase(
+        document_commands=get_document_command_repo(),
+        document_queries=get_document_query_repo(),
+        company_queries=DjangoCompanyRepository(),
+        signer_queries=DjangoSignerRepository(),
+        zap_sign_client=HttpZapSignClient(),
+    )
+
+
+def make_enqueue_send_to_sign_use_case() -> EnqueueSendToSignUseCase:
+    return EnqueueSendToSignUseCase(
+        signer_queries=DjangoSignerRepository(),
+        send_jobs=DjangoSendJobRepository(),
+    )
+
+
+def make_bulk_send_to_sign_use_case(concurrency: Optional[int] = None) -> BulkSendDocumentsToSignUseCase:
+    return BulkSendDocumentsToSignUseCase(
+        document_commands=get_document_command_repo(),
+        document_queries=get_document_query_repo(),
+        company_queries=DjangoCompanyRepository(),
+        signer_queries=DjangoSignerRepository(),
+        zap_sign_client=HttpZapSignClient(),
+        send_jobs=DjangoSendJobRepository(),
+        concurrency=concurrency or getattr(settings, 'BULK_SEND_CONCURRENCY', 8),
+    )
+
+
+def make_reconcile_document_statuses_use_case(concurrency: Optional[int] = None) -> ReconcileDocumentStatusesUseCase:
+    return ReconcileDocumentStatusesUseCase(
+        document_commands=get_document_command_repo(),
+        company_queries=DjangoCompanyRepository(),
+        zap_sign_client=HttpZapSignClient(),
+        concurrency=concurrency or getattr(settings, 'RECONCILE_CONCURRENCY', 4),
+    )
+
+
+def make_backfill_zapsign_documents_use_case(concurrency: Optional[int] = None) -> BackfillZapSignDocumentsUseCase:
+    return BackfillZapSignDocumentsUseCase(
+        company_queries=DjangoCompanyRepository(),
+        document_commands=get_document_command_repo(),
+        zap_sign_client=HttpZapSignClient(),
+        checkpoints=DjangoBackfillCheckpointRepository(),
+        concurrency=concurrency or getattr(settings, 'ZAPSIGN_BACKFILL_CONCURRENCY', 4),
+    )
+
+
+def make_create_campaign_use_case() -> CreateCampaignUseCase:
+    return CreateCampaignUseCase(
+        campaigns=DjangoCampaignRepository(),
+        batch_size=getattr(settings, 'CAMPAIGN_BATCH_SIZE', 500),
+    )
+
+
+def make_apply_zapsign_webhook_batch_use_case() -> ApplyZapSignWebhookBatchUseCase:
+    return ApplyZapSignWebhookBatchUseCase(
+        document_commands=get_document_command_repo(),
+        document_queries=get_document_query_repo(),
+    )
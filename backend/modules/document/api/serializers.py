@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 
@@ -26,3 +27,81 @@ class DocumentUpdateSerializer(serializers.Serializer):
     status = serializers.CharField(required=False)
 
 
+
+
+class SendJobSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    document_id = serializers.IntegerField()
+    status = serializers.CharField()
+    attempts = serializers.IntegerField()
+    error = serializers.CharField(allow_blank=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    finished_at = serializers.DateTimeField(allow_null=True, read_only=True)
+
+
+class BulkSendToSignSerializer(serializers.Serializer):
+    document_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+    def validate_document_ids(self, value):
+        limit = getattr(settings, 'BULK_SEND_MAX_DOCUMENTS', 500)
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} documents per request')
+        return value
+
+
+class BulkSendResultSerializer(serializers.Serializer):
+    document_id = serializers.IntegerField()
+    outcome = serializers.CharField()
+    error = serializers.CharField(allow_null=True, required=False)
+    document = DocumentSerializer(allow_null=True, required=False)
+    job = SendJobSerializer(allow_null=True, required=False)
+
+
+class BackfillStartSerializer(serializers.Serializer):
+    restart = serializers.BooleanField(required=False, default=False)
+
+
+class BackfillProgressSerializer(serializers.Serializer):
+    company_id = serializers.IntegerField()
+    status = serializers.CharField()
+    next_page = serializers.IntegerField()
+    total_pages = serializers.IntegerField(allow_null=True)
+    imported = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    error = serializers.CharField(allow_blank=True)
+    updated_at = serializers.DateTimeField(allow_null=True, read_only=True)
+
+
+class CampaignSignerSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=200)
+    email = serializers.CharField(max_length=254)
+
+
+class CampaignCreateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    pdf_url = serializers.URLField(max_length=4096)
+    # JSON: lista de grupos de firmantes. Para listas grandes usar el fichero `signers_file` (CSV o JSONL)
+    signers = serializers.ListField(child=serializers.ListField(child=serializers.DictField()), required=False)
+    signers_file = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('signers') and not attrs.get('signers_file'):
+            raise serializers.ValidationError('Provide signers or signers_file')
+        return attrs
+
+
+class CampaignSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    company_id = serializers.IntegerField()
+    name = serializers.CharField()
+    pdf_url = serializers.CharField()
+    status = serializers.CharField()
+    total_rows = serializers.IntegerField()
+    invalid_rows = serializers.IntegerField()
+    documents_created = serializers.IntegerField()
+    sent = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    pending = serializers.IntegerField()
+    errors = serializers.ListField(child=serializers.DictField(), allow_null=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
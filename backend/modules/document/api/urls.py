@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import DocumentViewSet
+from .campaign_views import CampaignViewSet
 from rest_framework.decorators import action
 from .webhooks import zapsign_webhook
 
 
 router = DefaultRouter()
 router.register(r'documents', DocumentViewSet, basename='document')
+router.register(r'campaigns', CampaignViewSet, basename='campaign')
 
 urlpatterns = [
     path('', include(router.urls)),
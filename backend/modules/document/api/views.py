@@ -1,3 +1,5 @@
+import math
+
 from rest_framework import viewsets, mixins, status
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
@@ -9,22 +11,54 @@ from modules.document.api.container import (
     make_get_document_use_case,
     make_update_document_partial_use_case,
     make_delete_document_use_case,
+    make_send_document_to_sign_use_case,
+    make_enqueue_send_to_sign_use_case,
+    make_bulk_send_to_sign_use_case,
 )
-from modules.document.application.use_cases.send_document_to_sign import SendDocumentToSignUseCase
-from modules.document.application.ports import DocumentCommandRepository, DocumentQueryRepository
-from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
-from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
-from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
 from modules.document.application.dtos import CreateDocumentDTO
 from modules.company.api.token import company_id_from_request
-from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
-from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
-from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
-from .serializers import DocumentCreateSerializer, DocumentSerializer, DocumentUpdateSerializer
+from modules.shared.domain.errors import UpstreamUnavailable
+from .serializers import (
+    DocumentCreateSerializer,
+    DocumentSerializer,
+    DocumentUpdateSerializer,
+    SendJobSerializer,
+    BulkSendToSignSerializer,
+    BulkSendResultSerializer,
+    BackfillStartSerializer,
+    BackfillProgressSerializer,
+)
 from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
 from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
 from modules.automation.application.dtos import DocumentCreatedEvent
-from modules.automation.infrastructure.adapters.rabbitmq_publisher import RabbitMqEventPublisher
+from modules.automation.infrastructure.adapters.outbox_publisher import OutboxEventPublisher
+from modules.document.infrastructure.repositories.send_job_repository_django import DjangoSendJobRepository
+from modules.document.infrastructure.repositories.backfill_checkpoint_repository_django import DjangoBackfillCheckpointRepository
+from modules.document.infrastructure.backfill_runner import start_backfill
+from django.conf import settings
+from django.db import transaction
+
+
+def _wants_async(request) -> bool:
+    # ?async=1 o `Prefer: respond-async` (RFC 7240); SEND_TO_SIGN_ASYNC lo hace por defecto
+    flag = str(request.query_params.get('async', '')).lower()
+    if flag in ('0', 'false'):
+        return False
+    if flag in ('1', 'true'):
+        return True
+    if 'respond-async' in request.headers.get('Prefer', ''):
+        return True
+    return bool(getattr(settings, 'SEND_TO_SIGN_ASYNC', False))
+
+
+def _sync_bulk_send_limit() -> int:
+    """Envíos que caben en una petición: presupuesto × rate limit de ZapSign + ráfaga."""
+    limit = getattr(settings, 'BULK_SEND_MAX_DOCUMENTS', 500)
+    rate = getattr(settings, 'ZAPSIGN_RATE_LIMIT_PER_SECOND', 5.0)
+    deadline = getattr(settings, 'REQUEST_DEADLINE_SECONDS', 30.0)
+    if rate <= 0 or not deadline:
+        return limit
+    return min(limit, int(deadline * rate + getattr(settings, 'ZAPSIGN_RATE_LIMIT_BURST', 10.0)))
 
 
 class DocumentViewSet(mixins.ListModelMixin,
@@ -103,28 +137,105 @@ class DocumentViewSet(mixins.ListModelMixin,
         return Response(status=status.HTTP_204_NO_CONTENT if ok else status.HTTP_404_NOT_FOUND)
 
     @action(detail=True, methods=['post'], url_path='send_to_sign')
-    @extend_schema(tags=["Document"], responses=DocumentSerializer)
+    @extend_schema(tags=["Document"], responses={200: DocumentSerializer, 202: SendJobSerializer})
     def send_to_sign(self, request, pk=None, *args, **kwargs):
         cid = company_id_from_request(request)
         if not cid:
             return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
-        doc_commands: DocumentCommandRepository = DjangoDocumentRepository()
-        doc_queries: DocumentQueryRepository = DjangoDocumentRepository()
         current = make_get_document_use_case().execute(int(pk))
         if not current or current.company_id != cid:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        use_case = SendDocumentToSignUseCase(
-            document_commands=doc_commands,
-            document_queries=doc_queries,
-            company_queries=DjangoCompanyRepository(),
-            signer_queries=DjangoSignerRepository(),
-            zap_sign_client=HttpZapSignClient(),
-        )
-        result = use_case.execute(int(pk))
+        if _wants_async(request):
+            # El worker de envíos (run_send_jobs) llama a ZapSign; aquí solo se valida y se encola
+            try:
+                job = make_enqueue_send_to_sign_use_case().execute(current.id)
+            except ValueError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                SendJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': f'/api/documents/send_jobs/{job.id}/'},
+            )
+        try:
+            result = make_send_document_to_sign_use_case().execute(int(pk))
+        except UpstreamUnavailable as exc:
+            headers = {}
+            if exc.retry_after_seconds is not None:
+                headers['Retry-After'] = str(math.ceil(exc.retry_after_seconds))
+            return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers=headers)
         if not result:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
         return Response(DocumentSerializer(result).data)
 
+    @action(detail=False, methods=['post'], url_path='bulk_send_to_sign')
+    @extend_schema(
+        tags=["Document"],
+        request=BulkSendToSignSerializer,
+        responses={200: BulkSendResultSerializer(many=True), 202: BulkSendResultSerializer(many=True)},
+    )
+    def bulk_send_to_sign(self, request, *args, **kwargs):
+        cid = company_id_from_request(request)
+        if not cid:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        serializer = BulkSendToSignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        document_ids = serializer.validated_data['document_ids']
+        # Lo que no cabe en el presupuesto de la petición lo envía el worker de send jobs
+        queue = _wants_async(request) or len(set(document_ids)) > _sync_bulk_send_limit()
+        results = make_bulk_send_to_sign_use_case().execute(document_ids, company_id=cid, queue=queue)
+        summary: dict[str, int] = {}
+        for r in results:
+            summary[r.outcome] = summary.get(r.outcome, 0) + 1
+        return Response(
+            {'summary': summary, 'results': BulkSendResultSerializer(results, many=True).data},
+            status=status.HTTP_202_ACCEPTED if queue else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get', 'post'], url_path='backfill')
+    @extend_schema(
+        tags=["Document"],
+        request=BackfillStartSerializer,
+        responses={200: BackfillProgressSerializer, 202: BackfillProgressSerializer, 404: None, 409: BackfillProgressSerializer},
+    )
+    def backfill(self, request, *args, **kwargs):
+        cid = company_id_from_request(request)
+        if not cid:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        checkpoints = DjangoBackfillCheckpointRepository()
+        if request.method == 'GET':
+            progress = checkpoints.get(cid)
+            if not progress:
+                return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response(BackfillProgressSerializer(progress).data)
+        serializer = BackfillStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # La importación puede durar minutos: corre en segundo plano y se consulta con GET
+        started = start_backfill(cid, restart=serializer.validated_data['restart'])
+        progress = checkpoints.get(cid)
+        data = BackfillProgressSerializer(progress).data if progress else {'company_id': cid, 'status': 'running'}
+        # Ya había una importación en curso: no se lanza otra, se devuelve su progreso
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED if started else status.HTTP_409_CONFLICT,
+            headers={'Location': '/api/documents/backfill/'},
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'send_jobs/(?P<job_id>[0-9a-fA-F-]{32,36})')
+    @extend_schema(tags=["Document"], responses={200: SendJobSerializer, 404: None})
+    def send_job(self, request, job_id=None, *args, **kwargs):
+        cid = company_id_from_request(request)
+        if not cid:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        job = DjangoSendJobRepository().get(job_id)
+        if not job:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        doc = make_get_document_use_case().execute(job.document_id)
+        if not doc or doc.company_id != cid:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        data = SendJobSerializer(job).data
+        data['document'] = DocumentSerializer(doc).data
+        return Response(data)
+
     @action(detail=True, methods=['get'], url_path='analysis')
     @extend_schema(tags=["Document"], responses={200: None, 404: None})
     def analysis(self, request, pk=None, *args, **kwargs):
@@ -158,19 +269,20 @@ class DocumentViewSet(mixins.ListModelMixin,
         current = make_get_document_use_case().execute(int(pk))
         if not current or current.company_id != cid:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        # Marcar/crear análisis como 'running' (idempotente)
-        DocumentAnalysis.objects.update_or_create(  # type: ignore[attr-defined]
-            document_id=current.id,
-            defaults={'status': 'running'}
-        )
-        # Re-publicar evento de creación para reactivar el flujo de n8n (reanálisis)
-        RabbitMqEventPublisher().publish_document_created(
-            DocumentCreatedEvent(
+        with transaction.atomic():
+            # Marcar/crear análisis como 'running' (idempotente)
+            DocumentAnalysis.objects.update_or_create(  # type: ignore[attr-defined]
                 document_id=current.id,
-                company_id=current.company_id,
-                name=current.name,
-                pdf_url=current.pdf_url,
+                defaults={'status': 'running'}
+            )
+            # Re-publicar evento de creación (vía outbox) para reactivar el flujo de n8n (reanálisis)
+            OutboxEventPublisher().publish_document_created(
+                DocumentCreatedEvent(
+                    document_id=current.id,
+                    company_id=current.company_id,
+                    name=current.name,
+                    pdf_url=current.pdf_url,
+                )
             )
-        )
         return Response({}, status=status.HTTP_202_ACCEPTED)
 
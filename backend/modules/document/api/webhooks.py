@@ -1,9 +1,12 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse, HttpRequest
+from django.conf import settings
 import json
 
-from modules.document.application.use_cases.handle_zapsign_webhook import HandleZapSignWebhookUseCase
+from modules.document.application.use_cases.handle_zapsign_webhook import HandleZapSignWebhookUseCase, parse_webhook_payload
 from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.infrastructure.webhook_inbox import append_webhook
+from modules.automation.infrastructure.webhook_dedup import get_webhook_dedup_store, webhook_key
 
 
 @csrf_exempt
@@ -18,6 +21,22 @@ def zapsign_webhook(request: HttpRequest):
     if not isinstance(body, dict):
         return JsonResponse({'detail': 'Invalid payload'}, status=400)
 
+    if getattr(settings, 'ZAPSIGN_WEBHOOK_INBOX', False):
+        # Respuesta inmediata: el consumidor del inbox aplica los eventos por lotes
+        try:
+            open_id, _, _ = parse_webhook_payload(body)
+        except ValueError:
+            return JsonResponse({'detail': 'Missing identifier'}, status=400)
+        append_webhook(body, open_id)
+        return JsonResponse({}, status=200)
+
+    # Reintentos de ZapSign de un evento ya aplicado: se responden sin tocar documentos.
+    # Con el inbox no hace falta: el consumidor ya une los eventos de cada open_id
+    dedup = get_webhook_dedup_store()
+    dedup_key = webhook_key('zapsign', body, request.headers.get('X-Event-Id')) if dedup else None
+    if dedup and dedup.seen('zapsign', dedup_key):
+        return JsonResponse({}, status=200)
+
     try:
         use_case = HandleZapSignWebhookUseCase(
             document_commands=DjangoDocumentRepository(),
@@ -30,6 +49,8 @@ def zapsign_webhook(request: HttpRequest):
     if result is None:
         # Idempotente si no se encuentra el documento
         return JsonResponse({}, status=204)
+    if dedup:
+        dedup.remember('zapsign', dedup_key)
     return JsonResponse({}, status=200)
 
 
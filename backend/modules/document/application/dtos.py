@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
 
@@ -33,6 +33,13 @@ class PageDTO:
     previous: Optional[str] = None
 
 
+@dataclass
+class SendKeyDTO:
+    key: str
+    # False si el documento ya tenía clave: puede existir un envío previo en ZapSign
+    created: bool
+
+
 @dataclass
 class ZapSignCreateResult:
     open_id: Optional[str]
@@ -40,3 +47,91 @@ class ZapSignCreateResult:
     status: Optional[str]
 
 
+
+@dataclass
+class SendJobDTO:
+    id: str
+    document_id: int
+    status: str
+    attempts: int = 0
+    error: str = ''
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+@dataclass
+class BulkSendResultDTO:
+    document_id: int
+    # sent | queued | not_found | invalid | failed
+    outcome: str
+    error: Optional[str] = None
+    document: Optional[DocumentDTO] = None
+    job: Optional[SendJobDTO] = None
+
+
+@dataclass
+class ReconcileSummaryDTO:
+    checked: int = 0
+    updated: int = 0
+    failed: int = 0
+    updated_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class ZapSignDocumentDTO:
+    open_id: str
+    token: Optional[str]
+    name: str
+    status: Optional[str]
+    pdf_url: str
+
+
+@dataclass
+class ZapSignPageDTO:
+    count: int
+    results: list[ZapSignDocumentDTO]
+    has_next: bool = False
+    page_size: int = 0  # elementos que devolvió ZapSign, incluidos los descartados de `results`
+
+
+@dataclass
+class BackfillProgressDTO:
+    company_id: int
+    # running | completed | failed
+    status: str = 'running'
+    next_page: int = 1
+    total_pages: Optional[int] = None
+    imported: int = 0
+    skipped: int = 0
+    error: str = ''
+    updated_at: Optional[datetime] = None
+
+
+@dataclass
+class CampaignDTO:
+    id: int
+    company_id: int
+    name: str
+    pdf_url: str
+    # materializing | dispatched | completed
+    status: str
+    total_rows: int = 0
+    invalid_rows: int = 0
+    documents_created: int = 0
+    sent: int = 0
+    failed: int = 0
+    errors: Optional[list] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def pending(self) -> int:
+        return max(0, self.documents_created - self.sent - self.failed)
+
+
+@dataclass
+class WebhookBatchSummaryDTO:
+    events: int = 0
+    documents: int = 0
+    updated: int = 0
+    unmatched: int = 0
@@ -1,17 +1,35 @@
 from typing import Protocol, Optional
 from dataclasses import dataclass
-from .dtos import DocumentDTO, ZapSignCreateResult, PageDTO
+from .dtos import (
+    BackfillProgressDTO,
+    CampaignDTO,
+    DocumentDTO,
+    PageDTO,
+    SendJobDTO,
+    SendKeyDTO,
+    ZapSignCreateResult,
+    ZapSignDocumentDTO,
+    ZapSignPageDTO,
+)
+from modules.signer.domain.entities import Signer
 
 
 class DocumentCommandRepository(Protocol):
     def create(self, company_id: int, name: str, pdf_url: str) -> DocumentDTO: ...
     def update_partial(self, document_id: int, **fields) -> Optional[DocumentDTO]: ...
+    def update_many(self, updates: dict[int, dict]) -> dict[int, DocumentDTO]: ...
+    def advance_status_by_open_id(self, open_id: str, status: Optional[str], token: Optional[str]) -> Optional[bool]: ...
+    def advance_statuses_by_open_id(self, changes: dict[str, tuple[Optional[str], Optional[str]]]) -> int: ...
+    def ensure_send_keys(self, document_ids: list[int]) -> dict[int, SendKeyDTO]: ...
+    def import_many(self, company_id: int, documents: list[ZapSignDocumentDTO]) -> int: ...
     def delete(self, document_id: int) -> bool: ...
 
 
 class DocumentQueryRepository(Protocol):
     def get_by_id(self, document_id: int) -> Optional[DocumentDTO]: ...
+    def get_many(self, document_ids: list[int]) -> list[DocumentDTO]: ...
     def get_by_open_id(self, open_id: str) -> Optional[DocumentDTO]: ...
+    def get_many_by_open_ids(self, open_ids: list[str]) -> list[DocumentDTO]: ...
     def list_all(self) -> list[DocumentDTO]: ...
     def list_by_company(self, company_id: int) -> list[DocumentDTO]: ...
     def list_paginated(self, query: 'ListDocumentsQuery') -> PageDTO: ...
@@ -19,7 +37,35 @@ class DocumentQueryRepository(Protocol):
 
 class ZapSignClient(Protocol):
     def create(self, api_token: str, name: str, pdf_url: str) -> ZapSignCreateResult: ...
-    def send_for_sign(self, api_token: str, name: str, pdf_url: str, signers: list[dict]) -> ZapSignCreateResult: ...
+    def send_for_sign(
+        self,
+        api_token: str,
+        name: str,
+        pdf_url: str,
+        signers: list[dict],
+        external_id: Optional[str] = None,
+        check_existing: bool = False,
+    ) -> ZapSignCreateResult: ...
+    def get_document(self, api_token: str, token: str) -> Optional[ZapSignCreateResult]: ...
+    def list_documents(self, api_token: str, page: int) -> ZapSignPageDTO: ...
+
+
+class SendJobRepository(Protocol):
+    def enqueue(self, document_id: int) -> SendJobDTO: ...
+    def enqueue_many(self, document_ids: list[int]) -> dict[int, SendJobDTO]: ...
+    def get(self, job_id: str) -> Optional[SendJobDTO]: ...
+
+
+class BackfillCheckpointRepository(Protocol):
+    def get(self, company_id: int) -> Optional[BackfillProgressDTO]: ...
+    def save(self, progress: BackfillProgressDTO) -> BackfillProgressDTO: ...
+
+
+class CampaignRepository(Protocol):
+    def create(self, company_id: int, name: str, pdf_url: str) -> CampaignDTO: ...
+    def get(self, campaign_id: int) -> Optional[CampaignDTO]: ...
+    def add_batch(self, campaign: CampaignDTO, rows: list[list[Signer]]) -> int: ...
+    def finish(self, campaign_id: int, total_rows: int, invalid_rows: int, errors: list[dict]) -> CampaignDTO: ...
 
 
 @dataclass
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+from modules.document.application.dtos import WebhookBatchSummaryDTO
+from modules.document.application.ports import DocumentCommandRepository, DocumentQueryRepository
+from modules.document.application.use_cases.handle_zapsign_webhook import parse_webhook_payload
+from modules.document.domain.status import next_status
+
+
+@dataclass
+class ApplyZapSignWebhookBatchUseCase:
+    """Aplica un lote de webhooks de ZapSign en orden de llegada.
+
+    Los eventos de un mismo open_id se pliegan con las reglas de
+    HandleZapSignWebhookUseCase hasta un único estado final, y todos los
+    documentos se actualizan con un solo UPDATE condicional: la transición se
+    vuelve a validar contra el estado en la BD, por si otro proceso lo cambió
+    después de leerlo.
+    """
+
+    document_commands: DocumentCommandRepository
+    document_queries: DocumentQueryRepository
+
+    def execute(self, payloads: list[dict]) -> WebhookBatchSummaryDTO:
+        summary = WebhookBatchSummaryDTO(events=len(payloads))
+        events: dict[str, list[tuple]] = {}
+        for payload in payloads:
+            try:
+                open_id, status, token = parse_webhook_payload(payload)
+            except ValueError:
+                summary.unmatched += 1
+                continue
+            events.setdefault(open_id, []).append((status, token))
+        summary.documents = len(events)
+
+        docs = {d.open_id: d for d in self.document_queries.get_many_by_open_ids(list(events))}
+        changes: dict[str, tuple] = {}
+        for open_id, doc_events in events.items():
+            doc = docs.get(open_id)
+            if doc is None:
+                # Igual que el webhook síncrono: documento desconocido → se ignora
+                summary.unmatched += len(doc_events)
+                continue
+            status, token = doc.status, doc.token
+            for incoming_status, incoming_token in doc_events:
+                status = next_status(status, incoming_status) or status
+                if incoming_token:
+                    token = incoming_token
+            if status != doc.status or token != doc.token:
+                changes[open_id] = (status if status != doc.status else None, token if token != doc.token else None)
+
+        if changes:
+            summary.updated = self.document_commands.advance_statuses_by_open_id(changes)
+        return summary
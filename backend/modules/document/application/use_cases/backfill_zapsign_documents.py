@@ -0,0 +1,96 @@
+import contextvars
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from modules.document.application.dtos import BackfillProgressDTO, ZapSignPageDTO
+from modules.document.application.ports import (
+    BackfillCheckpointRepository,
+    DocumentCommandRepository,
+    ZapSignClient,
+)
+from modules.company.application.ports import CompanyQueryRepository
+
+
+@dataclass
+class BackfillZapSignDocumentsUseCase:
+    """Importa los documentos que una empresa ya tenía en ZapSign.
+
+    Las páginas se piden en tandas de `concurrency` en paralelo y cada tanda
+    se inserta con una sola operación masiva (los open_id ya existentes se
+    omiten). Tras cada tanda se guarda el checkpoint: una ejecución
+    interrumpida continúa desde la primera página no importada.
+    """
+
+    company_queries: CompanyQueryRepository
+    document_commands: DocumentCommandRepository
+    zap_sign_client: ZapSignClient
+    checkpoints: BackfillCheckpointRepository
+    concurrency: int = 4
+
+    def execute(self, company_id: int, restart: bool = False) -> BackfillProgressDTO:
+        company = self.company_queries.get_by_id(company_id)
+        if not company:
+            raise ValueError('Company not found')
+        if not company.api_token:
+            raise ValueError('Company has no api_token')
+
+        progress = None if restart else self.checkpoints.get(company_id)
+        if progress is None or progress.status == 'completed':
+            progress = BackfillProgressDTO(company_id=company_id)
+        progress.status, progress.error = 'running', ''
+        progress = self.checkpoints.save(progress)
+
+        try:
+            if progress.total_pages is None:
+                first = self.zap_sign_client.list_documents(company.api_token, 1)
+                progress.total_pages = _total_pages(first)
+                self._import([first], progress)
+                progress.next_page = 2
+                progress = self.checkpoints.save(progress)
+
+            while progress.next_page <= (progress.total_pages or 0):
+                wave = list(range(progress.next_page, min(progress.next_page + self.concurrency, progress.total_pages + 1)))
+                pages = self._fetch(company.api_token, wave)
+                # total_pages es una estimación: la primera página sin siguiente cierra el listado
+                last = next((i for i, page in enumerate(pages) if not page.has_next), None)
+                if last is not None:
+                    pages = pages[:last + 1]
+                    progress.total_pages = wave[last]
+                elif wave[-1] == progress.total_pages:
+                    # Hay más páginas de las estimadas (p. ej. documentos nuevos): seguir hasta agotarlas
+                    progress.total_pages += 1
+                self._import(pages, progress)
+                progress.next_page = wave[len(pages) - 1] + 1
+                progress = self.checkpoints.save(progress)
+        except Exception as exc:
+            progress.status, progress.error = 'failed', f'{type(exc).__name__}: {exc}'[:1000]
+            return self.checkpoints.save(progress)
+
+        progress.status = 'completed'
+        return self.checkpoints.save(progress)
+
+    def _import(self, pages: list[ZapSignPageDTO], progress: BackfillProgressDTO) -> None:
+        documents = [doc for page in pages for doc in page.results]
+        inserted = self.document_commands.import_many(progress.company_id, documents) if documents else 0
+        progress.imported += inserted
+        progress.skipped += len(documents) - inserted
+
+    def _fetch(self, api_token: str, pages: list[int]) -> list[ZapSignPageDTO]:
+        if len(pages) == 1 or self.concurrency <= 1:
+            return [self.zap_sign_client.list_documents(api_token, p) for p in pages]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pages)), thread_name_prefix='zapsign-backfill') as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self.zap_sign_client.list_documents, api_token, p)
+                for p in pages
+            ]
+            # Si falla una página se repite la tanda entera al reanudar
+            return [f.result() for f in futures]
+
+
+def _total_pages(first: ZapSignPageDTO) -> int:
+    # Tamaño de página real (page_size), no len(results): los elementos sin open_id se descartan
+    size = first.page_size or len(first.results)
+    if not first.has_next or not size:
+        return 1
+    return max(1, math.ceil(first.count / size))
@@ -0,0 +1,122 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from modules.document.application.dtos import BulkSendResultDTO, DocumentDTO, SendKeyDTO, ZapSignCreateResult
+from modules.document.application.ports import (
+    DocumentCommandRepository,
+    DocumentQueryRepository,
+    SendJobRepository,
+    ZapSignClient,
+)
+from modules.company.application.ports import CompanyQueryRepository
+from modules.signer.application.ports import SignerQueryRepository
+
+
+@dataclass
+class BulkSendDocumentsToSignUseCase:
+    """Envía varios documentos a firma con las mismas reglas que SendDocumentToSignUseCase.
+
+    Documentos, empresas y firmantes se cargan en una consulta por tipo; las
+    llamadas a ZapSign se hacen en paralelo (hasta `concurrency`) y los
+    resultados se persisten con una sola actualización masiva.
+
+    Con `queue=True` solo se valida y se encola un send job por documento
+    (para lotes que no caben en el presupuesto de una petición).
+    """
+
+    document_commands: DocumentCommandRepository
+    document_queries: DocumentQueryRepository
+    company_queries: CompanyQueryRepository
+    signer_queries: SignerQueryRepository
+    zap_sign_client: ZapSignClient
+    send_jobs: Optional[SendJobRepository] = None
+    concurrency: int = 8
+
+    def execute(
+        self, document_ids: list[int], company_id: Optional[int] = None, queue: bool = False
+    ) -> list[BulkSendResultDTO]:
+        ids = list(dict.fromkeys(int(i) for i in document_ids))
+        docs = {d.id: d for d in self.document_queries.get_many(ids)}
+        if company_id is not None:
+            # Documentos de otra empresa se reportan como inexistentes
+            docs = {i: d for i, d in docs.items() if d.company_id == company_id}
+        companies = {c.id: c for c in self.company_queries.get_many(sorted({d.company_id for d in docs.values()}))}
+        signers = self.signer_queries.list_by_documents(list(docs.keys()))
+
+        results: dict[int, BulkSendResultDTO] = {}
+        to_send: list[tuple[DocumentDTO, str, list[dict]]] = []
+        for doc_id in ids:
+            doc = docs.get(doc_id)
+            if doc is None:
+                results[doc_id] = BulkSendResultDTO(document_id=doc_id, outcome='not_found')
+                continue
+            company = companies.get(doc.company_id)
+            if not company or not company.api_token:
+                results[doc_id] = BulkSendResultDTO(
+                    document_id=doc_id, outcome='invalid', error='Company has no api_token', document=doc
+                )
+                continue
+            doc_signers = signers.get(doc_id, [])
+            if len(doc_signers) == 0 or len(doc_signers) > 2:
+                results[doc_id] = BulkSendResultDTO(
+                    document_id=doc_id, outcome='invalid',
+                    error='Document must have 1 or 2 signers before sending', document=doc,
+                )
+                continue
+            to_send.append((doc, company.api_token, [{'name': s.name, 'email': s.email} for s in doc_signers]))
+
+        if queue:
+            if self.send_jobs is None:
+                raise ValueError('Queueing bulk sends requires a send job repository')
+            jobs = self.send_jobs.enqueue_many([doc.id for doc, _, _ in to_send]) if to_send else {}
+            for doc, _, _ in to_send:
+                results[doc.id] = BulkSendResultDTO(document_id=doc.id, outcome='queued', document=doc, job=jobs[doc.id])
+            return [results[i] for i in ids]
+
+        send_keys = self.document_commands.ensure_send_keys([doc.id for doc, _, _ in to_send]) if to_send else {}
+        updates: dict[int, dict] = {}
+        for (doc, _, _), outcome in zip(to_send, self._fan_out(to_send, send_keys)):
+            if isinstance(outcome, Exception):
+                results[doc.id] = BulkSendResultDTO(
+                    document_id=doc.id, outcome='failed', error=f'{type(outcome).__name__}: {outcome}', document=doc
+                )
+                continue
+            if not outcome.open_id:
+                # El cliente de ZapSign registra el detalle y devuelve un resultado vacío
+                results[doc.id] = BulkSendResultDTO(
+                    document_id=doc.id, outcome='failed', error='ZapSign did not accept the document', document=doc
+                )
+                continue
+            updates[doc.id] = {
+                k: v for k, v in (('open_id', outcome.open_id), ('token', outcome.token), ('status', outcome.status)) if v
+            }
+            results[doc.id] = BulkSendResultDTO(document_id=doc.id, outcome='sent', document=doc)
+
+        if updates:
+            for doc_id, updated in self.document_commands.update_many(updates).items():
+                results[doc_id].document = updated
+        return [results[i] for i in ids]
+
+    def _fan_out(self, items: list[tuple[DocumentDTO, str, list[dict]]], send_keys: dict[int, SendKeyDTO]) -> list:
+        def _send(item: tuple[DocumentDTO, str, list[dict]]) -> ZapSignCreateResult | Exception:
+            doc, api_token, payload_signers = item
+            send_key = send_keys[doc.id]
+            try:
+                return self.zap_sign_client.send_for_sign(
+                    api_token=api_token, name=doc.name, pdf_url=doc.pdf_url, signers=payload_signers,
+                    external_id=send_key.key, check_existing=not send_key.created,
+                )
+            except Exception as exc:
+                return exc
+
+        if not items:
+            return []
+        workers = max(1, min(int(self.concurrency), len(items)))
+        if workers == 1:
+            return [_send(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zapsign-bulk') as pool:
+            # Cada llamada hereda el contexto del llamante (p. ej. el deadline de la petición)
+            futures = [pool.submit(contextvars.copy_context().run, _send, item) for item in items]
+            return [f.result() for f in futures]
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from modules.document.application.dtos import CampaignDTO
+from modules.document.application.ports import CampaignRepository
+from modules.signer.domain.entities import Signer
+
+
+@dataclass
+class CreateCampaignUseCase:
+    """Crea un documento por grupo de firmantes a partir de una misma plantilla.
+
+    Las filas se consumen como iterador (el CSV/JSONL no se carga entero) y se
+    materializan en lotes de `batch_size`: documentos, firmantes y jobs de
+    envío con una inserción masiva por tabla. Los envíos los hace el worker
+    de send jobs, con el rate limit de ZapSign de la empresa.
+    """
+
+    campaigns: CampaignRepository
+    batch_size: int = 500
+    max_errors: int = 100
+
+    def execute(self, company_id: int, name: str, pdf_url: str, rows: Iterable[Any]) -> CampaignDTO:
+        name = (name or '').strip()
+        if not name:
+            raise ValueError('Campaign name is required')
+        if not pdf_url:
+            raise ValueError('Campaign pdf_url is required')
+
+        campaign = self.campaigns.create(company_id, name[:255], pdf_url)
+        batch: list[list[Signer]] = []
+        total = invalid = 0
+        errors: list[dict] = []
+        for row_number, raw in enumerate(rows, start=1):
+            total += 1
+            try:
+                batch.append(_signers_from_row(raw))
+            except ValueError as exc:
+                invalid += 1
+                if len(errors) < self.max_errors:
+                    errors.append({'row': row_number, 'error': str(exc)})
+                continue
+            if len(batch) >= self.batch_size:
+                self.campaigns.add_batch(campaign, batch)
+                batch = []
+        if batch:
+            self.campaigns.add_batch(campaign, batch)
+        return self.campaigns.finish(campaign.id, total_rows=total, invalid_rows=invalid, errors=errors)
+
+
+def _signers_from_row(raw: Any) -> list[Signer]:
+    """Mismas reglas que AddSignerToDocumentUseCase: 1 o 2 firmantes válidos con emails distintos."""
+    if not isinstance(raw, list) or not all(isinstance(s, dict) for s in raw):
+        raise ValueError('Row must be a list of {name, email} signers')
+    if len(raw) == 0 or len(raw) > 2:
+        raise ValueError('Each document needs 1 or 2 signers')
+    signers = [Signer.create(0, s.get('name', ''), s.get('email', '')) for s in raw]
+    if len({s.email for s in signers}) != len(signers):
+        raise ValueError('Email already exists for this document')
+    return signers
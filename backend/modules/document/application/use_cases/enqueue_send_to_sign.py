@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+from modules.document.application.dtos import SendJobDTO
+from modules.document.application.ports import SendJobRepository
+from modules.signer.application.ports import SignerQueryRepository
+
+
+@dataclass
+class EnqueueSendToSignUseCase:
+    """Valida lo que se puede validar sin ZapSign y encola el envío."""
+
+    signer_queries: SignerQueryRepository
+    send_jobs: SendJobRepository
+
+    def execute(self, document_id: int) -> SendJobDTO:
+        count = self.signer_queries.count_by_document(document_id)
+        if count == 0 or count > 2:
+            raise ValueError('Document must have 1 or 2 signers before sending')
+        return self.send_jobs.enqueue(document_id)
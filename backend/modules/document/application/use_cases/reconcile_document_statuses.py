@@ -0,0 +1,75 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from modules.document.application.dtos import DocumentDTO, ReconcileSummaryDTO, ZapSignCreateResult
+from modules.document.application.ports import DocumentCommandRepository, ZapSignClient
+from modules.document.domain.status import next_status
+from modules.company.application.ports import CompanyQueryRepository
+
+
+@dataclass
+class ReconcileDocumentStatusesUseCase:
+    """Consulta en ZapSign el estado de documentos que no avanzan (webhook perdido).
+
+    Los resultados pasan por las mismas reglas de progresión que el webhook y
+    se guardan con el mismo UPDATE condicional por lotes, así que nunca hacen
+    retroceder un documento que un webhook haya avanzado mientras tanto.
+    """
+
+    document_commands: DocumentCommandRepository
+    company_queries: CompanyQueryRepository
+    zap_sign_client: ZapSignClient
+    concurrency: int = 4
+
+    def execute(self, documents: list[DocumentDTO]) -> ReconcileSummaryDTO:
+        summary = ReconcileSummaryDTO()
+        companies = {c.id: c for c in self.company_queries.get_many(sorted({d.company_id for d in documents}))}
+        to_check: list[tuple[DocumentDTO, str]] = []
+        for doc in documents:
+            company = companies.get(doc.company_id)
+            # Sin token de ZapSign o sin api_token no hay nada que consultar
+            if doc.token and company and company.api_token:
+                to_check.append((doc, company.api_token))
+
+        open_ids: dict[int, dict] = {}
+        changes: dict[str, tuple[str, None]] = {}
+        progressed: set[int] = set()
+        for (doc, _), remote in zip(to_check, self._fan_out(to_check)):
+            summary.checked += 1
+            if isinstance(remote, Exception) or remote is None:
+                summary.failed += 1
+                continue
+            open_id = doc.open_id
+            if remote.open_id and not open_id:
+                open_id = str(remote.open_id)
+                open_ids[doc.id] = {'open_id': open_id}
+            # El snapshot solo descarta lo que seguro no avanza; la BD vuelve a comprobarlo al escribir
+            if open_id and next_status(doc.status, remote.status):
+                changes[open_id] = (remote.status, None)
+                progressed.add(doc.id)
+
+        if open_ids:
+            self.document_commands.update_many(open_ids)
+        advanced = self.document_commands.advance_statuses_by_open_id(changes) if changes else 0
+        summary.updated = advanced + len(set(open_ids) - progressed)
+        # Si el UPDATE condicional no aplica es porque otro escritor ya lo hizo avanzar
+        summary.updated_ids = sorted(set(open_ids) | progressed)
+        return summary
+
+    def _fan_out(self, items: list[tuple[DocumentDTO, str]]) -> list:
+        def _get(item: tuple[DocumentDTO, str]) -> ZapSignCreateResult | None | Exception:
+            doc, api_token = item
+            try:
+                return self.zap_sign_client.get_document(api_token, doc.token or '')
+            except Exception as exc:
+                return exc
+
+        if not items:
+            return []
+        workers = max(1, min(int(self.concurrency), len(items)))
+        if workers == 1:
+            return [_get(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zapsign-reconcile') as pool:
+            futures = [pool.submit(contextvars.copy_context().run, _get, item) for item in items]
+            return [f.result() for f in futures]
@@ -29,12 +29,16 @@ class SendDocumentToSignUseCase:
             raise Exception('Document must have 1 or 2 signers before sending')
 
         payload_signers = [{'name': s.name, 'email': s.email} for s in signers]
+        # Clave estable por documento: reintentos (propios o del usuario) no duplican el envío
+        send_key = self.document_commands.ensure_send_keys([document_id])[document_id]
 
         result = self.zap_sign_client.send_for_sign(
             api_token=company.api_token,
             name=doc.name,
             pdf_url=doc.pdf_url,
             signers=payload_signers,
+            external_id=send_key.key,
+            check_existing=not send_key.created,
         )
 
         # Actualizar documento si hay datos relevantes
@@ -0,0 +1,48 @@
+"""Máquina de estados de un documento según los eventos de ZapSign.
+
+Un estado solo avanza hacia otro de mayor rango; error/failed se aceptan
+desde cualquier estado salvo uno ya firmado. Las mismas reglas se aplican en
+memoria (`next_status`) y en SQL (repositorio, UPDATE condicional).
+"""
+from typing import Optional
+
+
+STATUS_RANK = {
+    'created': 0,
+    'ready': 1,
+    'pending': 2,
+    'sent': 3,
+    'signed': 4,
+    'completed': 5,
+    'error': 99,
+    'failed': 99,
+}
+# Rango de un estado desconocido (o ausente)
+UNKNOWN_RANK = -1
+
+FAILURE_STATUSES = ('error', 'failed')
+# Desde aquí ya no se acepta un fallo
+SIGNED_STATUSES = ('signed', 'completed')
+
+
+def normalize(status: Optional[str]) -> Optional[str]:
+    return status.lower() if isinstance(status, str) else status
+
+
+def rank(status: Optional[str]) -> int:
+    return STATUS_RANK.get(normalize(status) or '', UNKNOWN_RANK)
+
+
+def next_status(current: Optional[str], incoming: Optional[str]) -> Optional[str]:
+    """Estado al que debe pasar el documento, o None si `incoming` no lo hace avanzar."""
+    current_status = normalize(current)
+    incoming_status = normalize(incoming)
+    if incoming_status is None:
+        return None
+    if incoming_status in FAILURE_STATUSES:
+        if current_status not in SIGNED_STATUSES and current_status != incoming_status:
+            return incoming_status
+        return None
+    if rank(incoming_status) > rank(current_status):
+        return incoming_status
+    return None
@@ -1,20 +1,67 @@
-from typing import Optional
+from typing import Callable, Optional
 import httpx
 import logging
+import random
+import time
 from django.conf import settings
 
-from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.dtos import ZapSignCreateResult, ZapSignDocumentDTO, ZapSignPageDTO
 from modules.document.application.ports import ZapSignClient
+from modules.document.infrastructure.adapters.zapsign_rate_limiter import (
+    DbTokenBucketLimiter,
+    RateLimitExceeded,
+    parse_retry_after,
+)
+from modules.shared.domain.errors import DeadlineExceeded, UpstreamUnavailable
+from modules.shared.infrastructure.deadline import remaining, timeout_for
+from modules.shared.infrastructure.http_clients import get_http_client
+from modules.shared.infrastructure.metrics import metrics
+from modules.shared.infrastructure.resilience import get_upstream_guard
 
 
 logger = logging.getLogger(__name__)
 
+# Fallos en los que ZapSign pudo haber creado el documento o no; con external_id se reintentan
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
 
 class HttpZapSignClient(ZapSignClient):
-    def __init__(self, base_url: Optional[str] = None, timeout_seconds: float = 15.0) -> None:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout_seconds: float = 15.0,
+        rate_limiter: Optional[DbTokenBucketLimiter] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
         self.base_url = (base_url or getattr(settings, 'ZAPSIGN_API_BASE', '')).rstrip('/')
         self.timeout_seconds = timeout_seconds
         self.auth_scheme = getattr(settings, 'ZAPSIGN_AUTH_SCHEME', 'Bearer')
+        # Límite por api_token compartido entre procesos (ZAPSIGN_RATE_LIMIT_PER_SECOND=0 lo desactiva)
+        self.rate_limiter = rate_limiter or DbTokenBucketLimiter()
+        self.max_429_retries = getattr(settings, 'ZAPSIGN_RATE_LIMIT_429_RETRIES', 2)
+        self.max_attempts = max(1, getattr(settings, 'ZAPSIGN_SEND_MAX_ATTEMPTS', 3))
+        self.retry_backoff_seconds = getattr(settings, 'ZAPSIGN_RETRY_BACKOFF_SECONDS', 0.5)
+        self.retry_backoff_max_seconds = getattr(settings, 'ZAPSIGN_RETRY_BACKOFF_MAX_SECONDS', 8.0)
+        self.sleep = sleep
+
+    def _post(self, api_token: str, url: str, payload: dict, headers: dict) -> httpx.Response:
+        """POST respetando el límite del token; ante 429 pausa el bucket según Retry-After y reintenta."""
+        client = get_http_client(self.base_url)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(api_token)
+            timeout = timeout_for(self.timeout_seconds, 'zapsign')
+            with get_upstream_guard('zapsign').protect() as call:
+                resp = client.post(url, json=payload, headers=headers, timeout=timeout)
+                # 4xx/429 son respuestas válidas del upstream, no cuentan para el breaker
+                if resp.status_code >= 500:
+                    call.mark_failure()
+            if resp.status_code != 429 or attempt >= self.max_429_retries:
+                return resp
+            attempt += 1
+            retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+            # Sin Retry-After: pausa de un hueco del bucket
+            self.rate_limiter.penalize(api_token, retry_after if retry_after is not None else 1.0)
 
     def create(self, api_token: str, name: str, pdf_url: str) -> ZapSignCreateResult:
         if not self.base_url or not api_token:
@@ -47,36 +94,38 @@ class HttpZapSignClient(ZapSignClient):
             return token[:4] + '...' + token[-4:]
 
         try:
-            with httpx.Client(timeout=self.timeout_seconds) as client:
-                resp = client.post(url, json=payload, headers=headers)
-                body = None
-                try:
-                    body = resp.json()
-                except Exception:
-                    body = {'raw': resp.text[:500]}
+            resp = self._post(api_token, url, payload, headers)
+            body = None
+            try:
+                body = resp.json()
+            except Exception:
+                body = {'raw': resp.text[:500]}
 
-                if resp.is_success:
-                    # Intentar mapear múltiples posibles nombres de campos
-                    open_id = body.get('open_id') or body.get('id') or body.get('openId')
-                    token = body.get('token') or body.get('document_token') or body.get('doc_token')
-                    status = body.get('status') or body.get('document_status')
-                    if settings.DEBUG:
-                        logger.info(
-                            "ZapSign create OK status=%s body=%s",
-                            resp.status_code,
-                            body,
-                        )
-                    return ZapSignCreateResult(open_id=open_id, token=token, status=status)
-
-                # Error HTTP
-                logger.error(
-                    "ZapSign create error status=%s url=%s body=%s headers=%s",
-                    resp.status_code,
-                    url,
-                    body,
-                    {**{k: v for k, v in headers.items() if k.lower() != 'authorization'}, 'Authorization': f"{self.auth_scheme} {_mask(api_token)}"},
-                )
-                return ZapSignCreateResult(open_id=None, token=None, status=None)
+            if resp.is_success:
+                # Intentar mapear múltiples posibles nombres de campos
+                open_id = body.get('open_id') or body.get('id') or body.get('openId')
+                token = body.get('token') or body.get('document_token') or body.get('doc_token')
+                status = body.get('status') or body.get('document_status')
+                if settings.DEBUG:
+                    logger.info(
+                        "ZapSign create OK status=%s body=%s",
+                        resp.status_code,
+                        body,
+                    )
+                return ZapSignCreateResult(open_id=open_id, token=token, status=status)
+
+            # Error HTTP
+            logger.error(
+                "ZapSign create error status=%s url=%s body=%s headers=%s",
+                resp.status_code,
+                url,
+                body,
+                {**{k: v for k, v in headers.items() if k.lower() != 'authorization'}, 'Authorization': f"{self.auth_scheme} {_mask(api_token)}"},
+            )
+            return ZapSignCreateResult(open_id=None, token=None, status=None)
+        except (RateLimitExceeded, UpstreamUnavailable, DeadlineExceeded) as exc:
+            logger.warning("ZapSign create skipped: %s", exc)
+            return ZapSignCreateResult(open_id=None, token=None, status=None)
         except Exception as exc:
             logger.exception(
                 "ZapSign create exception url=%s payload=%s headers=%s error=%s",
@@ -88,7 +137,123 @@ class HttpZapSignClient(ZapSignClient):
             return ZapSignCreateResult(open_id=None, token=None, status=None)
 
 
-    def send_for_sign(self, api_token: str, name: str, pdf_url: str, signers: list[dict]) -> ZapSignCreateResult:
+    def find_by_external_id(self, api_token: str, external_id: str) -> Optional[ZapSignCreateResult]:
+        """Busca en ZapSign un documento creado con este external_id (None si no existe).
+
+        Se compara en cliente y se recorren las páginas (hasta
+        ZAPSIGN_LOOKUP_MAX_PAGES) por si el listado ignora el filtro.
+        """
+        headers = {'Authorization': f'{self.auth_scheme} {api_token}'}
+        max_pages = max(1, getattr(settings, 'ZAPSIGN_LOOKUP_MAX_PAGES', 20))
+        for page in range(1, max_pages + 1):
+            self.rate_limiter.acquire(api_token)
+            timeout = timeout_for(self.timeout_seconds, 'zapsign')
+            with get_upstream_guard('zapsign').protect() as call:
+                resp = get_http_client(self.base_url).get(
+                    f"{self.base_url}/docs/",
+                    params={'external_id': external_id, 'page': page},
+                    headers=headers,
+                    timeout=timeout,
+                )
+                if resp.status_code >= 500:
+                    call.mark_failure()
+            if page > 1 and resp.status_code in (400, 404):
+                return None
+            resp.raise_for_status()
+            body = resp.json()
+            items = body.get('results', []) if isinstance(body, dict) else body
+            for item in items or []:
+                if item.get('external_id') == external_id:
+                    return _to_result(item)
+            if not (isinstance(body, dict) and body.get('next')):
+                return None
+        logger.warning("ZapSign lookup of external_id=%s stopped after %s pages", external_id, max_pages)
+        return None
+
+    def _find_existing(self, api_token: str, external_id: str) -> Optional[ZapSignCreateResult]:
+        """find_by_external_id para el envío: si la búsqueda falla se registra y se envía igualmente."""
+        try:
+            return self.find_by_external_id(api_token, external_id)
+        except (UpstreamUnavailable, DeadlineExceeded, RateLimitExceeded):
+            raise
+        except Exception as exc:
+            logger.warning("ZapSign lookup of external_id=%s failed, sending anyway: %s", external_id, exc)
+            metrics.inc('zapsign_send_lookup_failures_total')
+            return None
+
+    def get_document(self, api_token: str, token: str) -> Optional[ZapSignCreateResult]:
+        """Estado actual de un documento en ZapSign (None si no existe)."""
+        headers = {'Authorization': f'{self.auth_scheme} {api_token}'}
+        self.rate_limiter.acquire(api_token)
+        timeout = timeout_for(self.timeout_seconds, 'zapsign')
+        with get_upstream_guard('zapsign').protect() as call:
+            resp = get_http_client(self.base_url).get(
+                f"{self.base_url}/docs/{token}/",
+                headers=headers,
+                timeout=timeout,
+            )
+            if resp.status_code >= 500:
+                call.mark_failure()
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return _to_result(resp.json())
+
+    def list_documents(self, api_token: str, page: int) -> ZapSignPageDTO:
+        """Una página del listado de documentos de la cuenta (GET /docs/?page=N)."""
+        headers = {'Authorization': f'{self.auth_scheme} {api_token}'}
+        self.rate_limiter.acquire(api_token)
+        timeout = timeout_for(self.timeout_seconds, 'zapsign')
+        with get_upstream_guard('zapsign').protect() as call:
+            resp = get_http_client(self.base_url).get(
+                f"{self.base_url}/docs/",
+                params={'page': page},
+                headers=headers,
+                timeout=timeout,
+            )
+            if resp.status_code >= 500:
+                call.mark_failure()
+        if page > 1 and resp.status_code in (400, 404):
+            # Página fuera de rango: fin del listado
+            return ZapSignPageDTO(count=0, results=[], has_next=False)
+        resp.raise_for_status()
+        body = resp.json()
+        items = body.get('results', []) if isinstance(body, dict) else body
+        results = []
+        for item in items or []:
+            result = _to_result(item)
+            if not result.open_id:
+                continue
+            results.append(ZapSignDocumentDTO(
+                open_id=str(result.open_id),
+                token=result.token,
+                name=(item.get('name') or '')[:255],
+                status=result.status,
+                pdf_url=item.get('original_file') or item.get('url_pdf') or '',
+            ))
+        count = body.get('count', len(results)) if isinstance(body, dict) else len(results)
+        has_next = bool(body.get('next')) if isinstance(body, dict) else False
+        return ZapSignPageDTO(count=count, results=results, has_next=has_next, page_size=len(items or []))
+
+    def _backoff(self, attempt: int) -> None:
+        # Full jitter: evita que los reintentos de varios workers coincidan
+        cap = min(self.retry_backoff_max_seconds, self.retry_backoff_seconds * (2 ** attempt))
+        delay = random.uniform(0, cap)
+        left = remaining()
+        if left is not None and delay >= left:
+            # Dormir no deja tiempo para otro intento
+            raise DeadlineExceeded('zapsign_retry', left)
+        self.sleep(delay)
+
+    def send_for_sign(
+        self,
+        api_token: str,
+        name: str,
+        pdf_url: str,
+        signers: list[dict],
+        external_id: Optional[str] = None,
+        check_existing: bool = False,
+    ) -> ZapSignCreateResult:
         if not self.base_url or not api_token:
             logger.warning("ZapSign config incompleta: base_url o api_token ausente")
             return ZapSignCreateResult(open_id=None, token=None, status=None)
@@ -105,25 +270,41 @@ class HttpZapSignClient(ZapSignClient):
             'signers': signers,
             "send_automatic_email": True,
         }
+        if external_id:
+            payload['external_id'] = external_id
 
         def _mask(token: str) -> str:
             if not token:
                 return ''
             return token[:4] + '...' + token[-4:]
 
-        try:
-            with httpx.Client(timeout=self.timeout_seconds) as client:
-                resp = client.post(url, json=payload, headers=headers)
+        # Sin external_id solo es seguro reintentar si la petición no llegó a enviarse
+        retryable = RETRYABLE_ERRORS if external_id else (httpx.ConnectError, httpx.ConnectTimeout)
+        attempts = self.max_attempts if external_id else min(self.max_attempts, 2)
+        for attempt in range(attempts):
+            try:
+                if external_id and (check_existing or attempt > 0):
+                    existing = self._find_existing(api_token, external_id)
+                    if existing is not None and existing.open_id:
+                        logger.info("ZapSign send_for_sign reused existing document external_id=%s", external_id)
+                        metrics.inc('zapsign_send_deduplicated_total')
+                        return existing
+                resp = self._post(api_token, url, payload, headers)
                 try:
                     body = resp.json()
                 except Exception:
                     body = {'raw': resp.text[:500]}
 
                 if resp.is_success:
-                    open_id = body.get('open_id') or body.get('id') or body.get('openId')
-                    token = body.get('token') or body.get('document_token') or body.get('doc_token')
-                    status = body.get('status') or body.get('document_status')
-                    return ZapSignCreateResult(open_id=open_id, token=token, status=status)
+                    return _to_result(body)
+
+                if resp.status_code >= 500 and external_id and attempt + 1 < attempts:
+                    logger.warning(
+                        "ZapSign send_for_sign status=%s; retrying (attempt %s/%s)", resp.status_code, attempt + 1, attempts
+                    )
+                    metrics.inc('zapsign_send_retries_total', reason='http_5xx')
+                    self._backoff(attempt)
+                    continue
 
                 logger.error(
                     "ZapSign send_for_sign error status=%s url=%s body=%s headers=%s",
@@ -133,13 +314,32 @@ class HttpZapSignClient(ZapSignClient):
                     {**{k: v for k, v in headers.items() if k.lower() != 'authorization'}, 'Authorization': f"{self.auth_scheme} {_mask(api_token)}"},
                 )
                 return ZapSignCreateResult(open_id=None, token=None, status=None)
-        except Exception as exc:
-            logger.exception(
-                "ZapSign send_for_sign exception url=%s payload=%s error=%s",
-                url,
-                {**payload, 'signers': f"{len(signers)} signers"},
-                exc,
-            )
-            return ZapSignCreateResult(open_id=None, token=None, status=None)
+            except (UpstreamUnavailable, DeadlineExceeded):
+                # Fallo rápido: el llamante decide (503/504, job fallido, ...)
+                raise
+            except RateLimitExceeded as exc:
+                logger.warning("ZapSign send_for_sign skipped: %s", exc)
+                return ZapSignCreateResult(open_id=None, token=None, status=None)
+            except retryable as exc:
+                if attempt + 1 >= attempts:
+                    logger.error("ZapSign send_for_sign gave up after %s attempts error=%s", attempts, exc)
+                    return ZapSignCreateResult(open_id=None, token=None, status=None)
+                logger.warning("ZapSign send_for_sign %s; retrying (attempt %s/%s)", type(exc).__name__, attempt + 1, attempts)
+                metrics.inc('zapsign_send_retries_total', reason=type(exc).__name__)
+                self._backoff(attempt)
+            except Exception as exc:
+                logger.exception(
+                    "ZapSign send_for_sign exception url=%s payload=%s error=%s",
+                    url,
+                    {**payload, 'signers': f"{len(signers)} signers"},
+                    exc,
+                )
+                return ZapSignCreateResult(open_id=None, token=None, status=None)
+        return ZapSignCreateResult(open_id=None, token=None, status=None)
 
 
+def _to_result(body: dict) -> ZapSignCreateResult:
+    open_id = body.get('open_id') or body.get('id') or body.get('openId')
+    token = body.get('token') or body.get('document_token') or body.get('doc_token')
+    status = body.get('status') or body.get('document_status')
+    return ZapSignCreateResult(open_id=open_id, token=token, status=status)
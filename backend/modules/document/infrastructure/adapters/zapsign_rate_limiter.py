@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from modules.document.infrastructure.django_app.models import RateLimitBucket
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.deadline import remaining
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """La espera necesaria para obtener capacidad supera el máximo permitido."""
+
+    def __init__(self, wait_seconds: float) -> None:
+        super().__init__(f'Rate limit: next slot in {wait_seconds:.1f}s')
+        self.wait_seconds = wait_seconds
+
+
+def bucket_key(api_token: str) -> str:
+    # No se guarda el token en claro
+    return hashlib.sha256(api_token.encode('utf-8')).hexdigest()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Segundos a esperar según `Retry-After` (entero o fecha HTTP)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (now if now is not None else time.time()))
+
+
+class DbTokenBucketLimiter:
+    """Token bucket por clave en la base de datos, compartido por todos los procesos.
+
+    `reserve()` descuenta un token (el saldo puede quedar negativo: la
+    petición reserva un hueco futuro) y devuelve cuánto hay que esperar. La
+    fila se bloquea con `SELECT ... FOR UPDATE`, así que los huecos se
+    reparten entre procesos sin servicios externos.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_wait_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_second = rate_per_second if rate_per_second is not None else getattr(settings, 'ZAPSIGN_RATE_LIMIT_PER_SECOND', 5.0)
+        self.burst = burst if burst is not None else getattr(settings, 'ZAPSIGN_RATE_LIMIT_BURST', 10.0)
+        self.max_wait_seconds = max_wait_seconds if max_wait_seconds is not None else getattr(settings, 'ZAPSIGN_RATE_LIMIT_MAX_WAIT_SECONDS', 30.0)
+        self.clock = clock
+        self.sleep = sleep
+
+    def _locked_bucket(self, key: str, now: float) -> RateLimitBucket:
+        bucket = RateLimitBucket.objects.select_for_update().filter(key=key).first()  # type: ignore[attr-defined]
+        if bucket is None:
+            bucket, _ = RateLimitBucket.objects.get_or_create(  # type: ignore[attr-defined]
+                key=key, defaults={'tokens': float(self.burst), 'refilled_at': now}
+            )
+        if now > bucket.refilled_at:
+            elapsed = now - bucket.refilled_at
+            bucket.tokens = min(float(self.burst), bucket.tokens + elapsed * self.rate_per_second)
+            bucket.refilled_at = now
+        return bucket
+
+    def reserve(self, api_token: str, max_wait_seconds: Optional[float] = None) -> float:
+        """Reserva un token y devuelve los segundos de espera; lanza RateLimitExceeded si no compensa."""
+        max_wait = self.max_wait_seconds if max_wait_seconds is None else min(self.max_wait_seconds, max_wait_seconds)
+        key = bucket_key(api_token)
+        now = self.clock()
+        with transaction.atomic():
+            bucket = self._locked_bucket(key, now)
+            tokens = bucket.tokens - 1.0
+            # Espera = pausa pendiente (Retry-After) + tiempo para recargar el déficit
+            wait = max(bucket.refilled_at - now, 0.0) + max(-tokens, 0.0) / self.rate_per_second
+            if wait > max_wait:
+                bucket.save(update_fields=['tokens', 'refilled_at'])
+                metrics.inc('zapsign_rate_limit_rejections_total')
+                raise RateLimitExceeded(wait)
+            bucket.tokens = tokens
+            bucket.save(update_fields=['tokens', 'refilled_at'])
+        return wait
+
+    def acquire(self, api_token: str) -> float:
+        if self.rate_per_second <= 0:
+            return 0.0
+        left = remaining()
+        try:
+            wait = self.reserve(api_token, max_wait_seconds=left)
+        except RateLimitExceeded as exc:
+            if left is not None and exc.wait_seconds <= self.max_wait_seconds:
+                # Habría hueco, pero no dentro del presupuesto de la petición
+                raise DeadlineExceeded('zapsign_rate_limit', left) from exc
+            raise
+        metrics.observe('zapsign_rate_limit_wait_seconds', wait)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def penalize(self, api_token: str, retry_after_seconds: float) -> None:
+        """Aplica un `Retry-After` del upstream: el bucket no recarga ni entrega tokens hasta que venza."""
+        if self.rate_per_second <= 0:
+            return
+        key = bucket_key(api_token)
+        now = self.clock()
+        with transaction.atomic():
+            bucket = self._locked_bucket(key, now)
+            bucket.refilled_at = max(bucket.refilled_at, now + retry_after_seconds)
+            # Al vencer la pausa sale una sola petición; el resto vuelve a espaciarse
+            bucket.tokens = min(bucket.tokens, 1.0)
+            bucket.save(update_fields=['tokens', 'refilled_at'])
+        metrics.inc('zapsign_rate_limited_total')
+        logger.warning('ZapSign rate limited; pausing token for %.1fs', retry_after_seconds)
@@ -0,0 +1,57 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django import db
+from django.conf import settings
+from django.utils import timezone
+
+from modules.document.infrastructure.django_app.models import BackfillCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+_running: set[int] = set()
+_lock = threading.Lock()
+
+
+def backfill_in_progress(company_id: int) -> bool:
+    """True si otro proceso/hilo avanzó el checkpoint hace poco (importación viva)."""
+    lease = getattr(settings, 'ZAPSIGN_BACKFILL_LEASE_SECONDS', 300.0)
+    return BackfillCheckpoint.objects.filter(  # type: ignore[attr-defined]
+        company_id=company_id,
+        status='running',
+        updated_at__gte=timezone.now() - timedelta(seconds=lease),
+    ).exists()
+
+
+def run_backfill(company_id: int, restart: bool = False) -> None:
+    from modules.document.api.container import make_backfill_zapsign_documents_use_case
+
+    try:
+        progress = make_backfill_zapsign_documents_use_case().execute(company_id, restart=restart)
+        logger.info(
+            'ZapSign backfill company=%s status=%s imported=%s skipped=%s',
+            company_id, progress.status, progress.imported, progress.skipped,
+        )
+    except Exception:
+        logger.exception('ZapSign backfill failed company=%s', company_id)
+
+
+def start_backfill(company_id: int, restart: bool = False) -> bool:
+    """Lanza la importación en un hilo; False si ya hay una en curso para la empresa."""
+    with _lock:
+        if company_id in _running or backfill_in_progress(company_id):
+            return False
+        _running.add(company_id)
+
+    def _run() -> None:
+        try:
+            run_backfill(company_id, restart)
+        finally:
+            with _lock:
+                _running.discard(company_id)
+            db.connection.close()
+
+    threading.Thread(target=_run, name=f'zapsign-backfill-{company_id}', daemon=True).start()
+    return True
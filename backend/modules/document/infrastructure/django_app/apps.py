@@ -1,4 +1,7 @@
+import os
+import threading
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class DocumentsConfig(AppConfig):
@@ -6,4 +9,35 @@ class DocumentsConfig(AppConfig):
     name = 'modules.document.infrastructure.django_app'
     label = 'documents'
 
+    _send_worker_started = False
+    _reconciler_started = False
+    _webhook_inbox_started = False
 
+    def ready(self):
+        # Evitar doble inicio por el autoreloader
+        if os.environ.get('RUN_MAIN') != 'true':
+            return
+
+        # Worker de envíos a firma asíncronos
+        if getattr(settings, 'START_SEND_JOB_WORKER', False) and not DocumentsConfig._send_worker_started:
+            from modules.document.infrastructure.send_job_runner import run_send_job_worker
+
+            t = threading.Thread(target=run_send_job_worker, name='send-job-worker', daemon=True)
+            t.start()
+            DocumentsConfig._send_worker_started = True
+
+        # Reconciliador de estados con ZapSign (webhooks perdidos)
+        if getattr(settings, 'START_RECONCILER', False) and not DocumentsConfig._reconciler_started:
+            from modules.document.infrastructure.reconciler import run_reconciler
+
+            t = threading.Thread(target=run_reconciler, name='document-reconciler', daemon=True)
+            t.start()
+            DocumentsConfig._reconciler_started = True
+
+        # Consumidor del inbox de webhooks de ZapSign
+        if getattr(settings, 'START_WEBHOOK_INBOX_WORKER', False) and not DocumentsConfig._webhook_inbox_started:
+            from modules.document.infrastructure.webhook_inbox import run_webhook_inbox_worker
+
+            t = threading.Thread(target=run_webhook_inbox_worker, name='webhook-inbox-worker', daemon=True)
+            t.start()
+            DocumentsConfig._webhook_inbox_started = True
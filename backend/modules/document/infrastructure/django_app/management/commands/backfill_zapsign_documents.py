@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from modules.document.api.container import make_backfill_zapsign_documents_use_case
+
+
+class Command(BaseCommand):
+    help = "Import a company's existing ZapSign documents (resumes from the last checkpoint)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-id', type=int, required=True)
+        parser.add_argument('--concurrency', type=int, default=None, help='Pages fetched in parallel')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from page 1')
+
+    def handle(self, *args, **options):
+        use_case = make_backfill_zapsign_documents_use_case(concurrency=options['concurrency'])
+        try:
+            progress = use_case.execute(options['company_id'], restart=options['restart'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        message = (
+            f'Backfill {progress.status}: page {progress.next_page - 1}/{progress.total_pages or "?"}, '
+            f'{progress.imported} imported, {progress.skipped} already present'
+        )
+        if progress.status == 'failed':
+            raise CommandError(f'{message} ({progress.error}); rerun to resume')
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.document.api.container import make_bulk_send_to_sign_use_case
+from modules.document.infrastructure.django_app.models import Document
+
+
+class Command(BaseCommand):
+    help = 'Send several documents to ZapSign for signature with bounded concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('document_ids', nargs='*', type=int)
+        parser.add_argument('--company-id', type=int, default=None, help='Only documents of this company')
+        parser.add_argument('--status', default=None, help='Select every document in this status (e.g. created)')
+        parser.add_argument('--limit', type=int, default=None)
+        parser.add_argument('--concurrency', type=int, default=None)
+
+    def handle(self, *args, **options):
+        ids = list(options['document_ids'])
+        if options['status']:
+            qs = Document.objects.filter(status=options['status'])  # type: ignore[attr-defined]
+            if options['company_id']:
+                qs = qs.filter(company_id=options['company_id'])
+            ids.extend(qs.order_by('id').values_list('id', flat=True))
+        if options['limit']:
+            ids = ids[:options['limit']]
+        if not ids:
+            raise CommandError('No documents selected (pass ids or --status)')
+
+        use_case = make_bulk_send_to_sign_use_case(concurrency=options['concurrency'])
+        results = use_case.execute(ids, company_id=options['company_id'])
+        summary: dict[str, int] = {}
+        for r in results:
+            summary[r.outcome] = summary.get(r.outcome, 0) + 1
+            line = f'{r.document_id}: {r.outcome}'
+            if r.error:
+                line += f' ({r.error})'
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(' '.join(f'{k}={v}' for k, v in sorted(summary.items()))))
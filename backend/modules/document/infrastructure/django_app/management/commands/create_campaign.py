@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from modules.document.api.campaign_input import iter_csv_rows, iter_jsonl_rows
+from modules.document.api.container import make_create_campaign_use_case
+
+
+class Command(BaseCommand):
+    help = 'Create a mass-send campaign from a CSV (signer1_name,signer1_email,signer2_name,signer2_email) or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-id', type=int, required=True)
+        parser.add_argument('--name', required=True)
+        parser.add_argument('--pdf-url', required=True)
+        parser.add_argument('--file', required=True, help='.csv or .jsonl with one signer group per row')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        with open(path, 'rb') as stream:
+            rows = iter_csv_rows(stream) if path.lower().endswith('.csv') else iter_jsonl_rows(stream)
+            try:
+                campaign = make_create_campaign_use_case().execute(
+                    options['company_id'], options['name'], options['pdf_url'], rows
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Campaign {campaign.id}: {campaign.documents_created} documents queued, '
+            f'{campaign.invalid_rows} invalid rows of {campaign.total_rows}'
+        ))
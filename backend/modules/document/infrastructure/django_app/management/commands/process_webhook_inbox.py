@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from modules.document.infrastructure.webhook_inbox import run_webhook_inbox_worker
+
+
+class Command(BaseCommand):
+    help = 'Apply queued ZapSign webhooks from the inbox table in coalesced batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--poll-seconds', type=float, default=None)
+        parser.add_argument('--once', action='store_true', help='Drain the inbox and exit')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Starting webhook inbox worker...'))
+        total = run_webhook_inbox_worker(
+            batch_size=options['batch_size'],
+            poll_seconds=options['poll_seconds'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Webhook inbox worker processed {total} events'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from modules.document.infrastructure.reconciler import run_reconciler
+
+
+class Command(BaseCommand):
+    help = 'Poll ZapSign for documents stuck in a non-terminal status and apply missed webhook updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--stale-seconds', type=float, default=None,
+                            help='Only documents without changes for this long (default RECONCILE_STALE_SECONDS)')
+        parser.add_argument('--status', action='append', dest='statuses', default=None,
+                            help='Status to reconcile (repeatable; default RECONCILE_STATUSES)')
+        parser.add_argument('--interval', type=float, default=None)
+        parser.add_argument('--once', action='store_true', help='Run a single pass and exit')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Starting document reconciler...'))
+        total = run_reconciler(
+            interval_seconds=options['interval'],
+            once=options['once'],
+            batch_size=options['batch_size'],
+            stale_seconds=options['stale_seconds'],
+            statuses=options['statuses'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {total.checked} documents: {total.updated} updated, {total.failed} failed'
+        ))
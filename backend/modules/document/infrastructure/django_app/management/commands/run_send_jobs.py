@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from modules.document.infrastructure.send_job_runner import run_send_job_worker
+
+
+class Command(BaseCommand):
+    help = 'Run the asynchronous send-to-sign job worker (calls ZapSign for queued jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--poll-seconds', type=float, default=None)
+        parser.add_argument('--once', action='store_true', help='Process queued jobs and exit')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Starting send job worker...'))
+        total = run_send_job_worker(
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            poll_seconds=options['poll_seconds'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Send job worker processed {total} jobs'))
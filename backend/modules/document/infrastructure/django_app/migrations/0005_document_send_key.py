@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_rate_limit_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='send_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_idx_company_email_ci_and_more'),
+        ('documents', '0005_document_send_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconcileWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('last_document_id', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'document_reconcile_watermark',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'updated_at'], name='idx_document_status_updated'),
+        ),
+    ]
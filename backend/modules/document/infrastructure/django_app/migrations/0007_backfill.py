@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_duplicate_open_ids(apps, schema_editor):
+    # open_id pasa a ser único: '' pasa a NULL y, de cada open_id repetido, solo el documento
+    # más antiguo lo conserva (los demás quedan sin vincular a ZapSign)
+    Document = apps.get_model('documents', 'Document')
+    Document.objects.filter(open_id='').update(open_id=None)
+    duplicated = (
+        Document.objects.exclude(open_id__isnull=True)
+        .values('open_id').annotate(n=Count('id')).filter(n__gt=1).values_list('open_id', flat=True)
+    )
+    for open_id in list(duplicated):
+        keep = Document.objects.filter(open_id=open_id).order_by('id').values_list('id', flat=True).first()
+        Document.objects.filter(open_id=open_id).exclude(id=keep).update(open_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_idx_company_email_ci_and_more'),
+        ('documents', '0006_reconcile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='zapsign_backfill', serialize=False, to='companies.company')),
+                ('status', models.CharField(default='running', max_length=20)),
+                ('next_page', models.PositiveIntegerField(default=1)),
+                ('total_pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('imported', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'document_backfill_checkpoint',
+            },
+        ),
+        migrations.RunPython(clear_duplicate_open_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='document',
+            name='open_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
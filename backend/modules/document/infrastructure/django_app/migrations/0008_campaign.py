@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_idx_company_email_ci_and_more'),
+        ('documents', '0007_backfill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('pdf_url', models.URLField(max_length=4096)),
+                ('status', models.CharField(default='materializing', max_length=20)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('invalid_rows', models.PositiveIntegerField(default=0)),
+                ('documents_created', models.PositiveIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='campaigns', to='companies.company')),
+            ],
+            options={
+                'db_table': 'document_campaign',
+            },
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='documents', to='documents.campaign'),
+        ),
+        migrations.AddField(
+            model_name='sendjob',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='send_jobs', to='documents.campaign'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0008_campaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookInboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('open_id', models.CharField(blank=True, default='', max_length=255)),
+                ('payload', models.JSONField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'document_webhook_inbox',
+            },
+        ),
+    ]
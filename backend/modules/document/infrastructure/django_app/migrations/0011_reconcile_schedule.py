@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_company_idx_company_email_ci_and_more'),
+        ('documents', '0010_document_content_hash'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ReconcileWatermark',
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='reconcile_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='reconcile_checks',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status', 'reconcile_after'], name='idx_document_status_reconcile'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 
@@ -6,12 +8,125 @@ class Document(models.Model):
     name = models.CharField(max_length=255)
     pdf_url = models.URLField(max_length=4096)
     status = models.CharField(max_length=50, default='created')
-    open_id = models.CharField(max_length=255, null=True, blank=True)
+    # Único: clave de conflicto de la importación masiva desde ZapSign (NULL se permite repetido)
+    open_id = models.CharField(max_length=255, null=True, blank=True, unique=True)
     token = models.CharField(max_length=255, null=True, blank=True)
+    # Clave de idempotencia enviada a ZapSign como external_id (estable entre reintentos)
+    send_key = models.CharField(max_length=64, null=True, blank=True, unique=True)
+    campaign = models.ForeignKey('Campaign', on_delete=models.SET_NULL, null=True, blank=True, related_name='documents')
+    # sha256 del PDF, calculado por el worker de análisis (clave de la caché de análisis)
+    content_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    # Próxima consulta del reconciliador y comprobaciones seguidas sin cambios (backoff exponencial)
+    reconcile_after = models.DateTimeField(null=True, blank=True)
+    reconcile_checks = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'document'
+        indexes = [
+            # Selección de documentos estancados del reconciliador (status IN (...) AND updated_at < ...)
+            models.Index(fields=['status', 'updated_at'], name='idx_document_status_updated'),
+            models.Index(fields=['status', 'reconcile_after'], name='idx_document_status_reconcile'),
+        ]
+
+
+
+class Campaign(models.Model):
+    """Envío masivo de una misma plantilla PDF a muchos grupos de firmantes.
+
+    Los contadores se actualizan con UPDATE ... SET x = x + n; consultar el
+    progreso es una lectura por clave primaria.
+    """
+
+    STATUS_MATERIALIZING = 'materializing'
+    STATUS_DISPATCHED = 'dispatched'
+
+    company = models.ForeignKey('companies.Company', on_delete=models.PROTECT, related_name='campaigns')
+    name = models.CharField(max_length=255)
+    pdf_url = models.URLField(max_length=4096)
+    status = models.CharField(max_length=20, default=STATUS_MATERIALIZING)
+    total_rows = models.PositiveIntegerField(default=0)
+    invalid_rows = models.PositiveIntegerField(default=0)
+    documents_created = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    # Primeros errores de validación: [{"row": n, "error": "..."}]
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'document_campaign'
+
+
+class SendJob(models.Model):
+    """Envío a firma asíncrono; la propia tabla hace de cola (ver send_job_runner)."""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='send_jobs')
+    # Copia de document.campaign: el runner actualiza los contadores de la campaña sin otra consulta
+    campaign = models.ForeignKey('Campaign', on_delete=models.SET_NULL, null=True, blank=True, related_name='send_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'document_send_job'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_send_job_status_created'),
+        ]
+
+
+class RateLimitBucket(models.Model):
+    """Token bucket compartido entre procesos para llamadas salientes (clave = hash del api_token)."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    tokens = models.FloatField()
+    # Segundos epoch (time.time()) desde los que se recarga; en el futuro mientras dura un Retry-After
+    refilled_at = models.FloatField()
+
+    class Meta:
+        db_table = 'rate_limit_bucket'
+
 
+class BackfillCheckpoint(models.Model):
+    """Progreso de la importación de documentos de ZapSign de una empresa (para reanudarla)."""
 
+    company = models.OneToOneField('companies.Company', on_delete=models.CASCADE, primary_key=True,
+                                   related_name='zapsign_backfill')
+    status = models.CharField(max_length=20, default='running')
+    next_page = models.PositiveIntegerField(default=1)
+    total_pages = models.PositiveIntegerField(null=True, blank=True)
+    imported = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'document_backfill_checkpoint'
+
+
+class WebhookInboxEvent(models.Model):
+    """Webhook de ZapSign recibido y aún no aplicado; la tabla hace de cola (ver webhook_inbox)."""
+
+    open_id = models.CharField(max_length=255, blank=True, default='')
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'document_webhook_inbox'
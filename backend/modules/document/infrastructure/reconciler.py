@@ -0,0 +1,120 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from modules.document.application.dtos import ReconcileSummaryDTO
+from modules.document.infrastructure.django_app.models import Document
+from modules.document.infrastructure.mappers import orm_to_dto
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+UseCaseFactory = Callable[[], Any]
+
+
+def _default_use_case_factory() -> Any:
+    from modules.document.api.container import make_reconcile_document_statuses_use_case
+    return make_reconcile_document_statuses_use_case()
+
+
+def select_stale_documents(statuses: list[str], stale_seconds: float, limit: int) -> list[Document]:
+    """Documentos en `statuses` sin cambios desde hace `stale_seconds` cuya próxima consulta ya toca.
+
+    Primero los que nunca se consultaron y después por reconcile_after
+    (idx_document_status_reconcile).
+    """
+    now = timezone.now()
+    qs = Document.objects.filter(  # type: ignore[attr-defined]
+        Q(reconcile_after__isnull=True) | Q(reconcile_after__lte=now),
+        status__in=statuses,
+        updated_at__lt=now - timedelta(seconds=stale_seconds),
+    )
+    return list(qs.order_by(F('reconcile_after').asc(nulls_first=True), 'id')[:limit])
+
+
+def _backoff_seconds(checks: int, stale_seconds: float) -> float:
+    """Espera hasta la siguiente consulta tras `checks` comprobaciones seguidas sin cambios."""
+    cap = getattr(settings, 'RECONCILE_MAX_BACKOFF_SECONDS', 86400.0)
+    return min(cap, max(stale_seconds, 1.0) * (2 ** (checks - 1)))
+
+
+def _schedule_next_checks(docs: list[Document], updated_ids: set[int], stale_seconds: float) -> None:
+    """Reprograma los documentos consultados. update() no toca updated_at: sigue siendo el último cambio real."""
+    now = timezone.now()
+    if updated_ids:
+        Document.objects.filter(id__in=updated_ids).update(reconcile_checks=0, reconcile_after=None)  # type: ignore[attr-defined]
+    # Sin cambios, con fallo o sin token: cada vez se espera el doble
+    by_checks: dict[int, list[int]] = {}
+    for doc in docs:
+        if doc.id not in updated_ids:
+            by_checks.setdefault(min(doc.reconcile_checks + 1, 30), []).append(doc.id)
+    for checks, ids in by_checks.items():
+        Document.objects.filter(id__in=ids).update(  # type: ignore[attr-defined]
+            reconcile_checks=checks,
+            reconcile_after=now + timedelta(seconds=_backoff_seconds(checks, stale_seconds)),
+        )
+
+
+def reconcile_batch(
+    batch_size: Optional[int] = None,
+    stale_seconds: Optional[float] = None,
+    statuses: Optional[list[str]] = None,
+    use_case_factory: Optional[UseCaseFactory] = None,
+) -> tuple[ReconcileSummaryDTO, bool]:
+    """Consulta el siguiente lote de documentos pendientes de revisión y los reprograma.
+
+    Devuelve (resumen, sin_más_pendientes). Un documento que sigue igual no
+    se vuelve a consultar hasta pasado un backoff que se duplica en cada
+    comprobación (de RECONCILE_STALE_SECONDS a RECONCILE_MAX_BACKOFF_SECONDS),
+    así que cada pasada solo consulta los que toca.
+    """
+    size = batch_size or getattr(settings, 'RECONCILE_BATCH_SIZE', 100)
+    stale = stale_seconds if stale_seconds is not None else getattr(settings, 'RECONCILE_STALE_SECONDS', 900.0)
+    wanted = statuses or list(getattr(settings, 'RECONCILE_STATUSES', ['sent', 'pending']))
+
+    docs = select_stale_documents(wanted, stale, size)
+    summary = ReconcileSummaryDTO()
+    if docs:
+        summary = (use_case_factory or _default_use_case_factory)().execute([orm_to_dto(d) for d in docs])
+        _schedule_next_checks(docs, set(summary.updated_ids), stale)
+    completed = len(docs) < size
+
+    metrics.inc('reconcile_documents_total', summary.checked - summary.failed, outcome='checked')
+    metrics.inc('reconcile_documents_total', summary.updated, outcome='updated')
+    metrics.inc('reconcile_documents_total', summary.failed, outcome='failed')
+    if docs:
+        logger.info(
+            'Reconciled %s stale documents: updated=%s failed=%s', summary.checked, summary.updated, summary.failed
+        )
+    return summary, completed
+
+
+def run_reconciler(
+    interval_seconds: Optional[float] = None,
+    once: bool = False,
+    use_case_factory: Optional[UseCaseFactory] = None,
+    **batch_options: Any,
+) -> ReconcileSummaryDTO:
+    """Repite lotes mientras haya documentos pendientes y espera `interval_seconds` antes de la siguiente pasada."""
+    interval = interval_seconds if interval_seconds is not None else getattr(settings, 'RECONCILE_INTERVAL_SECONDS', 300.0)
+    total = ReconcileSummaryDTO()
+    logger.info('Document reconciler started interval=%ss', interval)
+    while True:
+        try:
+            summary, completed = reconcile_batch(use_case_factory=use_case_factory, **batch_options)
+        except Exception:
+            logger.exception('Reconcile batch failed')
+            summary, completed = ReconcileSummaryDTO(), True
+        total.checked += summary.checked
+        total.updated += summary.updated
+        total.failed += summary.failed
+        if completed:
+            if once:
+                return total
+            time.sleep(interval)
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from modules.document.application.dtos import BackfillProgressDTO
+from modules.document.application.ports import BackfillCheckpointRepository
+from modules.document.infrastructure.django_app.models import BackfillCheckpoint
+
+
+def checkpoint_to_dto(obj: BackfillCheckpoint) -> BackfillProgressDTO:
+    return BackfillProgressDTO(
+        company_id=obj.company_id,
+        status=obj.status,
+        next_page=obj.next_page,
+        total_pages=obj.total_pages,
+        imported=obj.imported,
+        skipped=obj.skipped,
+        error=obj.error,
+        updated_at=obj.updated_at,
+    )
+
+
+class DjangoBackfillCheckpointRepository(BackfillCheckpointRepository):
+    def get(self, company_id: int) -> Optional[BackfillProgressDTO]:
+        obj = BackfillCheckpoint.objects.filter(company_id=company_id).first()  # type: ignore[attr-defined]
+        return checkpoint_to_dto(obj) if obj else None
+
+    def save(self, progress: BackfillProgressDTO) -> BackfillProgressDTO:
+        obj, _ = BackfillCheckpoint.objects.update_or_create(  # type: ignore[attr-defined]
+            company_id=progress.company_id,
+            defaults={
+                'status': progress.status,
+                'next_page': progress.next_page,
+                'total_pages': progress.total_pages,
+                'imported': progress.imported,
+                'skipped': progress.skipped,
+                'error': progress.error,
+            },
+        )
+        return checkpoint_to_dto(obj)
@@ -0,0 +1,76 @@
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from modules.document.application.dtos import CampaignDTO
+from modules.document.application.ports import CampaignRepository
+from modules.document.infrastructure.django_app.models import Campaign, Document, SendJob
+from modules.signer.domain.entities import Signer
+from modules.signer.infrastructure.django_app.models import Signer as SignerModel
+
+
+def campaign_to_dto(obj: Campaign) -> CampaignDTO:
+    dto = CampaignDTO(
+        id=obj.id,
+        company_id=obj.company_id,
+        name=obj.name,
+        pdf_url=obj.pdf_url,
+        status=obj.status,
+        total_rows=obj.total_rows,
+        invalid_rows=obj.invalid_rows,
+        documents_created=obj.documents_created,
+        sent=obj.sent,
+        failed=obj.failed,
+        errors=obj.errors,
+        created_at=obj.created_at,
+        updated_at=obj.updated_at,
+    )
+    if dto.status == Campaign.STATUS_DISPATCHED and dto.pending == 0:
+        dto.status = 'completed'
+    return dto
+
+
+class DjangoCampaignRepository(CampaignRepository):
+    def create(self, company_id: int, name: str, pdf_url: str) -> CampaignDTO:
+        return campaign_to_dto(Campaign.objects.create(company_id=company_id, name=name, pdf_url=pdf_url))  # type: ignore[attr-defined]
+
+    def get(self, campaign_id: int) -> Optional[CampaignDTO]:
+        obj = Campaign.objects.filter(id=campaign_id).first()  # type: ignore[attr-defined]
+        return campaign_to_dto(obj) if obj else None
+
+    def add_batch(self, campaign: CampaignDTO, rows: list[list[Signer]]) -> int:
+        """Documentos, firmantes y jobs de envío del lote: un INSERT masivo por tabla."""
+        with transaction.atomic():
+            docs = Document.objects.bulk_create([  # type: ignore[attr-defined]
+                Document(
+                    company_id=campaign.company_id,
+                    name=f'{campaign.name} - {signers[0].name}'[:255],
+                    pdf_url=campaign.pdf_url,
+                    campaign_id=campaign.id,
+                )
+                for signers in rows
+            ])
+            SignerModel.objects.bulk_create([  # type: ignore[attr-defined]
+                SignerModel(document_id=doc.id, name=s.name, email=s.email)
+                for doc, signers in zip(docs, rows) for s in signers
+            ])
+            SendJob.objects.bulk_create([  # type: ignore[attr-defined]
+                SendJob(document_id=doc.id, campaign_id=campaign.id) for doc in docs
+            ])
+            Campaign.objects.filter(id=campaign.id).update(  # type: ignore[attr-defined]
+                documents_created=F('documents_created') + len(docs),
+                updated_at=timezone.now(),
+            )
+        return len(docs)
+
+    def finish(self, campaign_id: int, total_rows: int, invalid_rows: int, errors: list[dict]) -> CampaignDTO:
+        Campaign.objects.filter(id=campaign_id).update(  # type: ignore[attr-defined]
+            status=Campaign.STATUS_DISPATCHED,
+            total_rows=total_rows,
+            invalid_rows=invalid_rows,
+            errors=errors,
+            updated_at=timezone.now(),
+        )
+        return campaign_to_dto(Campaign.objects.get(id=campaign_id))  # type: ignore[attr-defined]
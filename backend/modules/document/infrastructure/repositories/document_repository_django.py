@@ -1,14 +1,33 @@
 from modules.document.application.ports import DocumentCommandRepository, DocumentQueryRepository, ListDocumentsQuery
-from modules.document.application.dtos import DocumentDTO, PageDTO
+from modules.document.application.dtos import DocumentDTO, PageDTO, SendKeyDTO, ZapSignDocumentDTO
 from modules.document.infrastructure.django_app.models import Document
 from modules.document.infrastructure.mappers import orm_to_dto
-from django.db.models import Exists, OuterRef, Subquery, Value
+from modules.document.domain import status as doc_status
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Subquery, Value, When
+import uuid
+from typing import Optional
 from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+from modules.automation.application.dtos import DocumentCreatedEvent
+from modules.automation.application.ports import EventPublisher
 
 
 class DjangoDocumentRepository(DocumentCommandRepository, DocumentQueryRepository):
+    def __init__(self, outbox: Optional[EventPublisher] = None) -> None:
+        # Si se inyecta un outbox, el DocumentCreatedEvent se registra en la misma transacción
+        self.outbox = outbox
+
     def create(self, company_id: int, name: str, pdf_url: str) -> DocumentDTO:
-        obj = Document.objects.create(company_id=company_id, name=name, pdf_url=pdf_url)
+        with transaction.atomic():
+            obj = Document.objects.create(company_id=company_id, name=name, pdf_url=pdf_url)
+            if self.outbox:
+                self.outbox.publish_document_created(DocumentCreatedEvent(
+                    document_id=obj.id,
+                    company_id=obj.company_id,
+                    name=obj.name,
+                    pdf_url=obj.pdf_url,
+                ))
         return orm_to_dto(obj)
 
     def get_by_id(self, document_id: int) -> DocumentDTO | None:
@@ -18,6 +37,9 @@ class DjangoDocumentRepository(DocumentCommandRepository, DocumentQueryRepositor
             return None
         return orm_to_dto(obj)
 
+    def get_many(self, document_ids: list[int]) -> list[DocumentDTO]:
+        return [orm_to_dto(o) for o in Document.objects.filter(id__in=document_ids)]
+
     def get_by_open_id(self, open_id: str) -> DocumentDTO | None:
         try:
             obj = Document.objects.get(open_id=open_id)
@@ -25,6 +47,9 @@ class DjangoDocumentRepository(DocumentCommandRepository, DocumentQueryRepositor
             return None
         return orm_to_dto(obj)
 
+    def get_many_by_open_ids(self, open_ids: list[str]) -> list[DocumentDTO]:
+        return [orm_to_dto(o) for o in Document.objects.filter(open_id__in=open_ids)]
+
     def list_all(self) -> list[DocumentDTO]:
         return [orm_to_dto(o) for o in Document.objects.all().order_by('-created_at')]
 
@@ -38,6 +63,121 @@ class DjangoDocumentRepository(DocumentCommandRepository, DocumentQueryRepositor
         obj.save(update_fields=list(fields.keys()))
         return orm_to_dto(obj)
 
+    def update_many(self, updates: dict[int, dict]) -> dict[int, DocumentDTO]:
+        """Aplica `{document_id: {campo: valor}}` con un único bulk_update."""
+        objs = Document.objects.in_bulk(list(updates.keys()))
+        fields: set[str] = set()
+        now = timezone.now()
+        for doc_id, values in updates.items():
+            obj = objs.get(doc_id)
+            if obj is None:
+                continue
+            for k, v in values.items():
+                setattr(obj, k, v)
+            # bulk_update no aplica auto_now
+            obj.updated_at = now
+            fields.update(values.keys())
+        if objs and fields:
+            Document.objects.bulk_update(list(objs.values()), sorted(fields | {'updated_at'}))
+        return {doc_id: orm_to_dto(obj) for doc_id, obj in objs.items()}
+
+    def advance_status_by_open_id(self, open_id: str, status: Optional[str], token: Optional[str]) -> Optional[bool]:
+        """Aplica un evento de ZapSign con un único UPDATE condicional (compare-and-set).
+
+        True si cambió el documento, False si el evento no aportaba nada, None
+        si no existe (solo entonces hay una segunda consulta).
+        """
+        allowed = _transition_allowed(doc_status.normalize(status))
+        assignments: dict = {}
+        changes = Q()
+        if allowed is not None:
+            assignments['status'] = Case(When(allowed, then=Value(doc_status.normalize(status))), default=F('status'))
+            changes |= allowed
+        if token:
+            assignments['token'] = Value(token)
+            changes |= Q(token__isnull=True) | ~Q(token=token)
+        if assignments:
+            updated = (
+                Document.objects.alias(status_rank=_STATUS_RANK_SQL)
+                .filter(Q(open_id=open_id) & changes)
+                .update(**assignments, updated_at=timezone.now())
+            )
+            if updated:
+                return True
+        return False if Document.objects.filter(open_id=open_id).exists() else None
+
+    def advance_statuses_by_open_id(self, changes: dict[str, tuple[Optional[str], Optional[str]]]) -> int:
+        """Versión por lotes de advance_status_by_open_id: `{open_id: (status, token)}` en un único UPDATE.
+
+        Cada documento solo cambia si la transición es válida frente a su estado
+        actual en la BD, así que no pisa lo que otro consumidor, el reconciler o
+        el webhook síncrono hayan escrito mientras tanto. Devuelve cuántos cambiaron.
+        """
+        status_whens, token_whens = [], []
+        changed = Q()
+        for open_id, (status, token) in changes.items():
+            incoming = doc_status.normalize(status)
+            allowed = _transition_allowed(incoming)
+            doc_changes = Q()
+            if allowed is not None:
+                status_whens.append(When(Q(open_id=open_id) & allowed, then=Value(incoming)))
+                doc_changes |= allowed
+            if token:
+                token_whens.append(When(open_id=open_id, then=Value(token)))
+                doc_changes |= Q(token__isnull=True) | ~Q(token=token)
+            if allowed is not None or token:
+                changed |= Q(open_id=open_id) & doc_changes
+        assignments: dict = {}
+        if status_whens:
+            assignments['status'] = Case(*status_whens, default=F('status'))
+        if token_whens:
+            assignments['token'] = Case(*token_whens, default=F('token'))
+        if not assignments:
+            return 0
+        return (
+            Document.objects.alias(status_rank=_STATUS_RANK_SQL)
+            .filter(changed)
+            .update(**assignments, updated_at=timezone.now())
+        )
+
+    def ensure_send_keys(self, document_ids: list[int]) -> dict[int, SendKeyDTO]:
+        keys: dict[int, SendKeyDTO] = {}
+        missing: list[Document] = []
+        for obj in Document.objects.filter(id__in=document_ids).only('id', 'send_key'):
+            if obj.send_key:
+                keys[obj.id] = SendKeyDTO(key=obj.send_key, created=False)
+            else:
+                obj.send_key = uuid.uuid4().hex
+                missing.append(obj)
+        if missing:
+            # Un solo UPDATE condicional: si otra petición fijó ya la clave, se respeta la suya
+            Document.objects.filter(id__in=[o.id for o in missing], send_key__isnull=True).update(
+                send_key=Case(*[When(id=o.id, then=Value(o.send_key)) for o in missing])
+            )
+            stored = dict(Document.objects.filter(id__in=[o.id for o in missing]).values_list('id', 'send_key'))
+            for obj in missing:
+                keys[obj.id] = SendKeyDTO(key=stored[obj.id], created=stored[obj.id] == obj.send_key)
+        return keys
+
+    def import_many(self, company_id: int, documents: list[ZapSignDocumentDTO]) -> int:
+        """Inserta en bloque documentos de ZapSign; los open_id ya presentes se omiten. Devuelve cuántos eran nuevos."""
+        unique = {d.open_id: d for d in documents}
+        existing = set(Document.objects.filter(open_id__in=list(unique)).values_list('open_id', flat=True))
+        objs = [
+            Document(
+                company_id=company_id,
+                name=d.name or d.open_id,
+                pdf_url=d.pdf_url,
+                status=(d.status or 'pending').lower(),
+                open_id=d.open_id,
+                token=d.token,
+            )
+            for open_id, d in unique.items() if open_id not in existing
+        ]
+        # ignore_conflicts cubre la carrera con un webhook/envío que cree el mismo open_id entretanto
+        Document.objects.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+        return len(objs)
+
     def delete(self, document_id: int) -> bool:
         deleted, _ = Document.objects.filter(id=document_id).delete()
         return deleted > 0
@@ -78,3 +218,24 @@ class DjangoDocumentRepository(DocumentCommandRepository, DocumentQueryRepositor
         return PageDTO(count=total, results=items, next=next_token, previous=prev_token)
 
 
+
+
+# Rango del estado actual calculado en SQL con la tabla de domain.status
+_STATUS_RANK_SQL = Case(
+    *[When(status__iexact=name, then=Value(rank)) for name, rank in doc_status.STATUS_RANK.items()],
+    default=Value(doc_status.UNKNOWN_RANK),
+    output_field=IntegerField(),
+)
+
+
+def _transition_allowed(incoming: Optional[str]) -> Optional[Q]:
+    """Condición SQL (sobre el alias status_rank) equivalente a domain.status.next_status."""
+    if incoming is None:
+        return None
+    if incoming in doc_status.FAILURE_STATUSES:
+        signed_ranks = [doc_status.STATUS_RANK[s] for s in doc_status.SIGNED_STATUSES]
+        return ~Q(status_rank__in=signed_ranks) & ~Q(status__iexact=incoming)
+    incoming_rank = doc_status.rank(incoming)
+    if incoming_rank == doc_status.UNKNOWN_RANK:
+        return None
+    return Q(status_rank__lt=incoming_rank)
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from modules.document.application.dtos import SendJobDTO
+from modules.document.application.ports import SendJobRepository
+from modules.document.infrastructure.django_app.models import Document, SendJob
+
+
+def job_to_dto(job: SendJob) -> SendJobDTO:
+    return SendJobDTO(
+        id=str(job.id),
+        document_id=job.document_id,
+        status=job.status,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+class DjangoSendJobRepository(SendJobRepository):
+    ACTIVE = (SendJob.STATUS_QUEUED, SendJob.STATUS_RUNNING)
+
+    def enqueue(self, document_id: int) -> SendJobDTO:
+        with transaction.atomic():
+            # Serializa por documento: un único job activo aunque lleguen peticiones simultáneas
+            list(Document.objects.select_for_update().filter(id=document_id).values_list('id', flat=True))
+            active = (
+                SendJob.objects.filter(document_id=document_id, status__in=self.ACTIVE)  # type: ignore[attr-defined]
+                .order_by('created_at')
+                .first()
+            )
+            if active:
+                return job_to_dto(active)
+            return job_to_dto(SendJob.objects.create(document_id=document_id))  # type: ignore[attr-defined]
+
+    def enqueue_many(self, document_ids: list[int]) -> dict[int, SendJobDTO]:
+        """enqueue por lotes: reutiliza los jobs activos y crea el resto con una inserción masiva."""
+        ids = sorted(set(document_ids))
+        with transaction.atomic():
+            list(Document.objects.select_for_update().filter(id__in=ids).order_by('id').values_list('id', flat=True))
+            jobs: dict[int, SendJobDTO] = {}
+            active = (
+                SendJob.objects.filter(document_id__in=ids, status__in=self.ACTIVE)  # type: ignore[attr-defined]
+                .order_by('-created_at')
+            )
+            for job in active:
+                jobs[job.document_id] = job_to_dto(job)
+            created = SendJob.objects.bulk_create(  # type: ignore[attr-defined]
+                [SendJob(document_id=doc_id) for doc_id in ids if doc_id not in jobs]
+            )
+            for job in created:
+                jobs[job.document_id] = job_to_dto(job)
+        return jobs
+
+    def get(self, job_id: str) -> Optional[SendJobDTO]:
+        try:
+            return job_to_dto(SendJob.objects.get(id=job_id))  # type: ignore[attr-defined]
+        except (SendJob.DoesNotExist, ValidationError, ValueError):  # type: ignore[attr-defined]
+            return None
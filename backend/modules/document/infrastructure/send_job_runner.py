@@ -0,0 +1,139 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from django import db
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from modules.document.infrastructure.django_app.models import Campaign, SendJob
+from modules.shared.infrastructure.deadline import deadline_scope
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+UseCaseFactory = Callable[[], Any]
+
+
+def _default_use_case_factory() -> Any:
+    from modules.document.api.container import make_send_document_to_sign_use_case
+    return make_send_document_to_sign_use_case()
+
+
+def claim_send_jobs(batch_size: int = 10, lease_seconds: Optional[float] = None) -> list[SendJob]:
+    """Reserva hasta `batch_size` jobs en cola y los marca como `running`.
+
+    `FOR UPDATE SKIP LOCKED` permite varios runners en paralelo. Un job en
+    `running` cuyo `started_at` supera el lease se considera huérfano (runner
+    caído) y se vuelve a reservar.
+    """
+    lease = lease_seconds if lease_seconds is not None else getattr(settings, 'SEND_JOB_LEASE_SECONDS', 300.0)
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            SendJob.objects.select_for_update(skip_locked=True)  # type: ignore[attr-defined]
+            .filter(
+                Q(status=SendJob.STATUS_QUEUED)
+                | Q(status=SendJob.STATUS_RUNNING, started_at__lt=now - timedelta(seconds=lease))
+            )
+            .order_by('created_at')[:batch_size]
+        )
+        if not jobs:
+            return []
+        SendJob.objects.filter(id__in=[j.id for j in jobs]).update(  # type: ignore[attr-defined]
+            status=SendJob.STATUS_RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+    for job in jobs:
+        metrics.observe('send_job_wait_seconds', (now - job.created_at).total_seconds())
+    return jobs
+
+
+def execute_send_job(job: SendJob, use_case: Any) -> str:
+    started = time.monotonic()
+    status, error = SendJob.STATUS_SUCCEEDED, ''
+    try:
+        with deadline_scope(getattr(settings, 'SEND_JOB_DEADLINE_SECONDS', 0)):
+            result = use_case.execute(job.document_id)
+        if result is None:
+            status, error = SendJob.STATUS_FAILED, 'Document not found'
+        elif not result.open_id:
+            # El cliente de ZapSign registra el detalle y devuelve un resultado vacío
+            status, error = SendJob.STATUS_FAILED, 'ZapSign did not accept the document'
+    except Exception as exc:
+        logger.exception('Send job %s failed', job.id)
+        status, error = SendJob.STATUS_FAILED, f'{type(exc).__name__}: {exc}'
+    SendJob.objects.filter(id=job.id).update(  # type: ignore[attr-defined]
+        status=status,
+        error=error[:1000],
+        finished_at=timezone.now(),
+    )
+    if job.campaign_id:
+        # Progreso de la campaña: incremento atómico, sin recontar sus jobs
+        counter = 'sent' if status == SendJob.STATUS_SUCCEEDED else 'failed'
+        Campaign.objects.filter(id=job.campaign_id).update(**{counter: F(counter) + 1})  # type: ignore[attr-defined]
+    metrics.inc('send_jobs_total', outcome=status)
+    metrics.observe('send_job_run_seconds', time.monotonic() - started)
+    return status
+
+
+def run_send_job_batch(
+    batch_size: int = 10,
+    use_case_factory: Optional[UseCaseFactory] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> int:
+    factory = use_case_factory or _default_use_case_factory
+    jobs = claim_send_jobs(batch_size)
+    if not jobs:
+        return 0
+    if executor is None:
+        for job in jobs:
+            execute_send_job(job, factory())
+        return len(jobs)
+
+    def _run(job: SendJob) -> str:
+        try:
+            return execute_send_job(job, factory())
+        finally:
+            # Conexiones de DB por hilo del pool
+            db.close_old_connections()
+
+    list(executor.map(_run, jobs))
+    return len(jobs)
+
+
+def run_send_job_worker(
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    poll_seconds: Optional[float] = None,
+    once: bool = False,
+    use_case_factory: Optional[UseCaseFactory] = None,
+) -> int:
+    workers = concurrency or getattr(settings, 'SEND_JOB_CONCURRENCY', 4)
+    size = batch_size or getattr(settings, 'SEND_JOB_BATCH_SIZE', workers)
+    interval = poll_seconds if poll_seconds is not None else getattr(settings, 'SEND_JOB_POLL_SECONDS', 1.0)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='send-job') if workers > 1 else None
+
+    total = 0
+    logger.info('Send job worker started batch_size=%s concurrency=%s', size, workers)
+    try:
+        while True:
+            try:
+                done = run_send_job_batch(size, use_case_factory, executor)
+            except Exception:
+                logger.exception('Send job batch failed')
+                done = 0
+            total += done
+            if once and done < size:
+                return total
+            if done < size:
+                time.sleep(interval)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,85 @@
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from modules.document.application.dtos import WebhookBatchSummaryDTO
+from modules.document.infrastructure.django_app.models import WebhookInboxEvent
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+UseCaseFactory = Callable[[], Any]
+
+
+def _default_use_case_factory() -> Any:
+    from modules.document.api.container import make_apply_zapsign_webhook_batch_use_case
+    return make_apply_zapsign_webhook_batch_use_case()
+
+
+def append_webhook(payload: dict, open_id: str) -> None:
+    """Guarda el webhook tal cual llegó; un solo INSERT antes de responder a ZapSign."""
+    WebhookInboxEvent.objects.create(open_id=open_id[:255], payload=payload)  # type: ignore[attr-defined]
+    metrics.inc('webhook_inbox_events_total', outcome='received')
+
+
+def process_inbox_batch(
+    batch_size: Optional[int] = None,
+    use_case_factory: Optional[UseCaseFactory] = None,
+) -> int:
+    """Aplica y borra hasta `batch_size` eventos en orden de llegada. Devuelve cuántos procesó.
+
+    Lectura, actualización de documentos y borrado van en la misma
+    transacción: si algo falla los eventos siguen en el inbox. `SKIP LOCKED`
+    permite varios consumidores.
+    """
+    size = batch_size or getattr(settings, 'WEBHOOK_INBOX_BATCH_SIZE', 500)
+    with transaction.atomic():
+        events = list(
+            WebhookInboxEvent.objects.select_for_update(skip_locked=True)  # type: ignore[attr-defined]
+            .order_by('id')[:size]
+        )
+        if not events:
+            return 0
+        summary: WebhookBatchSummaryDTO = (use_case_factory or _default_use_case_factory)().execute(
+            [e.payload for e in events]
+        )
+        WebhookInboxEvent.objects.filter(id__in=[e.id for e in events]).delete()  # type: ignore[attr-defined]
+
+    now = timezone.now()
+    metrics.observe('webhook_inbox_lag_seconds', (now - events[0].received_at).total_seconds())
+    metrics.inc('webhook_inbox_events_total', summary.events - summary.unmatched, outcome='applied')
+    metrics.inc('webhook_inbox_events_total', summary.unmatched, outcome='unmatched')
+    metrics.inc('webhook_inbox_documents_updated_total', summary.updated)
+    logger.debug(
+        'Webhook inbox: %s events, %s documents, %s updated, %s unmatched',
+        summary.events, summary.documents, summary.updated, summary.unmatched,
+    )
+    return len(events)
+
+
+def run_webhook_inbox_worker(
+    batch_size: Optional[int] = None,
+    poll_seconds: Optional[float] = None,
+    once: bool = False,
+    use_case_factory: Optional[UseCaseFactory] = None,
+) -> int:
+    size = batch_size or getattr(settings, 'WEBHOOK_INBOX_BATCH_SIZE', 500)
+    interval = poll_seconds if poll_seconds is not None else getattr(settings, 'WEBHOOK_INBOX_POLL_SECONDS', 0.5)
+    total = 0
+    logger.info('Webhook inbox worker started batch_size=%s', size)
+    while True:
+        try:
+            done = process_inbox_batch(size, use_case_factory)
+        except Exception:
+            logger.exception('Webhook inbox batch failed')
+            done = 0
+        total += done
+        if done < size:
+            if once:
+                return total
+            time.sleep(interval)
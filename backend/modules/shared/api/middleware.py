@@ -0,0 +1,38 @@
+import math
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.deadline import deadline_scope
+
+
+class RequestDeadlineMiddleware:
+    """Da a cada petición un presupuesto de REQUEST_DEADLINE_SECONDS.
+
+    El cliente puede pedir uno menor con `X-Request-Timeout: <segundos>`. Los
+    adaptadores salientes recortan sus timeouts a lo que queda y, si se agota,
+    la petición responde 504.
+    """
+
+    def __init__(self, get_response):  # type: ignore
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        with deadline_scope(self._budget(request)):
+            return self.get_response(request)
+
+    def _budget(self, request: HttpRequest) -> float:
+        budget = float(getattr(settings, 'REQUEST_DEADLINE_SECONDS', 0) or 0)
+        try:
+            requested = float(request.headers.get('X-Request-Timeout', ''))
+        except ValueError:
+            return budget
+        if not math.isfinite(requested) or requested <= 0:
+            return budget
+        return min(budget, requested) if budget > 0 else requested
+
+    def process_exception(self, request: HttpRequest, exception: Exception):
+        if isinstance(exception, DeadlineExceeded):
+            return JsonResponse({'detail': str(exception)}, status=504)
+        return None
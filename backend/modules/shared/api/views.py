@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+
+from modules.shared.infrastructure.metrics import metrics
+
+
+def metrics_view(request: HttpRequest):
+    if request.method != 'GET':
+        return JsonResponse({'detail': 'Method not allowed'}, status=405)
+
+    # Mismo esquema de auth que los webhooks de automatización
+    expected = getattr(settings, 'AUTOMATION_API_KEY', None)
+    provided = request.headers.get('X-Automation-Key')
+    if not expected or provided != expected:
+        return JsonResponse({'detail': 'Unauthorized'}, status=401)
+
+    return JsonResponse(metrics.snapshot(), status=200)
@@ -0,0 +1,24 @@
+from typing import Optional
+
+
+class UpstreamUnavailable(Exception):
+    """Un servicio externo (ZapSign, n8n) no acepta llamadas ahora mismo.
+
+    Se lanza sin llegar a hacer la petición: circuito abierto o bulkhead lleno.
+    `retry_after_seconds` es una estimación de cuándo volver a intentarlo.
+    """
+
+    def __init__(self, upstream: str, reason: str, retry_after_seconds: Optional[float] = None) -> None:
+        super().__init__(f'{upstream} unavailable ({reason})')
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class DeadlineExceeded(Exception):
+    """El presupuesto de tiempo de la petición (o del mensaje) no alcanza para seguir."""
+
+    def __init__(self, operation: str, remaining_seconds: float = 0.0) -> None:
+        super().__init__(f'deadline exceeded before {operation} ({max(remaining_seconds, 0.0):.3f}s left)')
+        self.operation = operation
+        self.remaining_seconds = remaining_seconds
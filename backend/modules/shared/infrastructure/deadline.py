@@ -0,0 +1,93 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.metrics import metrics
+
+
+# Instante (time.monotonic) en que vence el presupuesto de la petición/mensaje actual
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+# Estado compartido del scope (también con los hilos que copian el contexto): si alguna
+# llamada saliente terminó bien, sus resultados se pueden guardar aunque venza el presupuesto
+_scope_state: ContextVar[Optional[dict]] = ContextVar('deadline_scope_state', default=None)
+
+# Por debajo de esto no merece la pena empezar una llamada de red
+MIN_CALL_SECONDS = 0.05
+
+
+def remaining() -> Optional[float]:
+    """Segundos que quedan del presupuesto actual; None si no hay deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str, minimum: float = 0.0) -> None:
+    left = remaining()
+    if left is not None and left <= minimum:
+        metrics.inc('deadline_exceeded_total', operation=operation)
+        raise DeadlineExceeded(operation, left)
+
+
+def timeout_for(default: float, operation: str) -> float:
+    """Timeout para una llamada saliente: el menor entre `default` y lo que queda del presupuesto.
+
+    Lanza DeadlineExceeded si no queda tiempo para una llamada útil.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    check_deadline(operation, MIN_CALL_SECONDS)
+    return min(default, left)
+
+
+def note_upstream_completed() -> None:
+    """Marca que una llamada saliente terminó: lo que devolvió debe poder persistirse."""
+    state = _scope_state.get()
+    if state is not None:
+        state['upstream_completed'] = True
+
+
+def _db_guard(execute, sql, params, many, context):  # type: ignore
+    # No lanzar consultas cuyo resultado ya nadie va a esperar, salvo las que guardan el
+    # resultado de una llamada ya hecha (p. ej. open_id/token de un documento creado en ZapSign):
+    # esas tienen DEADLINE_PERSIST_GRACE_SECONDS más
+    left = remaining()
+    if left is not None and left <= 0:
+        state = _scope_state.get() or {}
+        grace = getattr(settings, 'DEADLINE_PERSIST_GRACE_SECONDS', 5.0)
+        if not (state.get('upstream_completed') and -left < grace):
+            check_deadline('db_query')
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Fija un presupuesto de `seconds` para el bloque (None o <= 0: sin límite).
+
+    Un scope anidado nunca amplía el presupuesto del exterior. Las consultas a
+    la base de datos del hilo actual se rechazan una vez vencido, salvo tras
+    una llamada saliente completada (ver `_db_guard`).
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    state_token = _scope_state.set(_scope_state.get() or {})
+    try:
+        with connection.execute_wrapper(_db_guard):
+            yield
+    finally:
+        _scope_state.reset(state_token)
+        _deadline.reset(token)
@@ -0,0 +1,138 @@
+import atexit
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from django.conf import settings
+
+from modules.shared.infrastructure.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ConnectionTrace:
+    """Callback de trazas de httpcore: detecta si la petición abrió conexión TCP nueva."""
+
+    def __init__(self) -> None:
+        self.connected = False
+
+    def __call__(self, event_name: str, info: dict) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            self.connected = True
+
+
+def _origin(base_url: str) -> str:
+    url = httpx.URL(base_url)
+    port = f':{url.port}' if url.port else ''
+    return f'{url.scheme}://{url.host}{port}'
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientRegistry:
+    """Un `httpx.Client` keep-alive por upstream (scheme://host:port), compartido por proceso.
+
+    Los clientes se crean al primer uso y son thread-safe. Tras un fork se
+    descartan sin cerrarlos (los sockets pertenecen al padre). Cada petición
+    suma `http_requests_total` y `http_connections_opened_total` o
+    `http_connection_reuses_total` según haya abierto conexión o no.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+        http2: Optional[bool] = None,
+    ) -> None:
+        self.max_connections = max_connections or getattr(settings, 'HTTP_POOL_MAX_CONNECTIONS', 100)
+        self.max_keepalive_connections = max_keepalive_connections or getattr(settings, 'HTTP_POOL_MAX_KEEPALIVE', 20)
+        self.keepalive_expiry_seconds = keepalive_expiry_seconds or getattr(settings, 'HTTP_KEEPALIVE_EXPIRY_SECONDS', 30.0)
+        self.timeout_seconds = timeout_seconds or getattr(settings, 'HTTP_CLIENT_TIMEOUT_SECONDS', 15.0)
+        self.http2 = getattr(settings, 'HTTP_CLIENT_HTTP2', False) if http2 is None else http2
+        if self.http2 and not _http2_available():
+            logger.warning('HTTP/2 requested but the h2 package is not installed; using HTTP/1.1')
+            self.http2 = False
+        self._lock = threading.Lock()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._pid = os.getpid()
+
+    def _build(self, origin: str) -> httpx.Client:
+        def _on_request(request: httpx.Request) -> None:
+            request.extensions['trace'] = _ConnectionTrace()
+
+        def _on_response(response: httpx.Response) -> None:
+            trace = response.request.extensions.get('trace')
+            metrics.inc('http_requests_total', upstream=origin)
+            if isinstance(trace, _ConnectionTrace) and not trace.connected:
+                metrics.inc('http_connection_reuses_total', upstream=origin)
+            else:
+                metrics.inc('http_connections_opened_total', upstream=origin)
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+        logger.info('Creating shared HTTP client for %s (http2=%s)', origin, self.http2)
+        return httpx.Client(
+            limits=limits,
+            timeout=self.timeout_seconds,
+            http2=self.http2,
+            event_hooks={'request': [_on_request], 'response': [_on_response]},
+        )
+
+    def get(self, base_url: str) -> httpx.Client:
+        origin = _origin(base_url)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._clients = {}
+                self._pid = os.getpid()
+            client = self._clients.get(origin)
+            if client is None:
+                client = self._build(origin)
+                self._clients[origin] = client
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values()) if self._pid == os.getpid() else []
+            self._clients = {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                logger.exception('Error closing shared HTTP client')
+
+
+_registry: Optional[HttpClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = HttpClientRegistry()
+        registry = _registry
+    return registry.get(base_url)
+
+
+def close_all_http_clients() -> None:
+    with _registry_lock:
+        registry = _registry
+    if registry is not None:
+        registry.close()
+
+
+atexit.register(close_all_http_clients)
@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format(name: str, key: LabelKey) -> str:
+    if not key:
+        return name
+    inner = ','.join(f'{k}="{v}"' for k, v in key)
+    return f'{name}{{{inner}}}'
+
+
+class MetricsRegistry:
+    """Registro en memoria (por proceso) de contadores, gauges y observaciones.
+
+    Pensado para exponer métricas básicas sin dependencias externas; el
+    snapshot se publica en `/api/metrics/`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._observations: Dict[Tuple[str, LabelKey], Dict[str, float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: object) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            agg = self._observations.setdefault(key, {'count': 0, 'sum': 0.0, 'max': 0.0})
+            agg['count'] += 1
+            agg['sum'] += value
+            agg['max'] = max(agg['max'], value)
+
+    def counter_value(self, name: str, **labels: object) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def gauge_value(self, name: str, **labels: object) -> float | None:
+        with self._lock:
+            return self._gauges.get((name, _label_key(labels)))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': {_format(n, k): v for (n, k), v in self._counters.items()},
+                'gauges': {_format(n, k): v for (n, k), v in self._gauges.items()},
+                'observations': {_format(n, k): dict(v) for (n, k), v in self._observations.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+metrics = MetricsRegistry()
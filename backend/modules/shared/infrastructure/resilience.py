@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from django.conf import settings
+
+from modules.shared.domain.errors import DeadlineExceeded, UpstreamUnavailable
+from modules.shared.infrastructure.deadline import note_upstream_completed, remaining
+from modules.shared.infrastructure.metrics import metrics
+
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+# Valor del gauge circuit_breaker_state
+STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+
+class CircuitBreaker:
+    """Circuit breaker con ventana deslizante por número de llamadas.
+
+    Se abre cuando, con al menos `minimum_calls` en la ventana, la tasa de
+    fallos alcanza `failure_rate_threshold`. Tras `open_seconds` pasa a
+    half-open y deja pasar `half_open_max_calls` sondas: si todas van bien se
+    cierra, si una falla vuelve a abrirse.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._window: deque = deque(maxlen=window_size)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._publish_state()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _publish_state(self) -> None:
+        metrics.set_gauge('circuit_breaker_state', STATE_VALUES[self._state], upstream=self.name)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        if state == STATE_OPEN:
+            self._opened_at = self.clock()
+        if state in (STATE_OPEN, STATE_CLOSED):
+            self._window.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        metrics.inc('circuit_breaker_transitions_total', upstream=self.name, state=state)
+        self._publish_state()
+
+    def _maybe_half_open(self) -> None:
+        if self._state == STATE_OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._transition(STATE_HALF_OPEN)
+
+    def before_call(self) -> None:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == STATE_OPEN:
+                retry_after = max(0.0, self.open_seconds - (self.clock() - self._opened_at))
+                metrics.inc('circuit_breaker_rejections_total', upstream=self.name)
+                raise UpstreamUnavailable(self.name, 'circuit open', retry_after)
+            if self._state == STATE_HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    metrics.inc('circuit_breaker_rejections_total', upstream=self.name)
+                    raise UpstreamUnavailable(self.name, 'circuit half-open', self.open_seconds)
+                self._probes_in_flight += 1
+
+    def release_probe(self) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(STATE_CLOSED)
+                return
+            self._window.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._transition(STATE_OPEN)
+                return
+            if self._state == STATE_OPEN:
+                return
+            self._window.append(False)
+            calls = len(self._window)
+            failures = sum(1 for ok in self._window if not ok)
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate_threshold:
+                self._transition(STATE_OPEN)
+
+
+class Bulkhead:
+    """Limita las llamadas simultáneas a un upstream; las que no caben fallan enseguida."""
+
+    def __init__(self, name: str, max_concurrent: int, max_wait_seconds: float = 0.0) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait_seconds = max_wait_seconds
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def acquire(self) -> None:
+        if self.max_wait_seconds > 0:
+            acquired = self._semaphore.acquire(timeout=self.max_wait_seconds)
+        else:
+            acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            metrics.inc('bulkhead_rejections_total', upstream=self.name)
+            raise UpstreamUnavailable(self.name, 'too many concurrent calls')
+        with self._lock:
+            self.in_flight += 1
+            metrics.set_gauge('bulkhead_in_flight', self.in_flight, upstream=self.name)
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            metrics.set_gauge('bulkhead_in_flight', self.in_flight, upstream=self.name)
+        self._semaphore.release()
+
+
+class _CallOutcome:
+    def __init__(self) -> None:
+        self.failed = False
+
+    def mark_failure(self) -> None:
+        """Cuenta la llamada como fallo aunque no haya lanzado excepción (p. ej. HTTP 5xx)."""
+        self.failed = True
+
+
+class UpstreamGuard:
+    """Bulkhead + circuit breaker para un upstream.
+
+    Uso::
+
+        with guard.protect() as call:
+            resp = client.post(...)
+            if resp.status_code >= 500:
+                call.mark_failure()
+
+    Una excepción dentro del bloque cuenta como fallo, salvo que venga del
+    presupuesto de tiempo del llamante (DeadlineExceeded o un timeout con el
+    presupuesto ya agotado): eso no dice nada de la salud del upstream.
+    """
+
+    def __init__(self, name: str, breaker: CircuitBreaker, bulkhead: Bulkhead) -> None:
+        self.name = name
+        self.breaker = breaker
+        self.bulkhead = bulkhead
+
+    @contextmanager
+    def protect(self) -> Iterator[_CallOutcome]:
+        self.breaker.before_call()
+        try:
+            self.bulkhead.acquire()
+        except UpstreamUnavailable:
+            # La llamada no llegó a hacerse: no cuenta para el breaker
+            self.breaker.release_probe()
+            raise
+        outcome = _CallOutcome()
+        try:
+            yield outcome
+        except DeadlineExceeded:
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            left = remaining()
+            if left is not None and left <= 0:
+                self.breaker.release_probe()
+            else:
+                self.breaker.record_failure()
+            raise
+        else:
+            if outcome.failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+                note_upstream_completed()
+        finally:
+            self.bulkhead.release()
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_upstream_guard(name: str, max_concurrent: Optional[int] = None) -> UpstreamGuard:
+    """Guard compartido por proceso para `name` ('zapsign', 'n8n'), configurado desde settings."""
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            limits = getattr(settings, 'UPSTREAM_MAX_CONCURRENT_CALLS', {})
+            breaker = CircuitBreaker(
+                name,
+                window_size=getattr(settings, 'CIRCUIT_BREAKER_WINDOW', 20),
+                minimum_calls=getattr(settings, 'CIRCUIT_BREAKER_MIN_CALLS', 10),
+                failure_rate_threshold=getattr(settings, 'CIRCUIT_BREAKER_FAILURE_RATE', 0.5),
+                open_seconds=getattr(settings, 'CIRCUIT_BREAKER_OPEN_SECONDS', 30.0),
+            )
+            bulkhead = Bulkhead(
+                name,
+                max_concurrent=max_concurrent or limits.get(name, 20),
+                max_wait_seconds=getattr(settings, 'BULKHEAD_MAX_WAIT_SECONDS', 0.0),
+            )
+            guard = UpstreamGuard(name, breaker, bulkhead)
+            _guards[name] = guard
+        return guard
+
+
+def reset_upstream_guards() -> None:
+    with _guards_lock:
+        _guards.clear()
@@ -11,5 +11,6 @@ class SignerQueryRepository(Protocol):
     def count_by_document(self, document_id: int) -> int: ...
     def get_by_document_and_email(self, document_id: int, email: str) -> Optional[SignerDTO]: ...
     def list_by_document(self, document_id: int) -> list[SignerDTO]: ...
+    def list_by_documents(self, document_ids: list[int]) -> dict[int, list[SignerDTO]]: ...
 
 
@@ -28,4 +28,10 @@ class DjangoSignerRepository(SignerCommandRepository, SignerQueryRepository):
             for o in Signer.objects.filter(document_id=document_id).order_by('id')
         ]
 
-
+    def list_by_documents(self, document_ids: list[int]) -> dict[int, list[SignerDTO]]:
+        grouped: dict[int, list[SignerDTO]] = {doc_id: [] for doc_id in document_ids}
+        for o in Signer.objects.filter(document_id__in=document_ids).order_by('document_id', 'id'):
+            grouped.setdefault(o.document_id, []).append(
+                SignerDTO(id=o.id, document_id=o.document_id, name=o.name, email=o.email, created_at=o.created_at)
+            )
+        return grouped
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+
+
+@pytest.fixture()
+def docs(db, settings):
+    settings.AUTOMATION_API_KEY = 'secret-key'
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    return [
+        Document.objects.create(company_id=company.id, name=f'C{i}', pdf_url='https://e.com/a.pdf').id
+        for i in range(3)
+    ]
+
+
+def _result(document_id, summary='Resumen'):
+    return {'document_id': document_id, 'summary': summary, 'labels': ['legal'], 'risk_score': 0.3, 'status': 'done'}
+
+
+def _post(client, data, content_type='application/json'):
+    return client.post('/api/webhooks/analysis/batch/', data=data, content_type=content_type, HTTP_X_AUTOMATION_KEY='secret-key')
+
+
+def test_batch_reports_per_item_status(client, docs):
+    _post(client, json.dumps([_result(docs[0])]))
+    payload = [
+        _result(docs[0]),
+        _result(docs[1], 'viejo'),
+        {'summary': 'sin id'},
+        _result(999),
+        _result(docs[1], 'nuevo'),
+    ]
+
+    resp = _post(client, json.dumps({'results': payload}))
+
+    assert resp.status_code == 200
+    assert [r['status'] for r in resp.json()['results']] == ['unchanged', 'superseded', 'invalid', 'not_found', 'created']
+    assert resp.json()['counts']['created'] == 1
+    assert DocumentAnalysis.objects.get(document_id=docs[1]).summary == 'nuevo'
+
+
+def test_ndjson_batch_is_written_in_chunked_bulk_statements(client, docs, settings):
+    settings.ANALYSIS_BATCH_CHUNK_SIZE = 2
+    # Solo se cuentan las consultas del upsert
+    settings.ANALYSIS_CACHE_ENABLED = False
+    _post(client, json.dumps([_result(docs[0])]))
+    body = '\n'.join([json.dumps(_result(d, 'v2')) for d in docs] + ['{not json'])
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = _post(client, body, content_type='application/x-ndjson')
+
+    statuses = [r['status'] for r in resp.json()['results']]
+    assert statuses == ['updated', 'created', 'created', 'invalid']
+    assert DocumentAnalysis.objects.filter(summary='v2').count() == 3
+    # Dos bloques × (documentos, análisis actuales, upsert masivo)
+    assert len([q for q in ctx.captured_queries if 'document_analysis' in q['sql'] or '"document"' in q['sql']]) == 6
+
+
+def test_batch_requires_auth_and_caps_size(client, docs, settings):
+    settings.ANALYSIS_BATCH_MAX_ITEMS = 2
+    assert client.post('/api/webhooks/analysis/batch/', data='[]', content_type='application/json').status_code == 401
+    assert _post(client, json.dumps([_result(d) for d in docs])).status_code == 413
+    assert _post(client, json.dumps({'document_id': docs[0]})).status_code == 400
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.analysis.api.container import make_handle_analysis_webhook_use_case
+from modules.analysis.application.dtos import FetchedPdfDTO
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.infrastructure.adapters.pdf_fetcher_http import HttpPdfFetcher
+from modules.analysis.infrastructure.django_app.models import AnalysisCacheEntry, DocumentAnalysis
+from modules.analysis.infrastructure.repositories.analysis_cache_repository_django import DjangoAnalysisCacheRepository
+from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+from modules.shared.infrastructure.metrics import metrics
+
+
+class FakeFetcher:
+    @contextmanager
+    def fetch(self, pdf_url):
+        name = pdf_url.rsplit('/', 1)[-1]
+        yield FetchedPdfDTO(path=name, content_hash=hashlib.sha256(name.encode()).hexdigest(), size=1)
+
+
+class FakeNotifier:
+    def __init__(self) -> None:
+        self.notified: list[int] = []
+
+    def notify_document_created(self, *, document_id, company_id, name, pdf_url, text=None, priority=None):
+        self.notified.append(document_id)
+
+
+def _use_case(notifier, model_version='v1'):
+    return AnalyzeDocumentUseCase(
+        notifier=notifier,
+        analysis_commands=DjangoAnalysisRepository(),
+        pdf_fetcher=FakeFetcher(),
+        cache=DjangoAnalysisCacheRepository(),
+        model_version=model_version,
+    )
+
+
+def _analyze(use_case, doc):
+    return use_case.execute(document_id=doc.id, company_id=doc.company_id, name=doc.name, pdf_url=doc.pdf_url)
+
+
+@pytest.mark.django_db
+def test_same_pdf_in_another_tenant_reuses_the_cached_analysis():
+    metrics.reset()
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    other = DjangoCompanyRepository().create(name='Other', api_token='u')
+    first = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://a.com/contrato.pdf')
+    second = Document.objects.create(company_id=other.id, name='C', pdf_url='https://b.com/contrato.pdf')
+    notifier = FakeNotifier()
+
+    assert _analyze(_use_case(notifier), first) == 'notified'
+    make_handle_analysis_webhook_use_case().execute(
+        {'document_id': first.id, 'summary': 'Resumen', 'risk_score': 0.4, 'status': 'done'}
+    )
+    assert _analyze(_use_case(notifier), second) == 'cached'
+
+    assert notifier.notified == [first.id]
+    copied = DocumentAnalysis.objects.get(document_id=second.id)
+    assert (copied.summary, copied.risk_score) == ('Resumen', 0.4)
+    assert AnalysisCacheEntry.objects.get().hits == 1
+    assert metrics.gauge_value('analysis_cache_hit_ratio') == 0.5
+
+    # Otra versión de modelo no reutiliza resultados anteriores
+    assert _analyze(_use_case(notifier, model_version='v2'), second) == 'notified'
+
+
+@pytest.mark.django_db
+def test_failed_or_unfinished_results_are_not_cached():
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    first = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://a.com/contrato.pdf')
+    second = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://b.com/contrato.pdf')
+    partial = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://e.com/a.pdf', content_hash='h1')
+    notifier = FakeNotifier()
+    handle = make_handle_analysis_webhook_use_case()
+
+    assert _analyze(_use_case(notifier), first) == 'notified'
+    handle.execute({'document_id': first.id, 'summary': '', 'status': 'failed'})
+    handle.execute({'document_id': partial.id, 'summary': 'Parcial', 'status': 'partial'})
+
+    assert not AnalysisCacheEntry.objects.exists()
+    # El mismo PDF vuelve a n8n en vez de repetir el fallo como 'cached'
+    assert _analyze(_use_case(notifier), second) == 'notified'
+    assert notifier.notified == [first.id, second.id]
+
+
+@pytest.mark.django_db
+def test_eviction_drops_expired_then_least_recently_used_entries():
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    repo = DjangoAnalysisCacheRepository(max_entries=2)
+    for i in range(3):
+        doc = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://e.com/a.pdf', content_hash=f'h{i}')
+        make_handle_analysis_webhook_use_case().execute({'document_id': doc.id, 'summary': f's{i}', 'status': 'done'})
+    repo.get('h0', 'v1')
+
+    assert repo.evict() == 1
+    assert sorted(AnalysisCacheEntry.objects.values_list('content_hash', flat=True)) == ['h0', 'h2']
+    assert DjangoAnalysisCacheRepository(ttl_seconds=0).evict() == 2
+
+
+@pytest.fixture()
+def pdf_server():
+    content = b'%PDF-1.4 ' + b'x' * 200_000
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # noqa: N802
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    # El fetcher corta la descarga al superar max_bytes
+    server.handle_error = lambda request, address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/doc.pdf', content
+    server.shutdown()
+
+
+def test_fetcher_streams_to_a_temp_file_and_hashes_the_pdf(pdf_server):
+    url, content = pdf_server
+
+    with HttpPdfFetcher().fetch(url) as pdf:
+        assert pdf.content_hash == hashlib.sha256(content).hexdigest()
+        with open(pdf.path, 'rb') as fh:
+            assert fh.read() == content
+    assert not os.path.exists(pdf.path)
+    with HttpPdfFetcher(max_bytes=1000).fetch(url) as pdf:
+        assert pdf is None
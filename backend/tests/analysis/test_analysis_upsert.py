@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.analysis.application.dtos import AnalysisResultDTO
+from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+
+
+def _dto(document_id, summary='Resumen', risk=0.2):
+    return AnalysisResultDTO(
+        document_id=document_id, summary=summary, labels=['legal'], entities=[{'type': 'DATE', 'value': '2025-01-01'}],
+        risk_score=risk, status='done', missing_topics=[], insights=[{'k': 'v'}], model_info={'model': 'x'},
+    )
+
+
+@pytest.fixture()
+def document(db):
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    return Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/a.pdf')
+
+
+def test_upsert_inserts_and_updates_in_one_statement(document):
+    repo = DjangoAnalysisRepository()
+
+    with CaptureQueriesContext(connection) as ctx:
+        created = repo.upsert(_dto(document.id))
+    assert len(ctx.captured_queries) == 1
+    assert created == _dto(document.id)
+
+    with CaptureQueriesContext(connection) as ctx:
+        updated = repo.upsert(_dto(document.id, summary='Nuevo', risk=0.7))
+    assert len(ctx.captured_queries) == 1
+    assert (updated.summary, updated.risk_score) == ('Nuevo', 0.7)
+    assert DocumentAnalysis.objects.get(document_id=document.id).summary == 'Nuevo'
+
+
+def test_unchanged_result_is_not_rewritten(document):
+    repo = DjangoAnalysisRepository()
+    repo.upsert(_dto(document.id))
+    first = DocumentAnalysis.objects.get(document_id=document.id).updated_at
+
+    assert repo.upsert(_dto(document.id)) == _dto(document.id)
+
+    assert DocumentAnalysis.objects.get(document_id=document.id).updated_at == first
+
+
+def test_missing_document_is_not_persisted(db):
+    assert DjangoAnalysisRepository().upsert(_dto(999)) == _dto(999)
+    assert not DocumentAnalysis.objects.exists()
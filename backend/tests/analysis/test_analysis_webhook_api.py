@@ -114,3 +114,45 @@ def test_analysis_webhook_idempotent(client, settings):
 
     objs = list(DocumentAnalysis.objects.filter(document_id=doc["id"]))  # type: ignore[attr-defined]
     assert len(objs) == 1
+
+
+@pytest.mark.django_db
+def test_same_result_after_reanalysis_is_applied_again(client, settings):
+    settings.AUTOMATION_API_KEY = "secret-key"
+    from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+
+    company = client.post(
+        "/api/companies/",
+        data=json.dumps({"name": "Acme", "api_token": "t"}),
+        content_type="application/json",
+    ).json()
+    doc = client.post(
+        "/api/documents/",
+        data=json.dumps({"company_id": company["id"], "name": "Contrato", "pdf_url": "https://e.com/a.pdf"}),
+        content_type="application/json",
+    ).json()
+    payload = json.dumps({
+        "document_id": doc["id"],
+        "company_id": company["id"],
+        "summary": "Resumen",
+        "labels": [],
+        "entities": [],
+        "risk_score": 0.1,
+        "status": "done",
+    })
+
+    def post(**headers):
+        return client.post("/api/webhooks/analysis/", data=payload, content_type="application/json",
+                           HTTP_X_AUTOMATION_KEY="secret-key", **headers)
+
+    assert post().status_code == 200
+    # Re-análisis en curso: n8n devuelve exactamente el mismo resultado
+    DocumentAnalysis.objects.filter(document_id=doc["id"]).update(status="running")
+    assert post().status_code == 200
+    assert DocumentAnalysis.objects.get(document_id=doc["id"]).status == "done"
+
+    # Con id de evento los reintentos sí se descartan
+    assert post(HTTP_X_EVENT_ID="evt-1").status_code == 200
+    DocumentAnalysis.objects.filter(document_id=doc["id"]).update(status="running")
+    assert post(HTTP_X_EVENT_ID="evt-1").status_code == 200
+    assert DocumentAnalysis.objects.get(document_id=doc["id"]).status == "running"
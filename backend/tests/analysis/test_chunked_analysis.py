@@ -0,0 +1,147 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from modules.analysis.application.dtos import AnalysisResultDTO, FetchedPdfDTO
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.application.use_cases.analyze_text_in_chunks import AnalyzeTextInChunksUseCase, merge_chunk_results
+from modules.analysis.domain.chunking import split_text
+from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+from modules.analysis.infrastructure.repositories.analysis_cache_repository_django import DjangoAnalysisCacheRepository
+from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+from modules.shared.infrastructure.metrics import metrics
+
+
+def _contract(sections: int = 60) -> str:
+    return '\n'.join(
+        f'Cláusula {i}: el proveedor se obliga a cumplir la obligación número {i} en los plazos pactados.'
+        for i in range(sections)
+    )
+
+
+class FakeChunkAnalyzer:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.fail_on: str | None = None
+        self._lock = threading.Lock()
+
+    def analyze_chunk(self, *, document_id, index, total, text):
+        with self._lock:
+            self.texts.append(text)
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError('model timeout')
+        risky = 'penalización' in text
+        return AnalysisResultDTO(
+            document_id=document_id, summary=f'Resumen {index}', labels=['contrato', 'riesgo'] if risky else ['contrato'],
+            entities=[{'type': 'ORG', 'value': 'Proveedor'}], risk_score=0.9 if risky else 0.1, status='done',
+            missing_topics=[{'topic': 'confidencialidad'}], insights=[], model_info={'model': 'x'},
+        )
+
+
+def _use_case(analyzer):
+    return AnalyzeTextInChunksUseCase(
+        chunk_analyzer=analyzer, cache=DjangoAnalysisCacheRepository(), chunk_chars=600, overlap_chars=80, concurrency=3,
+    )
+
+
+def test_split_text_bounds_chunks_and_keeps_boundaries_local():
+    text = _contract()
+    chunks = split_text(text, chunk_chars=600, overlap_chars=80)
+
+    assert len(chunks) > 3
+    assert all(len(chunk) <= 600 + 80 + 1 for chunk in chunks)
+    assert all(chunks[i - 1].splitlines()[-1][-80:] in chunks[i] for i in range(1, len(chunks)))
+
+    edited = split_text(text.replace('obligación número 30 ', 'obligación número 30 con penalización '), 600, 80)
+    assert len(set(edited) - set(chunks)) <= 2
+
+
+@pytest.mark.django_db
+def test_only_changed_chunks_are_reanalysed():
+    metrics.reset()
+    analyzer = FakeChunkAnalyzer()
+    text = _contract()
+    first = _use_case(analyzer).execute(1, text)
+    analysed = len(analyzer.texts)
+
+    analyzer.texts = []
+    second = _use_case(analyzer).execute(1, text.replace('obligación número 30 ', 'obligación número 30 con penalización '))
+
+    assert 1 <= len(analyzer.texts) <= 2 < analysed
+    assert (first.risk_score, second.risk_score) == (0.1, 0.9)
+    assert second.labels == ['contrato', 'riesgo']
+    assert metrics.counter_value('analysis_chunk_cache_total', outcome='hit') == analysed - len(analyzer.texts)
+
+
+@pytest.mark.django_db
+def test_failed_chunk_is_retried_alone():
+    analyzer = FakeChunkAnalyzer()
+    analyzer.fail_on = 'número 45 '
+    with pytest.raises(RuntimeError):
+        _use_case(analyzer).execute(1, _contract())
+
+    analyzer.texts = []
+    analyzer.fail_on = None
+    _use_case(analyzer).execute(1, _contract())
+
+    # Solo se repiten los trozos que fallaron (el del texto y, si cae en la frontera, el del solape)
+    assert 1 <= len(analyzer.texts) <= 2
+    assert all('número 45 ' in text for text in analyzer.texts)
+
+
+def test_merge_is_deterministic():
+    parts = [
+        AnalysisResultDTO(document_id=0, summary='A', labels=['x'], entities=[{'v': 1}], risk_score=0.2,
+                          missing_topics=[{'topic': 'pago'}, {'topic': 'plazo'}], insights=[{'i': 1}], model_info={'m': 1}),
+        AnalysisResultDTO(document_id=0, summary='B', labels=['y', 'x'], entities=[{'v': 1}, {'v': 2}], risk_score=0.7,
+                          missing_topics=[{'topic': 'plazo'}], insights=[{'i': 1}], model_info={'m': 1}),
+    ]
+
+    merged = merge_chunk_results(5, parts)
+
+    assert merged == merge_chunk_results(5, parts)
+    assert merged.summary == 'A\n\nB'
+    assert merged.labels == ['x', 'y']
+    assert merged.entities == [{'v': 1}, {'v': 2}]
+    assert merged.risk_score == 0.7
+    assert merged.missing_topics == [{'topic': 'plazo'}]
+    assert merged.insights == [{'i': 1}]
+    assert merged.model_info == {'m': 1, 'chunks': 2}
+
+
+@pytest.mark.django_db
+def test_worker_analyses_long_documents_in_chunks_without_n8n_callback():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/largo.pdf')
+
+    class Fetcher:
+        @contextmanager
+        def fetch(self, pdf_url):
+            yield FetchedPdfDTO(path='largo.pdf', content_hash='h-largo', size=1)
+
+    class Extractor:
+        def extract(self, pdf):
+            return _contract()
+
+    class Notifier:
+        def notify_document_created(self, **kwargs):
+            raise AssertionError('long documents do not go through the webhook flow')
+
+    use_case = AnalyzeDocumentUseCase(
+        notifier=Notifier(),
+        analysis_commands=DjangoAnalysisRepository(),
+        pdf_fetcher=Fetcher(),
+        cache=DjangoAnalysisCacheRepository(),
+        text_extractor=Extractor(),
+        chunked=_use_case(FakeChunkAnalyzer()),
+        chunk_threshold_chars=1000,
+    )
+
+    assert use_case.execute(document_id=doc.id, company_id=company.id, name='C', pdf_url=doc.pdf_url) == 'chunked'
+    analysis = DocumentAnalysis.objects.get(document_id=doc.id)
+    assert analysis.model_info['chunks'] > 1
+    # El resultado completo también queda en la caché por contenido del PDF
+    assert DjangoAnalysisCacheRepository().get('h-largo', 'v1').summary == analysis.summary
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from modules.analysis.application.dtos import FetchedPdfDTO
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.infrastructure.adapters import pdf_text_extractor_local
+from modules.analysis.infrastructure.adapters.pdf_text_extractor_local import (
+    LocalPdfTextExtractor,
+    evict_text_cache,
+    shutdown_extraction_pool,
+)
+from modules.analysis.infrastructure.pdf_text import extract_text, is_readable
+from modules.shared.infrastructure.metrics import metrics
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'contrato.pdf')
+
+
+@pytest.fixture(scope='module', autouse=True)
+def _stop_pool():
+    yield
+    shutdown_extraction_pool()
+
+
+def _fixture_pdf() -> FetchedPdfDTO:
+    with open(FIXTURE, 'rb') as fh:
+        data = fh.read()
+    return FetchedPdfDTO(path=FIXTURE, content_hash=hashlib.sha256(data).hexdigest(), size=len(data))
+
+
+def test_undecodable_text_is_not_forwarded():
+    # Glifos de una fuente Identity-H sin ToUnicode leídos como bytes: no es texto
+    assert not is_readable('\x00+\x00H\x00O\x00O\x00R')
+    assert not is_readable('')
+    assert is_readable('Cláusula primera:\tobjeto\n')
+
+
+def test_fixture_pdf_text():
+    text = extract_text(FIXTURE)
+
+    assert 'CONTRATO DE PRESTACION DE SERVICIOS' in text
+    assert 'Penalizacion por incumplimiento del 20%.' in text
+
+
+def test_extractor_runs_in_process_pool_and_caches_on_disk(tmp_path):
+    metrics.reset()
+    extractor = LocalPdfTextExtractor(cache_dir=str(tmp_path))
+    pdf = _fixture_pdf()
+
+    first = extractor.extract(pdf)
+    second = extractor.extract(pdf)
+
+    assert first == second == extract_text(FIXTURE)
+    assert (tmp_path / pdf.content_hash[:2] / f'{pdf.content_hash}.txt').exists()
+    assert metrics.counter_value('pdf_text_extractions_total', outcome='extracted') == 1
+    assert metrics.counter_value('pdf_text_extractions_total', outcome='cache_hit') == 1
+
+
+def test_worker_forwards_only_the_extracted_text(tmp_path):
+    class FixtureFetcher:
+        @contextmanager
+        def fetch(self, pdf_url):
+            yield _fixture_pdf()
+
+    sent = {}
+
+    class Notifier:
+        def notify_document_created(self, **kwargs):
+            sent.update(kwargs)
+
+    use_case = AnalyzeDocumentUseCase(
+        notifier=Notifier(),
+        analysis_commands=None,  # type: ignore[arg-type]
+        pdf_fetcher=FixtureFetcher(),
+        text_extractor=LocalPdfTextExtractor(cache_dir=str(tmp_path)),
+    )
+
+    assert use_case.execute(document_id=1, company_id=1, name='C', pdf_url='https://e.com/c.pdf') == 'notified'
+    assert sent['text'].startswith('CONTRATO DE PRESTACION DE SERVICIOS')
+
+
+def test_timeout_kills_the_busy_worker_and_recycles_the_pool(tmp_path):
+    pool = pdf_text_extractor_local._get_pool()
+    stuck = pool.submit(time.sleep, 60)
+    time.sleep(0.5)
+    processes = list(pool._processes.values())
+
+    pdf_text_extractor_local._recycle_pool(pool)
+
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+    assert stuck.done()
+    fresh = pdf_text_extractor_local._get_pool()
+    assert fresh is not pool
+    assert LocalPdfTextExtractor(cache_dir=str(tmp_path)).extract(_fixture_pdf()).startswith('CONTRATO')
+
+
+def test_text_cache_evicts_expired_then_least_recently_used(tmp_path):
+    now = time.time()
+    for name, age in (('old', 100), ('a', 30), ('b', 20), ('c', 10)):
+        path = tmp_path / name[:2] / f'{name}.txt'
+        path.parent.mkdir(exist_ok=True)
+        path.write_text('x' * 10)
+        os.utime(path, (now - age, now - age))
+
+    assert evict_text_cache(str(tmp_path), max_bytes=20, ttl_seconds=50) == 2
+
+    remaining = sorted(p.name for p in tmp_path.rglob('*.txt'))
+    assert remaining == ['b.txt', 'c.txt']
@@ -0,0 +1,169 @@
+import json
+from contextlib import contextmanager
+
+import pytest
+from django.core.management import call_command
+
+from modules.analysis.application.dtos import AnalysisResultDTO, FetchedPdfDTO
+from modules.analysis.application.use_cases.analyze_document import AnalyzeDocumentUseCase
+from modules.analysis.domain import risk_prescreen
+from modules.analysis.domain.risk_prescreen import RiskPrescreenEngine, RiskRule
+from modules.analysis.infrastructure.django_app.models import DocumentAnalysis
+from modules.analysis.infrastructure.repositories.analysis_repository_django import DjangoAnalysisRepository
+from modules.automation.infrastructure.django_app.models import OutboxEvent
+from modules.automation.infrastructure.worker import make_analysis_handler
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+
+
+RISKY = 'El proveedor pagará una PENALIZACIÓN por retraso y asume responsabilidad   ilimitada.'
+BOILERPLATE = 'Acuerdo de confidencialidad estándar entre las partes.'
+
+
+class FakeFetcher:
+    @contextmanager
+    def fetch(self, pdf_url):
+        yield FetchedPdfDTO(path=pdf_url, content_hash=pdf_url.rsplit('/', 1)[-1], size=1)
+
+
+class FakeExtractor:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def extract(self, pdf):
+        return self.texts[pdf.content_hash]
+
+
+class FakeNotifier:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def notify_document_created(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+def _use_case(notifier, policy):
+    return AnalyzeDocumentUseCase(
+        notifier=notifier,
+        analysis_commands=DjangoAnalysisRepository(),
+        pdf_fetcher=FakeFetcher(),
+        text_extractor=FakeExtractor({'risky': RISKY, 'plain': BOILERPLATE}),
+        prescreen=RiskPrescreenEngine(),
+        prescreen_policy=policy,
+        prescreen_threshold=0.2,
+    )
+
+
+def _analyze(use_case, doc):
+    return use_case.execute(document_id=doc.id, company_id=doc.company_id, name=doc.name, pdf_url=doc.pdf_url)
+
+
+def test_engine_combines_fired_rules_as_noisy_or():
+    engine = RiskPrescreenEngine()
+
+    risk, labels = engine.score(RISKY)
+
+    # 1 - (1 - 0.35) * (1 - 0.45)
+    assert risk == 0.6425
+    assert labels == ['penalizacion', 'responsabilidad_ilimitada']
+    assert engine.score(BOILERPLATE) == (0.0, [])
+
+
+def test_terms_match_whole_words_and_longest_first():
+    engine = RiskPrescreenEngine([
+        RiskRule('penal', 0.5, ('clausula penal',)),
+        RiskRule('clausula', 0.1, ('clausula',)),
+    ])
+
+    assert engine.score('Incluye una cláusula penal.') == (0.5, ['penal'])
+    assert engine.score('Multas varias') == (0.0, [])
+    assert engine.term_matrix(['clausula, clausula penal y clausula']) == [[2, 1]]
+
+
+def test_batch_scoring_matches_single_scoring_with_and_without_numpy(monkeypatch):
+    engine = RiskPrescreenEngine()
+    texts = [RISKY, BOILERPLATE, 'Renovación automática y exclusividad.'] * 50
+    expected = [engine.score(t) for t in texts]
+
+    assert engine.score_many(texts) == expected
+    monkeypatch.setattr(risk_prescreen, 'np', None)
+    assert engine.score_many(texts) == expected
+
+
+@pytest.mark.django_db
+def test_skip_policy_keeps_provisional_analysis_for_low_risk_documents():
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    plain = Document.objects.create(company_id=acme.id, name='NDA', pdf_url='https://x.com/plain')
+    risky = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://x.com/risky')
+    notifier = FakeNotifier()
+
+    assert _analyze(_use_case(notifier, 'skip'), plain) == 'prescreened'
+    assert _analyze(_use_case(notifier, 'skip'), risky) == 'notified'
+
+    assert [c['document_id'] for c in notifier.calls] == [risky.id]
+    provisional = DocumentAnalysis.objects.get(document_id=risky.id)
+    assert (provisional.status, provisional.risk_score) == ('prescreened', 0.6425)
+    assert provisional.labels == ['penalizacion', 'responsabilidad_ilimitada']
+    assert provisional.model_info == {'engine': 'prescreen'}
+
+
+@pytest.mark.django_db
+def test_deprioritise_policy_sends_low_priority_to_n8n():
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    plain = Document.objects.create(company_id=acme.id, name='NDA', pdf_url='https://x.com/plain')
+    risky = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://x.com/risky')
+    notifier = FakeNotifier()
+
+    _analyze(_use_case(notifier, 'deprioritise'), plain)
+    _analyze(_use_case(notifier, 'deprioritise'), risky)
+
+    assert [c['priority'] for c in notifier.calls] == ['low', None]
+
+
+@pytest.mark.django_db
+def test_provisional_results_never_overwrite_a_real_analysis():
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = Document.objects.create(company_id=acme.id, name='C', pdf_url='https://x.com/risky')
+    DjangoAnalysisRepository().upsert(
+        AnalysisResultDTO(document_id=doc.id, summary='Real', labels=['ok'], entities=[], risk_score=0.9),
+    )
+
+    assert _analyze(_use_case(FakeNotifier(), 'skip'), doc) == 'notified'
+
+    real = DocumentAnalysis.objects.get(document_id=doc.id)
+    assert (real.summary, real.risk_score, real.status) == ('Real', 0.9, None)
+
+
+@pytest.mark.django_db
+def test_prescreen_command_scores_cached_texts_in_batches(tmp_path, settings):
+    settings.ANALYSIS_TEXT_CACHE_DIR = str(tmp_path)
+    acme = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    for i, text in enumerate([RISKY, BOILERPLATE, None]):
+        content_hash = f'{i:02d}' + 'a' * 62
+        Document.objects.create(company_id=acme.id, name='C', pdf_url='https://x.com/a.pdf', content_hash=content_hash)
+        if text is not None:
+            (tmp_path / content_hash[:2]).mkdir()
+            (tmp_path / content_hash[:2] / f'{content_hash}.txt').write_text(text, encoding='utf-8')
+
+    call_command('prescreen_documents', batch_size=2)
+
+    scores = sorted(DocumentAnalysis.objects.values_list('risk_score', flat=True))
+    assert scores == [0.0, 0.6425]
+
+
+@pytest.mark.django_db
+def test_skip_policy_does_not_drop_a_reanalysis_requested_through_the_api(client, auth_headers, auth_company_id):
+    doc = Document.objects.create(company_id=auth_company_id, name='NDA', pdf_url='https://x.com/plain')
+    DjangoAnalysisRepository().upsert(
+        AnalysisResultDTO(document_id=doc.id, summary='Anterior', labels=[], entities=[], risk_score=0.0),
+    )
+    resp = client.post(f'/api/documents/{doc.id}/analyze/', **auth_headers)
+    assert resp.status_code == 202
+    notifier = FakeNotifier()
+
+    event = OutboxEvent.objects.get()
+    handler = make_analysis_handler(_use_case(notifier, 'skip'))
+    handler(json.dumps(event.payload).encode('utf-8'))
+
+    assert [c['document_id'] for c in notifier.calls] == [doc.id]
+    assert DocumentAnalysis.objects.get(document_id=doc.id).status == 'running'
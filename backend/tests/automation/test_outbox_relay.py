@@ -0,0 +1,116 @@
+import json
+import pytest
+
+from modules.automation.application.dtos import DocumentCreatedEvent, PublishResult
+from modules.automation.infrastructure.django_app.models import OutboxEvent
+from modules.automation.infrastructure.outbox_relay import relay_outbox_batch
+
+
+class RecordingPublisher:
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.events: list[DocumentCreatedEvent] = []
+        self.fail_after = fail_after
+
+    def publish_document_created(self, event: DocumentCreatedEvent) -> None:
+        if self.fail_after is not None and len(self.events) >= self.fail_after:
+            raise ConnectionError('broker down')
+        self.events.append(event)
+
+    def publish_many(self, events) -> list[PublishResult]:
+        results = []
+        for e in events:
+            try:
+                self.publish_document_created(e)
+                results.append(PublishResult(event=e, ok=True))
+            except ConnectionError as exc:
+                results.append(PublishResult(event=e, ok=False, error=str(exc)))
+        return results
+
+
+def _create_document(client, auth_headers, auth_company_id, name: str) -> dict:
+    return client.post(
+        "/api/documents/",
+        data=json.dumps({"company_id": auth_company_id, "name": name, "pdf_url": "https://e.com/a.pdf"}),
+        content_type="application/json",
+        **auth_headers,
+    ).json()
+
+
+@pytest.mark.django_db
+def test_create_document_writes_outbox_row(client, auth_headers, auth_company_id):
+    doc = _create_document(client, auth_headers, auth_company_id, "Contrato")
+
+    row = OutboxEvent.objects.get()  # type: ignore[attr-defined]
+    assert row.status == OutboxEvent.STATUS_PENDING
+    assert row.payload["document_id"] == doc["id"]
+    assert row.payload["company_id"] == auth_company_id
+
+
+@pytest.mark.django_db
+def test_relay_publishes_pending_rows_and_marks_sent(client, auth_headers, auth_company_id):
+    for i in range(3):
+        _create_document(client, auth_headers, auth_company_id, f"Doc {i}")
+
+    publisher = RecordingPublisher()
+    assert relay_outbox_batch(publisher, batch_size=2) == 2
+    assert relay_outbox_batch(publisher, batch_size=2) == 1
+    assert relay_outbox_batch(publisher, batch_size=2) == 0
+
+    assert [e.name for e in publisher.events] == ["Doc 0", "Doc 1", "Doc 2"]
+    assert not OutboxEvent.objects.filter(status=OutboxEvent.STATUS_PENDING).exists()  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db
+def test_relay_keeps_rows_pending_when_publish_fails(client, auth_headers, auth_company_id):
+    for i in range(2):
+        _create_document(client, auth_headers, auth_company_id, f"Doc {i}")
+
+    assert relay_outbox_batch(RecordingPublisher(fail_after=1), batch_size=10) == 1
+
+    pending = OutboxEvent.objects.get(status=OutboxEvent.STATUS_PENDING)  # type: ignore[attr-defined]
+    assert pending.attempts == 1
+    assert "broker down" in pending.last_error
+
+
+@pytest.mark.django_db
+def test_unconvertible_rows_are_marked_failed_without_blocking_the_queue(client, auth_headers, auth_company_id):
+    bad_type = OutboxEvent.objects.create(event_type='unknown', payload={})  # type: ignore[attr-defined]
+    bad_payload = OutboxEvent.objects.create(event_type='document_created', payload={'foo': 1})  # type: ignore[attr-defined]
+    _create_document(client, auth_headers, auth_company_id, "Contrato")
+
+    publisher = RecordingPublisher()
+    assert relay_outbox_batch(publisher, batch_size=10) == 1
+
+    assert [e.name for e in publisher.events] == ["Contrato"]
+    for row in (bad_type, bad_payload):
+        row.refresh_from_db()
+        assert row.status == OutboxEvent.STATUS_FAILED
+        assert row.last_error
+    assert relay_outbox_batch(publisher, batch_size=10) == 0
+
+
+@pytest.mark.django_db
+def test_failed_publishes_back_off_and_go_dead_after_max_attempts(client, auth_headers, auth_company_id, settings):
+    settings.OUTBOX_RETRY_BACKOFF_MAX_SECONDS = 0
+    _create_document(client, auth_headers, auth_company_id, "Contrato")
+    publisher = RecordingPublisher(fail_after=0)
+
+    for _ in range(3):
+        assert relay_outbox_batch(publisher, batch_size=10, max_attempts=3) == 0
+
+    row = OutboxEvent.objects.get()  # type: ignore[attr-defined]
+    assert (row.status, row.attempts, row.last_error) == (OutboxEvent.STATUS_DEAD, 3, 'broker down')
+
+
+@pytest.mark.django_db
+def test_failed_publish_is_not_retried_before_its_backoff(client, auth_headers, auth_company_id, settings):
+    settings.OUTBOX_RELAY_POLL_SECONDS = 60
+    _create_document(client, auth_headers, auth_company_id, "Contrato")
+    publisher = RecordingPublisher(fail_after=0)
+
+    relay_outbox_batch(publisher, batch_size=10)
+    publisher.fail_after = None
+
+    assert relay_outbox_batch(publisher, batch_size=10) == 0
+    OutboxEvent.objects.update(next_attempt_at=None)  # type: ignore[attr-defined]
+    assert relay_outbox_batch(publisher, batch_size=10) == 1
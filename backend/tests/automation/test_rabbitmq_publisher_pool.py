@@ -0,0 +1,143 @@
+import json
+from types import SimpleNamespace
+
+import pika
+import pytest
+
+from modules.automation.application.dtos import DocumentCreatedEvent
+from modules.automation.infrastructure.adapters.amqp_connection import AmqpConnectionManager
+from modules.automation.infrastructure.adapters.rabbitmq_publisher import RabbitMqEventPublisher
+
+
+class FakeChannelImpl:
+    """Emula el canal asíncrono subyacente (modo confirms) de pika."""
+
+    def __init__(self, channel: "FakeChannel") -> None:
+        self.channel = channel
+        self.on_confirm = None
+        self.seq = 0
+
+    def confirm_delivery(self, ack_nack_callback, callback) -> None:
+        self.on_confirm = ack_nack_callback
+        self.channel.connection.pending_callbacks.append(lambda: callback(None))
+
+    def basic_publish(self, exchange: str, routing_key: str, body: bytes, properties=None) -> None:
+        self.seq += 1
+        tag = self.seq
+        self.channel.published.append(json.loads(body))
+        method_cls = pika.spec.Basic.Nack if tag in self.channel.connection.nack_tags else pika.spec.Basic.Ack
+        frame = SimpleNamespace(method=method_cls(delivery_tag=tag, multiple=False))
+        self.channel.connection.pending_callbacks.append(lambda: self.on_confirm(frame))
+
+
+class FakeChannel:
+    def __init__(self, connection: "FakeConnection") -> None:
+        self.connection = connection
+        self.is_open = True
+        self.declared: list[str] = []
+        self.published: list[dict] = []
+        self._impl = FakeChannelImpl(self)
+
+    def queue_declare(self, queue: str, durable: bool = False) -> None:
+        self.declared.append(queue)
+
+    def basic_publish(self, exchange: str, routing_key: str, body: bytes, properties=None) -> None:
+        if not self.connection.is_open:
+            raise pika.exceptions.StreamLostError('lost')
+        self.published.append(json.loads(body))
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.is_open = True
+        self.channels: list[FakeChannel] = []
+        self.pending_callbacks: list = []
+        self.nack_tags: set[int] = set()
+
+    def channel(self) -> FakeChannel:
+        ch = FakeChannel(self)
+        self.channels.append(ch)
+        return ch
+
+    def process_data_events(self, time_limit=None) -> None:
+        if not self.is_open:
+            raise pika.exceptions.StreamLostError('heartbeat missed')
+        callbacks, self.pending_callbacks = self.pending_callbacks, []
+        for cb in callbacks:
+            cb()
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+@pytest.fixture()
+def connections():
+    return []
+
+
+@pytest.fixture()
+def manager(connections):
+    def factory(url: str) -> FakeConnection:
+        conn = FakeConnection()
+        connections.append(conn)
+        return conn
+    return AmqpConnectionManager('amqp://test', connection_factory=factory)
+
+
+def _event(i: int) -> DocumentCreatedEvent:
+    return DocumentCreatedEvent(document_id=i, company_id=1, name=f'Doc {i}', pdf_url='http://e.com/a.pdf')
+
+
+def test_publisher_reuses_connection_and_declares_queue_once(manager, connections):
+    publisher = RabbitMqEventPublisher(url='amqp://test', queue='q', connection=manager)
+
+    for i in range(3):
+        publisher.publish_document_created(_event(i))
+
+    assert len(connections) == 1
+    channel = connections[0].channels[0]
+    assert channel.declared == ['q']
+    assert [m['document_id'] for m in channel.published] == [0, 1, 2]
+    assert manager.stats() == {'connections_opened': 1, 'connection_reuses': 2, 'reconnects': 0}
+
+
+def test_publisher_reconnects_after_connection_loss(manager, connections):
+    publisher = RabbitMqEventPublisher(url='amqp://test', queue='q', connection=manager)
+    publisher.publish_document_created(_event(1))
+
+    # Simular reinicio del broker
+    connections[0].is_open = False
+    publisher.publish_document_created(_event(2))
+
+    assert len(connections) == 2
+    channel = connections[1].channels[0]
+    assert channel.declared == ['q']
+    assert [m['document_id'] for m in channel.published] == [2]
+    assert manager.reconnects == 1
+
+
+def test_publish_many_uses_confirms_in_windows(manager, connections):
+    publisher = RabbitMqEventPublisher(url='amqp://test', queue='q', connection=manager, confirm_window=2)
+
+    results = publisher.publish_many([_event(i) for i in range(5)])
+
+    assert [r.ok for r in results] == [True] * 5
+    assert [r.event.document_id for r in results] == [0, 1, 2, 3, 4]
+    # Un canal normal + un canal dedicado en modo confirms sobre la misma conexión
+    assert len(connections) == 1
+    confirm_channel = connections[0].channels[1]
+    assert [m['document_id'] for m in confirm_channel.published] == [0, 1, 2, 3, 4]
+
+
+def test_publish_many_reports_nacked_events(manager, connections):
+    publisher = RabbitMqEventPublisher(url='amqp://test', queue='q', connection=manager)
+    publisher.publish_many([_event(0)])
+    connections[0].nack_tags = {3}
+
+    results = publisher.publish_many([_event(i) for i in range(1, 4)])
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error
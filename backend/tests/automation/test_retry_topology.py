@@ -0,0 +1,135 @@
+import json
+from types import SimpleNamespace
+
+import pika
+
+from modules.automation.infrastructure.dlq import inspect_dlq, redrive_dlq
+from modules.automation.infrastructure.retry_topology import RETRY_COUNT_HEADER, RetryTopology
+from modules.automation.infrastructure.worker import MessageDispatcher
+
+
+class FakeBroker:
+    """Canal en memoria: colas como listas, get/ack/nack por delivery tag."""
+
+    def __init__(self) -> None:
+        self.queues: dict[str, list] = {}
+        self.arguments: dict[str, dict] = {}
+        self.unacked: dict[int, tuple] = {}
+        self.acked: list[int] = []
+        self.nacked: list[tuple] = []
+        self.seq = 0
+        self.confirms = False
+
+    def queue_declare(self, queue: str, durable: bool = False, arguments=None, passive: bool = False):
+        self.queues.setdefault(queue, [])
+        if arguments:
+            self.arguments[queue] = arguments
+        return SimpleNamespace(method=SimpleNamespace(message_count=len(self.queues[queue])))
+
+    def basic_publish(self, exchange: str, routing_key: str, body: bytes, properties=None) -> None:
+        self.queues.setdefault(routing_key, []).append((properties, body))
+
+    def basic_get(self, queue: str, auto_ack: bool = False):
+        if not self.queues.get(queue):
+            return None, None, None
+        properties, body = self.queues[queue].pop(0)
+        self.seq += 1
+        self.unacked[self.seq] = (queue, properties, body)
+        return SimpleNamespace(delivery_tag=self.seq), properties, body
+
+    def basic_ack(self, delivery_tag: int) -> None:
+        self.acked.append(delivery_tag)
+        self.unacked.pop(delivery_tag, None)
+
+    def basic_nack(self, delivery_tag: int, multiple: bool = False, requeue: bool = False) -> None:
+        self.nacked.append((delivery_tag, requeue))
+        tags = sorted(t for t in self.unacked if t <= delivery_tag) if multiple else [delivery_tag]
+        returned = [self.unacked.pop(t) for t in tags if t in self.unacked]
+        if requeue:
+            for queue, properties, body in reversed(returned):
+                self.queues[queue].insert(0, (properties, body))
+
+    def confirm_delivery(self) -> None:
+        self.confirms = True
+
+
+def _props(retry_count=None):
+    headers = {RETRY_COUNT_HEADER: retry_count} if retry_count is not None else None
+    return pika.BasicProperties(headers=headers)
+
+
+def test_declare_creates_ttl_retry_tiers_pointing_back_to_main_queue():
+    broker = FakeBroker()
+    RetryTopology('jobs', retry_delays_seconds=[1, 4]).declare(broker)
+
+    assert set(broker.queues) == {'jobs', 'jobs.retry.0', 'jobs.retry.1', 'jobs.dlq'}
+    assert broker.arguments['jobs.retry.1'] == {
+        'x-message-ttl': 4000,
+        'x-dead-letter-exchange': '',
+        'x-dead-letter-routing-key': 'jobs',
+    }
+
+
+def test_route_failure_escalates_tiers_then_dead_letters():
+    broker = FakeBroker()
+    topology = RetryTopology('jobs', retry_delays_seconds=[1, 4])
+
+    assert topology.route_failure(broker, _props(), b'x', 'boom') == 'retry'
+    props, _ = broker.queues['jobs.retry.0'][0]
+    assert props.headers[RETRY_COUNT_HEADER] == 1
+    assert topology.route_failure(broker, props, b'x', 'boom') == 'retry'
+    props, _ = broker.queues['jobs.retry.1'][0]
+    assert topology.route_failure(broker, props, b'x', 'still down') == 'dead_letter'
+    props, body = broker.queues['jobs.dlq'][0]
+    assert props.headers[RETRY_COUNT_HEADER] == 3
+    assert props.headers['x-last-error'] == 'still down'
+
+
+def test_dispatcher_routes_failures_and_acks_original():
+    broker = FakeBroker()
+    topology = RetryTopology('jobs', retry_delays_seconds=[1])
+
+    def handler(body: bytes) -> None:
+        raise RuntimeError('n8n 503')
+
+    dispatcher = MessageDispatcher(None, handler, concurrency=1, on_failure=topology.route_failure)
+    dispatcher.on_message(broker, SimpleNamespace(delivery_tag=5), _props(), b'{}')
+
+    assert broker.acked == [5]
+    assert len(broker.queues['jobs.retry.0']) == 1
+
+
+def test_dispatcher_requeues_when_failure_routing_fails():
+    broker = FakeBroker()
+
+    def router(ch, properties, body, error):
+        raise pika.exceptions.ChannelClosed(406, 'PRECONDITION_FAILED')
+
+    dispatcher = MessageDispatcher(None, lambda body: 1 / 0, concurrency=1, on_failure=router)
+    dispatcher.on_message(broker, SimpleNamespace(delivery_tag=9), _props(), b'{}')
+
+    assert broker.acked == []
+    assert broker.nacked == [(9, True)]
+
+
+def test_inspect_leaves_messages_and_redrive_resets_retry_count():
+    broker = FakeBroker()
+    topology = RetryTopology('jobs', retry_delays_seconds=[1])
+    topology.declare(broker)
+    for i in range(3):
+        broker.basic_publish('', 'jobs.dlq', json.dumps({'document_id': i}).encode(), _props(2))
+
+    depth, samples = inspect_dlq(broker, topology, limit=2)
+    assert depth == 3
+    assert [json.loads(s.body)['document_id'] for s in samples] == [0, 1]
+    assert len(broker.queues['jobs.dlq']) == 3
+
+    sleeps: list[float] = []
+    moved = redrive_dlq(broker, topology, limit=2, rate_per_second=4, sleep=sleeps.append)
+
+    assert moved == 2
+    assert broker.confirms
+    assert sleeps == [0.25, 0.25]
+    assert [json.loads(b)['document_id'] for _, b in broker.queues['jobs']] == [0, 1]
+    assert all(p.headers[RETRY_COUNT_HEADER] == 0 for p, _ in broker.queues['jobs'])
+    assert len(broker.queues['jobs.dlq']) == 1
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.automation.infrastructure.django_app.models import ProcessedWebhook
+from modules.automation.infrastructure.webhook_dedup import WebhookDedupStore, get_webhook_dedup_store, webhook_key
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.infrastructure.django_app.models import Document
+from modules.shared.infrastructure.metrics import metrics
+
+
+def test_key_prefers_event_id_and_ignores_key_order():
+    assert webhook_key('zapsign', {'a': 1, 'b': 2}) == webhook_key('zapsign', {'b': 2, 'a': 1})
+    assert webhook_key('zapsign', {'a': 1}) != webhook_key('analysis', {'a': 1})
+    assert webhook_key('analysis', {'a': 1}, 'evt-1') == webhook_key('analysis', {'a': 2}, 'evt-1')
+
+
+@pytest.mark.django_db
+def test_store_answers_from_memory_then_db_and_honours_ttl():
+    store = WebhookDedupStore(ttl_seconds=60, max_entries=1)
+    store.remember('zapsign', 'k1')
+    store.remember('zapsign', 'k2')  # expulsa k1 de la LRU
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert store.seen('zapsign', 'k2')
+    assert len(ctx.captured_queries) == 0
+    assert store.seen('zapsign', 'k1')
+    assert not store.seen('zapsign', 'k3')
+
+    expired = WebhookDedupStore(ttl_seconds=-1, max_entries=10)
+    expired.remember('zapsign', 'old')
+    assert not expired.seen('zapsign', 'old')
+    assert expired.purge_expired() == 1
+    assert set(ProcessedWebhook.objects.values_list('key', flat=True)) == {'k1', 'k2'}
+
+
+@pytest.mark.django_db
+def test_zapsign_retry_is_rejected_before_touching_documents(client):
+    metrics.reset()
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/a.pdf', status='sent', open_id='oid')
+    body = json.dumps({'open_id': 'oid', 'status': 'signed'})
+
+    assert client.post('/api/webhooks/zapsign/', data=body, content_type='application/json').status_code == 200
+    get_webhook_dedup_store().clear_memory()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post('/api/webhooks/zapsign/', data=body, content_type='application/json')
+    assert resp.status_code == 200
+    assert [q['sql'] for q in ctx.captured_queries if '"document"' in q['sql']] == []
+    resp = client.post('/api/webhooks/zapsign/', data=body, content_type='application/json')
+
+    assert resp.status_code == 200
+    assert metrics.counter_value('webhook_dedup_total', source='zapsign', outcome='miss') == 1
+    assert metrics.counter_value('webhook_dedup_total', source='zapsign', outcome='hit_db') == 1
+    assert metrics.counter_value('webhook_dedup_total', source='zapsign', outcome='hit_memory') == 1
+
+
+@pytest.mark.django_db
+def test_unknown_document_is_not_remembered(client):
+    body = json.dumps({'open_id': 'later', 'status': 'signed'})
+
+    assert client.post('/api/webhooks/zapsign/', data=body, content_type='application/json').status_code == 204
+    assert not ProcessedWebhook.objects.exists()
@@ -0,0 +1,77 @@
+import json
+import queue
+import threading
+from types import SimpleNamespace
+
+from modules.automation.infrastructure.worker import MessageDispatcher
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.callbacks: queue.Queue = queue.Queue()
+
+    def add_callback_threadsafe(self, cb) -> None:
+        self.callbacks.put(cb)
+
+    def drain(self, expected: int, timeout: float = 5.0) -> None:
+        for _ in range(expected):
+            self.callbacks.get(timeout=timeout)()
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.acked: list[int] = []
+        self.nacked: list[int] = []
+        self.threads: set[str] = set()
+
+    def basic_ack(self, delivery_tag: int) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.acked.append(delivery_tag)
+
+    def basic_nack(self, delivery_tag: int, requeue: bool = False) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.nacked.append(delivery_tag)
+
+
+def _body(i: int) -> bytes:
+    return json.dumps({'document_id': i}).encode()
+
+
+def test_dispatcher_runs_messages_concurrently_and_acks_on_connection_thread():
+    concurrency = 4
+    barrier = threading.Barrier(concurrency, timeout=5)
+
+    def handler(body: bytes) -> None:
+        # Solo avanza si los 4 mensajes están en vuelo a la vez
+        barrier.wait()
+        if json.loads(body)['document_id'] == 2:
+            raise RuntimeError('n8n down')
+
+    connection = FakeConnection()
+    channel = FakeChannel()
+    dispatcher = MessageDispatcher(connection, handler, concurrency=concurrency)
+
+    for i in range(1, concurrency + 1):
+        dispatcher.on_message(channel, SimpleNamespace(delivery_tag=i), None, _body(i))
+    assert dispatcher.in_flight == concurrency
+
+    connection.drain(concurrency)
+    dispatcher.shutdown()
+
+    assert sorted(channel.acked) == [1, 3, 4]
+    assert channel.nacked == [2]
+    assert channel.threads == {threading.current_thread().name}
+    assert dispatcher.in_flight == 0
+
+
+def test_dispatcher_with_concurrency_one_processes_inline():
+    seen: list[int] = []
+    connection = FakeConnection()
+    channel = FakeChannel()
+    dispatcher = MessageDispatcher(connection, lambda body: seen.append(json.loads(body)['document_id']), concurrency=1)
+
+    dispatcher.on_message(channel, SimpleNamespace(delivery_tag=7), None, _body(7))
+
+    assert seen == [7]
+    assert channel.acked == [7]
+    assert connection.callbacks.empty()
@@ -0,0 +1,78 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+from modules.automation.infrastructure.supervisor import WorkerSupervisor
+
+
+def _wait_until(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def crashing_target(index, heartbeat):
+    os._exit(1)
+
+
+def draining_target(index, heartbeat):
+    stop = {'flag': False}
+
+    def _on_term(signum, frame):
+        stop['flag'] = True
+    signal.signal(signal.SIGTERM, _on_term)
+    while not stop['flag']:
+        heartbeat()
+        time.sleep(0.05)
+    # "drenaje": terminar en limpio
+    sys.exit(0)
+
+
+def _run_in_background(supervisor: WorkerSupervisor) -> threading.Thread:
+    t = threading.Thread(target=supervisor.run, daemon=True)
+    t.start()
+    return t
+
+
+def test_supervisor_restarts_crashed_children_with_backoff():
+    supervisor = WorkerSupervisor(
+        processes=2,
+        target=crashing_target,
+        backoff_initial_seconds=0.05,
+        backoff_max_seconds=0.2,
+        poll_seconds=0.02,
+        drain_seconds=2,
+    )
+    t = _run_in_background(supervisor)
+    try:
+        assert _wait_until(lambda: all(s['restarts'] >= 2 for s in supervisor.status()))
+    finally:
+        supervisor.stop()
+        t.join(timeout=10)
+    assert not t.is_alive()
+
+
+def test_supervisor_reports_liveness_and_drains_on_stop(tmp_path):
+    status_file = tmp_path / 'status.json'
+    supervisor = WorkerSupervisor(
+        processes=2,
+        target=draining_target,
+        poll_seconds=0.02,
+        drain_seconds=5,
+        status_file=str(status_file),
+    )
+    t = _run_in_background(supervisor)
+    assert _wait_until(lambda: all(s['alive'] for s in supervisor.status()))
+    assert status_file.exists()
+
+    supervisor.stop()
+    t.join(timeout=10)
+
+    assert not t.is_alive()
+    assert all(not s['alive'] for s in supervisor.status())
+    assert [s['restarts'] for s in supervisor.status()] == [0, 0]
@@ -1,6 +1,25 @@
 import json
 import pytest
 
+from modules.automation.infrastructure.webhook_dedup import reset_webhook_dedup_store
+from modules.shared.infrastructure.resilience import reset_upstream_guards
+
+
+@pytest.fixture(autouse=True)
+def _fresh_upstream_guards():
+    # Los breakers son globales por proceso: cada test empieza con el circuito cerrado
+    reset_upstream_guards()
+    yield
+    reset_upstream_guards()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_webhook_dedup_store():
+    # La LRU de webhooks es global por proceso y sobreviviría al rollback de la BD
+    reset_webhook_dedup_store()
+    yield
+    reset_webhook_dedup_store()
+
 
 @pytest.fixture()
 def auth_headers(client):
@@ -0,0 +1,206 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import BackfillProgressDTO, ZapSignDocumentDTO, ZapSignPageDTO
+from modules.document.application.use_cases.backfill_zapsign_documents import BackfillZapSignDocumentsUseCase
+from modules.document.infrastructure import backfill_runner
+from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
+from modules.document.infrastructure.adapters.zapsign_rate_limiter import DbTokenBucketLimiter
+from modules.document.infrastructure.django_app.models import Document
+from modules.document.infrastructure.repositories.backfill_checkpoint_repository_django import DjangoBackfillCheckpointRepository
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.api import views
+
+
+class FakeZapSignListing:
+    """Cuenta de ZapSign con `total` documentos en páginas de `page_size`."""
+
+    def __init__(self, total: int, page_size: int = 3) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.fail_pages: set[int] = set()
+        # Elementos sin open_id: el cliente HTTP los descarta de `results`
+        self.without_open_id: set[int] = set()
+        self.requested: list[int] = []
+        self._lock = threading.Lock()
+
+    def list_documents(self, api_token, page):
+        with self._lock:
+            self.requested.append(page)
+        if page in self.fail_pages:
+            raise RuntimeError(f'page {page} failed')
+        start = (page - 1) * self.page_size
+        if start >= self.total:
+            return ZapSignPageDTO(count=0, results=[], has_next=False)
+        ids = range(start, min(start + self.page_size, self.total))
+        results = [
+            ZapSignDocumentDTO(open_id=f'zs-{i}', token=f'tok-{i}', name=f'Doc {i}', status='signed',
+                               pdf_url=f'https://e.com/{i}.pdf')
+            for i in ids if i not in self.without_open_id
+        ]
+        return ZapSignPageDTO(
+            count=self.total, results=results, has_next=start + self.page_size < self.total, page_size=len(ids),
+        )
+
+
+def _use_case(zap, concurrency=2):
+    return BackfillZapSignDocumentsUseCase(
+        company_queries=DjangoCompanyRepository(),
+        document_commands=DjangoDocumentRepository(),
+        zap_sign_client=zap,
+        checkpoints=DjangoBackfillCheckpointRepository(),
+        concurrency=concurrency,
+    )
+
+
+@pytest.mark.django_db
+def test_backfill_imports_all_pages_and_skips_existing_open_ids():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    Document.objects.create(company_id=company.id, name='Ours', pdf_url='https://e.com/x.pdf', status='sent', open_id='zs-4')
+    zap = FakeZapSignListing(total=10)
+
+    progress = _use_case(zap).execute(company.id)
+
+    assert (progress.status, progress.total_pages, progress.imported, progress.skipped) == ('completed', 4, 9, 1)
+    assert sorted(zap.requested) == [1, 2, 3, 4]
+    assert Document.objects.filter(company_id=company.id).count() == 10
+    # El documento propio no se sobrescribe
+    assert Document.objects.get(open_id='zs-4').status == 'sent'
+
+
+@pytest.mark.django_db
+def test_backfill_resumes_from_checkpoint_after_failure():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    zap = FakeZapSignListing(total=12)
+    zap.fail_pages = {4}
+
+    failed = _use_case(zap).execute(company.id)
+    assert failed.status == 'failed'
+    assert failed.next_page == 4
+    assert Document.objects.count() == 9
+
+    zap.fail_pages = set()
+    zap.requested = []
+    done = _use_case(zap).execute(company.id)
+
+    assert done.status == 'completed'
+    assert zap.requested == [4]
+    assert done.imported == 12
+    assert Document.objects.count() == 12
+
+
+@pytest.mark.django_db
+def test_backfill_pages_by_raw_page_size_and_stops_at_the_last_page():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    zap = FakeZapSignListing(total=10)
+    zap.without_open_id = {0, 1}
+
+    progress = _use_case(zap, concurrency=3).execute(company.id)
+
+    assert (progress.status, progress.total_pages, progress.imported) == ('completed', 4, 8)
+    assert sorted(zap.requested) == [1, 2, 3, 4]
+
+
+@pytest.mark.django_db
+def test_backfill_ends_at_an_out_of_range_page_and_follows_extra_pages():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    # La cuenta del listado no cuadra con las páginas reales, en ambos sentidos
+    short = FakeZapSignListing(total=4)
+    short.list_documents = _with_count(short.list_documents, 30)
+    long = FakeZapSignListing(total=10)
+    long.list_documents = _with_count(long.list_documents, 4)
+
+    assert _use_case(short).execute(company.id).status == 'completed'
+    assert max(short.requested) <= 4
+
+    progress = _use_case(long, concurrency=1).execute(company.id, restart=True)
+    # Los 4 primeros ya se importaron en la ejecución anterior
+    assert (progress.status, progress.total_pages, progress.imported, progress.skipped) == ('completed', 4, 6, 4)
+
+
+def _with_count(list_documents, count):
+    def _list(api_token, page):
+        result = list_documents(api_token, page)
+        result.count = count
+        return result
+    return _list
+
+
+def test_http_listing_treats_out_of_range_pages_as_the_end(zapsign_listing):
+    client = HttpZapSignClient(base_url=zapsign_listing, rate_limiter=DbTokenBucketLimiter(rate_per_second=0))
+
+    first = client.list_documents('tok', 1)
+    past_end = client.list_documents('tok', 2)
+
+    assert ([d.open_id for d in first.results], first.page_size, first.has_next) == (['zs-1'], 2, True)
+    assert (past_end.results, past_end.has_next) == ([], False)
+
+
+@pytest.fixture()
+def zapsign_listing():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # noqa: N802
+            page = parse_qs(urlparse(self.path).query).get('page', ['1'])[0]
+            if page == '1':
+                status, body = 200, {'count': 9, 'next': '?page=2', 'results': [{'open_id': None}, {'open_id': 'zs-1'}]}
+            else:
+                status, body = 404, {'detail': 'Invalid page.'}
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+@pytest.mark.django_db
+def test_backfill_endpoint_starts_import_and_reports_progress(client, auth_headers, auth_company_id, monkeypatch):
+    zap = FakeZapSignListing(total=4)
+    monkeypatch.setattr(
+        views, 'start_backfill',
+        lambda company_id, restart=False: _use_case(zap).execute(company_id, restart) and True,
+    )
+    assert client.get("/api/documents/backfill/", **auth_headers).status_code == 404
+
+    resp = client.post("/api/documents/backfill/", data={}, content_type="application/json", **auth_headers)
+
+    assert resp.status_code == 202
+    progress = client.get("/api/documents/backfill/", **auth_headers).json()
+    assert progress['status'] == 'completed'
+    assert progress['imported'] == 4
+
+
+@pytest.mark.django_db
+def test_start_backfill_refuses_while_a_run_is_alive():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    DjangoBackfillCheckpointRepository().save(BackfillProgressDTO(company_id=company.id, status='running'))
+
+    assert backfill_runner.start_backfill(company.id) is False
+
+
+@pytest.mark.django_db
+def test_backfill_endpoint_answers_409_while_an_import_is_running(client, auth_headers, auth_company_id):
+    DjangoBackfillCheckpointRepository().save(
+        BackfillProgressDTO(company_id=auth_company_id, status='running', next_page=3, imported=20)
+    )
+
+    resp = client.post("/api/documents/backfill/", data={}, content_type="application/json", **auth_headers)
+
+    assert resp.status_code == 409
+    assert (resp.json()['status'], resp.json()['next_page'], resp.json()['imported']) == ('running', 3, 20)
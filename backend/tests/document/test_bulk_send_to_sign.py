@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+
+import pytest
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.use_cases.bulk_send_to_sign import BulkSendDocumentsToSignUseCase
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
+
+
+class ConcurrentFakeZapSign:
+    def __init__(self, fail_names=()) -> None:
+        self.fail_names = set(fail_names)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    def send_for_sign(self, api_token, name, pdf_url, signers, external_id=None, check_existing=False):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        if name in self.fail_names:
+            raise RuntimeError('ZapSign 500')
+        return ZapSignCreateResult(open_id=f'oid-{name}', token=f'tok-{name}', status='pending')
+
+
+def _use_case(zap, concurrency=4):
+    return BulkSendDocumentsToSignUseCase(
+        document_commands=DjangoDocumentRepository(),
+        document_queries=DjangoDocumentRepository(),
+        company_queries=DjangoCompanyRepository(),
+        signer_queries=DjangoSignerRepository(),
+        zap_sign_client=zap,
+        concurrency=concurrency,
+    )
+
+
+def _setup(count, company_name='Acme'):
+    company = DjangoCompanyRepository().create(name=company_name, api_token='t')
+    docs = DjangoDocumentRepository()
+    signers = DjangoSignerRepository()
+    ids = []
+    for i in range(count):
+        doc = docs.create(company_id=company.id, name=f'doc{i}', pdf_url='https://e.com/a.pdf')
+        signers.create(document_id=doc.id, name='Alice', email='alice@example.com')
+        ids.append(doc.id)
+    return company, ids
+
+
+@pytest.mark.django_db
+def test_bulk_send_caps_concurrency_and_uses_set_based_queries(django_assert_max_num_queries):
+    company, ids = _setup(12)
+    zap = ConcurrentFakeZapSign(fail_names={'doc3'})
+
+    # documentos + empresas + firmantes + claves de idempotencia (3) + in_bulk + bulk_update,
+    # sin importar cuántos documentos
+    with django_assert_max_num_queries(9):
+        results = _use_case(zap, concurrency=4).execute(ids, company_id=company.id)
+
+    assert zap.calls == 12
+    assert 1 < zap.max_active <= 4
+    assert [r.document_id for r in results] == ids
+    by_name = {r.document.name: r for r in results}
+    assert by_name['doc3'].outcome == 'failed'
+    assert 'ZapSign 500' in by_name['doc3'].error
+    assert by_name['doc0'].outcome == 'sent'
+    assert by_name['doc0'].document.open_id == 'oid-doc0'
+    assert DjangoDocumentRepository().get_by_id(ids[5]).status == 'pending'
+    assert DjangoDocumentRepository().get_by_id(ids[3]).status == 'created'
+
+
+@pytest.mark.django_db
+def test_bulk_send_reports_missing_foreign_and_invalid_documents():
+    company, ids = _setup(1)
+    _, other_ids = _setup(1, company_name='Other')
+    no_signers = DjangoDocumentRepository().create(company_id=company.id, name='empty', pdf_url='https://e.com/b.pdf')
+    zap = ConcurrentFakeZapSign()
+
+    results = _use_case(zap).execute([ids[0], ids[0], other_ids[0], no_signers.id, 999999], company_id=company.id)
+
+    assert [(r.document_id, r.outcome) for r in results] == [
+        (ids[0], 'sent'),
+        (other_ids[0], 'not_found'),
+        (no_signers.id, 'invalid'),
+        (999999, 'not_found'),
+    ]
+    assert zap.calls == 1
+
+
+@pytest.mark.django_db
+def test_bulk_send_api(client, auth_headers, auth_company_id, monkeypatch):
+    zap = ConcurrentFakeZapSign()
+    monkeypatch.setattr('modules.document.api.container.HttpZapSignClient', lambda: zap)
+    signers = DjangoSignerRepository()
+    ids = []
+    for i in range(3):
+        doc = client.post(
+            "/api/documents/",
+            data=json.dumps({"company_id": auth_company_id, "name": f"doc{i}", "pdf_url": "https://e.com/a.pdf"}),
+            content_type="application/json",
+            **auth_headers,
+        ).json()
+        signers.create(document_id=doc['id'], name='Alice', email='alice@example.com')
+        ids.append(doc['id'])
+
+    resp = client.post(
+        "/api/documents/bulk_send_to_sign/",
+        data=json.dumps({"document_ids": ids}),
+        content_type="application/json",
+        **auth_headers,
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body['summary'] == {'sent': 3}
+    assert [r['document']['open_id'] for r in body['results']] == ['oid-doc0', 'oid-doc1', 'oid-doc2']
+
+    empty = client.post(
+        "/api/documents/bulk_send_to_sign/",
+        data=json.dumps({"document_ids": []}),
+        content_type="application/json",
+        **auth_headers,
+    )
+    assert empty.status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_send_api_queues_batches_that_do_not_fit_in_the_request(client, auth_headers, auth_company_id, monkeypatch, settings):
+    from modules.document.infrastructure.django_app.models import SendJob
+
+    # 0.2 s × 5/s + ráfaga de 1: caben 2 envíos por petición
+    settings.REQUEST_DEADLINE_SECONDS = 0.2
+    settings.ZAPSIGN_RATE_LIMIT_PER_SECOND = 5.0
+    settings.ZAPSIGN_RATE_LIMIT_BURST = 1.0
+    zap = ConcurrentFakeZapSign()
+    monkeypatch.setattr('modules.document.api.container.HttpZapSignClient', lambda: zap)
+    _, ids = _setup(3, company_name='Other')
+    DjangoDocumentRepository().update_many({i: {'company_id': auth_company_id} for i in ids})
+
+    def post(document_ids, query=''):
+        return client.post(
+            f"/api/documents/bulk_send_to_sign/{query}",
+            data=json.dumps({"document_ids": document_ids}),
+            content_type="application/json",
+            **auth_headers,
+        )
+
+    resp = post(ids + [999999])
+
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body['summary'] == {'queued': 3, 'not_found': 1}
+    job_ids = [r['job']['id'] for r in body['results'][:3]]
+    assert set(SendJob.objects.values_list('document_id', flat=True)) == set(ids)
+    assert zap.calls == 0
+    # Los jobs activos se reutilizan; con ?async=1 también se encola un lote pequeño
+    again = post(ids[:1], query='?async=1')
+    assert again.status_code == 202
+    assert again.json()['results'][0]['job']['id'] == job_ids[0]
+    assert SendJob.objects.count() == 3
+    assert post(ids[:2]).status_code == 200
+    assert zap.calls == 2
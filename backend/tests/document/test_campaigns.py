@@ -0,0 +1,100 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.use_cases.send_document_to_sign import SendDocumentToSignUseCase
+from modules.document.infrastructure.django_app.models import Document, SendJob
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.infrastructure.send_job_runner import run_send_job_batch
+from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
+from modules.signer.infrastructure.django_app.models import Signer
+
+
+def _csv(rows: int, bad_every: int = 0) -> bytes:
+    out = io.StringIO()
+    out.write('signer1_name,signer1_email,signer2_name,signer2_email\n')
+    for i in range(rows):
+        email = 'broken' if bad_every and i % bad_every == 0 else f'emp{i}@acme.com'
+        out.write(f'Emp {i},{email},Manager,boss@acme.com\n')
+    return out.getvalue().encode()
+
+
+@pytest.mark.django_db
+def test_campaign_materialises_documents_signers_and_jobs_in_bulk(client, auth_headers, auth_company_id, settings):
+    settings.CAMPAIGN_BATCH_SIZE = 50
+    upload = SimpleUploadedFile('employees.csv', _csv(120, bad_every=40), content_type='text/csv')
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(
+            '/api/campaigns/',
+            data={'name': 'Contrato 2026', 'pdf_url': 'https://e.com/contrato.pdf', 'signers_file': upload},
+            **auth_headers,
+        )
+
+    assert resp.status_code == 201, resp.content
+    body = resp.json()
+    assert (body['total_rows'], body['invalid_rows'], body['documents_created']) == (120, 3, 117)
+    assert body['status'] == 'dispatched'
+    assert body['pending'] == 117
+    assert [e['row'] for e in body['errors']] == [1, 41, 81]
+    assert Document.objects.filter(campaign_id=body['id']).count() == 117
+    assert Signer.objects.filter(document__campaign_id=body['id']).count() == 234
+    assert SendJob.objects.filter(campaign_id=body['id'], status='queued').count() == 117
+    # Número de consultas independiente del número de filas (3 lotes)
+    assert len(ctx.captured_queries) < 40
+
+
+@pytest.mark.django_db
+def test_campaign_progress_counts_worker_results(client, auth_headers, auth_company_id):
+    resp = client.post(
+        '/api/campaigns/',
+        data=json.dumps({
+            'name': 'NDA',
+            'pdf_url': 'https://e.com/nda.pdf',
+            'signers': [[{'name': 'A', 'email': 'a@acme.com'}], [{'name': 'B', 'email': 'b@acme.com'}]],
+        }),
+        content_type='application/json',
+        **auth_headers,
+    )
+    campaign_id = resp.json()['id']
+
+    class FlakyZapSign:
+        def send_for_sign(self, api_token, name, pdf_url, signers, external_id=None, check_existing=False):
+            ok = signers[0]['email'] == 'a@acme.com'
+            return ZapSignCreateResult(open_id='open-a' if ok else None, token='t' if ok else None, status='pending')
+
+    use_case = SendDocumentToSignUseCase(
+        document_commands=DjangoDocumentRepository(),
+        document_queries=DjangoDocumentRepository(),
+        company_queries=DjangoCompanyRepository(),
+        signer_queries=DjangoSignerRepository(),
+        zap_sign_client=FlakyZapSign(),
+    )
+    run_send_job_batch(batch_size=10, use_case_factory=lambda: use_case)
+
+    progress = client.get(f'/api/campaigns/{campaign_id}/', **auth_headers).json()
+    assert (progress['sent'], progress['failed'], progress['pending']) == (1, 1, 0)
+    assert progress['status'] == 'completed'
+
+
+@pytest.mark.django_db
+def test_campaign_jsonl_upload_reports_malformed_lines(client, auth_headers, auth_company_id):
+    lines = b'[{"name": "A", "email": "a@acme.com"}]\nnot json\n{"signers": [{"name": "B", "email": "b@acme.com"}]}\n'
+    upload = SimpleUploadedFile('rows.jsonl', lines, content_type='application/x-ndjson')
+
+    resp = client.post(
+        '/api/campaigns/',
+        data={'name': 'NDA', 'pdf_url': 'https://e.com/nda.pdf', 'signers_file': upload},
+        **auth_headers,
+    )
+
+    body = resp.json()
+    assert (body['total_rows'], body['invalid_rows'], body['documents_created']) == (3, 1, 2)
+    other = client.get(f"/api/campaigns/{body['id'] + 1}/", **auth_headers)
+    assert other.status_code == 404
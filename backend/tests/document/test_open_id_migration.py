@@ -0,0 +1,25 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+
+@pytest.mark.django_db(transaction=True)
+def test_open_id_unique_migration_clears_duplicates():
+    executor = MigrationExecutor(connection)
+    executor.migrate([('documents', '0006_reconcile')])
+    apps = executor.loader.project_state([('documents', '0006_reconcile')]).apps
+    Company = apps.get_model('companies', 'Company')
+    Document = apps.get_model('documents', 'Document')
+    company = Company.objects.create(name='Acme', api_token='t')
+    first, second, blank, other = (
+        Document.objects.create(company_id=company.id, name=n, pdf_url='https://e.com/a.pdf', open_id=o)
+        for n, o in (('a', 'dup'), ('b', 'dup'), ('c', ''), ('d', 'solo'))
+    )
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    from modules.document.infrastructure.django_app.models import Document as Current
+    assert dict(Current.objects.values_list('id', 'open_id')) == {
+        first.id: 'dup', second.id: None, blank.id: None, other.id: 'solo',
+    }
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.use_cases.reconcile_document_statuses import ReconcileDocumentStatusesUseCase
+from modules.document.infrastructure.django_app.models import Document
+from modules.document.infrastructure.reconciler import reconcile_batch
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+
+
+class FakeZapSign:
+    def __init__(self, remote: dict[str, str]) -> None:
+        self.remote = remote
+        self.polled: list[str] = []
+
+    def get_document(self, api_token, token):
+        self.polled.append(token)
+        if token == 'boom':
+            raise RuntimeError('upstream down')
+        status = self.remote.get(token)
+        return ZapSignCreateResult(open_id=None, token=token, status=status) if status else None
+
+
+def _factory(zap):
+    return lambda: ReconcileDocumentStatusesUseCase(
+        document_commands=DjangoDocumentRepository(),
+        company_queries=DjangoCompanyRepository(),
+        zap_sign_client=zap,
+        concurrency=2,
+    )
+
+
+def _stale(company_id, token, status='sent', minutes=60):
+    doc = Document.objects.create(company_id=company_id, name=token, pdf_url='https://e.com/a.pdf',
+                                  status=status, open_id=f'open-{token}', token=token)
+    Document.objects.filter(id=doc.id).update(updated_at=timezone.now() - timedelta(minutes=minutes))
+    return doc
+
+
+@pytest.mark.django_db
+def test_reconcile_applies_progression_rules_to_stale_documents_only():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    signed = _stale(company.id, 'a')
+    regress = _stale(company.id, 'b')
+    failing = _stale(company.id, 'boom')
+    fresh = _stale(company.id, 'c', minutes=1)
+    done = _stale(company.id, 'd', status='signed')
+    zap = FakeZapSign({'a': 'signed', 'b': 'pending', 'c': 'signed', 'd': 'signed'})
+
+    summary, completed = reconcile_batch(batch_size=10, stale_seconds=600, use_case_factory=_factory(zap))
+
+    assert completed
+    assert sorted(zap.polled) == ['a', 'b', 'boom']
+    assert (summary.checked, summary.updated, summary.failed) == (3, 1, 1)
+    assert Document.objects.get(id=signed.id).status == 'signed'
+    # 'pending' no hace retroceder a un documento ya 'sent'
+    assert Document.objects.get(id=regress.id).status == 'sent'
+    assert Document.objects.get(id=failing.id).status == 'sent'
+    assert Document.objects.get(id=fresh.id).status == 'sent'
+    assert Document.objects.get(id=done.id).status == 'signed'
+
+
+@pytest.mark.django_db
+def test_each_run_polls_only_due_documents_and_backs_off_unchanged_ones():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    for i in range(5):
+        _stale(company.id, f'doc-{i}', minutes=60 - i)
+    zap = FakeZapSign({})
+
+    _, completed = reconcile_batch(batch_size=2, stale_seconds=600, use_case_factory=_factory(zap))
+    assert not completed
+    assert sorted(zap.polled) == ['doc-0', 'doc-1']
+
+    reconcile_batch(batch_size=2, stale_seconds=600, use_case_factory=_factory(zap))
+    _, completed = reconcile_batch(batch_size=2, stale_seconds=600, use_case_factory=_factory(zap))
+    assert completed
+    assert sorted(zap.polled) == [f'doc-{i}' for i in range(5)]
+
+    # La pasada siguiente no vuelve a consultar nada hasta que vence el backoff
+    zap.polled = []
+    assert reconcile_batch(batch_size=2, stale_seconds=600, use_case_factory=_factory(zap))[1]
+    assert zap.polled == []
+    doc = Document.objects.get(token='doc-0')
+    assert doc.reconcile_checks == 1
+    assert timedelta(seconds=590) < doc.reconcile_after - timezone.now() <= timedelta(seconds=600)
+
+    # Vencido, se consulta otra vez y la espera se duplica
+    Document.objects.filter(id=doc.id).update(reconcile_after=timezone.now() - timedelta(seconds=1))
+    reconcile_batch(batch_size=2, stale_seconds=600, use_case_factory=_factory(zap))
+    doc.refresh_from_db()
+    assert zap.polled == ['doc-0']
+    assert doc.reconcile_checks == 2
+    assert doc.reconcile_after - timezone.now() > timedelta(seconds=1190)
+
+
+@pytest.mark.django_db
+def test_documents_that_change_leave_the_backoff():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = _stale(company.id, 'a', status='pending')
+    Document.objects.filter(id=doc.id).update(reconcile_checks=3)
+    zap = FakeZapSign({'a': 'sent'})
+
+    summary, _ = reconcile_batch(batch_size=10, stale_seconds=600, use_case_factory=_factory(zap))
+
+    doc.refresh_from_db()
+    assert summary.updated_ids == [doc.id]
+    assert (doc.status, doc.reconcile_checks, doc.reconcile_after) == ('sent', 0, None)
+
+
+@pytest.mark.django_db
+def test_reconcile_never_rolls_back_a_status_written_by_a_webhook_meanwhile():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = _stale(company.id, 'a', status='pending')
+
+    class RacingZapSign(FakeZapSign):
+        def get_document(self, api_token, token):
+            # El webhook firma el documento mientras el reconciler consulta ZapSign
+            Document.objects.filter(id=doc.id).update(status='signed')
+            return super().get_document(api_token, token)
+
+    reconcile_batch(batch_size=10, stale_seconds=600, use_case_factory=_factory(RacingZapSign({'a': 'sent'})))
+
+    assert Document.objects.get(id=doc.id).status == 'signed'
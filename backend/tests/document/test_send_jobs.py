@@ -0,0 +1,120 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.use_cases.send_document_to_sign import SendDocumentToSignUseCase
+from modules.document.infrastructure.django_app.models import SendJob
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.infrastructure.send_job_runner import claim_send_jobs, run_send_job_batch
+from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
+
+
+class FakeZapSignClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, api_token, name, pdf_url):
+        return ZapSignCreateResult(open_id=None, token=None, status=None)
+
+    def send_for_sign(self, api_token, name, pdf_url, signers, external_id=None, check_existing=False):
+        self.calls += 1
+        return ZapSignCreateResult(open_id=f'open-{self.calls}', token='tok', status='pending')
+
+
+def _use_case_factory(zap):
+    def factory():
+        return SendDocumentToSignUseCase(
+            document_commands=DjangoDocumentRepository(),
+            document_queries=DjangoDocumentRepository(),
+            company_queries=DjangoCompanyRepository(),
+            signer_queries=DjangoSignerRepository(),
+            zap_sign_client=zap,
+        )
+    return factory
+
+
+def _document(client, auth_headers, company_id, signers=1):
+    doc = client.post(
+        "/api/documents/",
+        data=json.dumps({"company_id": company_id, "name": "Contrato", "pdf_url": "https://e.com/a.pdf"}),
+        content_type="application/json",
+        **auth_headers,
+    ).json()
+    for i in range(signers):
+        client.post(
+            "/api/signers/",
+            data=json.dumps({"document_id": doc["id"], "name": f"S{i}", "email": f"s{i}@example.com"}),
+            content_type="application/json",
+            **auth_headers,
+        )
+    return doc
+
+
+@pytest.mark.django_db
+def test_async_send_to_sign_returns_job_and_worker_completes_it(client, auth_headers, auth_company_id):
+    doc = _document(client, auth_headers, auth_company_id)
+
+    resp = client.post(f"/api/documents/{doc['id']}/send_to_sign/?async=1", **auth_headers)
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job['status'] == 'queued'
+    assert resp['Location'] == f"/api/documents/send_jobs/{job['id']}/"
+
+    # Reintentar mientras está en cola devuelve el mismo job
+    again = client.post(f"/api/documents/{doc['id']}/send_to_sign/", HTTP_PREFER='respond-async', **auth_headers)
+    assert again.json()['id'] == job['id']
+
+    zap = FakeZapSignClient()
+    assert run_send_job_batch(batch_size=10, use_case_factory=_use_case_factory(zap)) == 1
+    assert zap.calls == 1
+
+    status = client.get(f"/api/documents/send_jobs/{job['id']}/", **auth_headers).json()
+    assert status['status'] == 'succeeded'
+    assert status['attempts'] == 1
+    assert status['document']['open_id'] == 'open-1'
+    assert status['document']['status'] == 'pending'
+
+
+@pytest.mark.django_db
+def test_async_send_to_sign_validates_signers_before_enqueueing(client, auth_headers, auth_company_id):
+    doc = _document(client, auth_headers, auth_company_id, signers=0)
+
+    resp = client.post(f"/api/documents/{doc['id']}/send_to_sign/?async=1", **auth_headers)
+
+    assert resp.status_code == 400
+    assert SendJob.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_failed_send_is_reported_and_unknown_job_is_404(client, auth_headers, auth_company_id):
+    doc = _document(client, auth_headers, auth_company_id)
+    job_id = client.post(f"/api/documents/{doc['id']}/send_to_sign/?async=1", **auth_headers).json()['id']
+
+    class RejectingZapSign(FakeZapSignClient):
+        def send_for_sign(self, api_token, name, pdf_url, signers, external_id=None, check_existing=False):
+            return ZapSignCreateResult(open_id=None, token=None, status=None)
+
+    run_send_job_batch(use_case_factory=_use_case_factory(RejectingZapSign()))
+
+    status = client.get(f"/api/documents/send_jobs/{job_id}/", **auth_headers).json()
+    assert status['status'] == 'failed'
+    assert status['error']
+    missing = client.get("/api/documents/send_jobs/00000000-0000-0000-0000-000000000000/", **auth_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+def test_claim_reclaims_jobs_with_expired_lease(client, auth_headers, auth_company_id):
+    doc = _document(client, auth_headers, auth_company_id)
+    job_id = client.post(f"/api/documents/{doc['id']}/send_to_sign/?async=1", **auth_headers).json()['id']
+
+    assert [str(j.id) for j in claim_send_jobs(10, lease_seconds=60)] == [job_id]
+    assert claim_send_jobs(10, lease_seconds=60) == []
+
+    SendJob.objects.filter(id=job_id).update(started_at=timezone.now() - timedelta(seconds=120))
+    assert [str(j.id) for j in claim_send_jobs(10, lease_seconds=60)] == [job_id]
+    assert SendJob.objects.get(id=job_id).attempts == 2
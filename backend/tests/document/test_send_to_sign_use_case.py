@@ -9,7 +9,7 @@ from modules.signer.infrastructure.repositories.signer_repository_django import
 
 
 class FakeZapSign:
-    def send_for_sign(self, api_token: str, name: str, pdf_url: str, signers: list[dict]) -> ZapSignCreateResult:
+    def send_for_sign(self, api_token: str, name: str, pdf_url: str, signers: list[dict], external_id=None, check_existing=False) -> ZapSignCreateResult:
         return ZapSignCreateResult(open_id='oid', token='tok', status='sent')
 
 
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.domain.status import next_status
+from modules.document.infrastructure.django_app.models import Document
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+
+
+@pytest.fixture()
+def make_doc(db):
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+
+    def _make(status, open_id='oid', token=None):
+        return Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/a.pdf',
+                                       status=status, open_id=open_id, token=token)
+    return _make
+
+
+CASES = [
+    ('sent', 'signed'),
+    ('signed', 'pending'),
+    ('signed', 'signed'),
+    ('pending', 'failed'),
+    ('signed', 'error'),
+    ('error', 'failed'),
+    ('failed', 'failed'),
+    ('weird', 'created'),
+    ('Sent', 'pending'),
+    ('sent', 'refused'),
+]
+
+
+@pytest.mark.parametrize('current,incoming', CASES)
+def test_sql_transition_matches_state_machine(make_doc, current, incoming):
+    doc = make_doc(current)
+
+    changed = DjangoDocumentRepository().advance_status_by_open_id('oid', incoming, None)
+
+    expected = next_status(current, incoming)
+    doc.refresh_from_db()
+    assert changed is (expected is not None)
+    assert doc.status == (expected or current)
+
+
+def test_webhook_update_is_a_single_statement(make_doc):
+    make_doc('sent', token='old')
+    repo = DjangoDocumentRepository()
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert repo.advance_status_by_open_id('oid', 'signed', 'new') is True
+    assert len(ctx.captured_queries) == 1
+    assert ctx.captured_queries[0]['sql'].lstrip().upper().startswith('UPDATE')
+
+    # El token se actualiza aunque el estado no avance
+    assert repo.advance_status_by_open_id('oid', 'pending', 'newer') is True
+    doc = Document.objects.get(open_id='oid')
+    assert (doc.status, doc.token) == ('signed', 'newer')
+    assert repo.advance_status_by_open_id('oid', 'pending', 'newer') is False
+    assert repo.advance_status_by_open_id('missing', 'signed', None) is None
+
+
+def test_batch_sql_transitions_match_state_machine_in_one_statement(make_doc):
+    docs = [make_doc(current, open_id=f'oid-{i}') for i, (current, _) in enumerate(CASES)]
+    repo = DjangoDocumentRepository()
+
+    with CaptureQueriesContext(connection) as ctx:
+        changed = repo.advance_statuses_by_open_id({f'oid-{i}': (incoming, None) for i, (_, incoming) in enumerate(CASES)})
+
+    assert len(ctx.captured_queries) == 1
+    assert changed == sum(1 for current, incoming in CASES if next_status(current, incoming) is not None)
+    for doc, (current, incoming) in zip(docs, CASES):
+        doc.refresh_from_db()
+        assert doc.status == (next_status(current, incoming) or current)
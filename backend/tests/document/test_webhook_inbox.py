@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.use_cases.apply_zapsign_webhook_batch import ApplyZapSignWebhookBatchUseCase
+from modules.document.infrastructure.django_app.models import Document, WebhookInboxEvent
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.document.infrastructure.webhook_inbox import process_inbox_batch
+
+
+def _post(client, payload):
+    return client.post("/api/webhooks/zapsign/", data=json.dumps(payload), content_type="application/json")
+
+
+@pytest.fixture()
+def inbox(settings):
+    settings.ZAPSIGN_WEBHOOK_INBOX = True
+
+
+@pytest.mark.django_db
+def test_webhook_is_acked_without_touching_the_document(client, inbox):
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/a.pdf', status='sent', open_id='oid-1')
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = _post(client, {"open_id": "oid-1", "status": "signed"})
+
+    assert resp.status_code == 200
+    assert len(ctx.captured_queries) == 1
+    assert Document.objects.get(id=doc.id).status == 'sent'
+    assert WebhookInboxEvent.objects.count() == 1
+    assert _post(client, {"status": "signed"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_consumer_coalesces_events_per_open_id_into_one_transition(client, inbox):
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    a = Document.objects.create(company_id=company.id, name='A', pdf_url='https://e.com/a.pdf', status='sent', open_id='oid-a')
+    b = Document.objects.create(company_id=company.id, name='B', pdf_url='https://e.com/b.pdf', status='signed', open_id='oid-b')
+    for payload in (
+        {"open_id": "oid-a", "status": "pending", "token": "tok-a"},
+        {"open_id": "oid-a", "status": "signed"},
+        {"open_id": "oid-a", "status": "pending"},
+        {"open_id": "oid-b", "status": "pending"},
+        {"open_id": "missing", "status": "signed"},
+    ):
+        _post(client, payload)
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert process_inbox_batch(batch_size=100) == 5
+
+    a.refresh_from_db()
+    b.refresh_from_db()
+    assert (a.status, a.token) == ('signed', 'tok-a')
+    # Sin regresiones: b sigue firmado y no se escribe
+    assert b.status == 'signed'
+    assert WebhookInboxEvent.objects.count() == 0
+    # lock + documentos + update masivo + borrado, sin consultas por evento
+    assert len(ctx.captured_queries) <= 8
+    assert process_inbox_batch(batch_size=100) == 0
+
+
+@pytest.mark.django_db
+def test_batch_never_overwrites_a_newer_status_written_concurrently():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = Document.objects.create(company_id=company.id, name='C', pdf_url='https://e.com/a.pdf', status='created', open_id='oid-1')
+    repo = DjangoDocumentRepository()
+
+    class StaleQueries:
+        # Lee el documento y, antes de escribir, otro proceso lo firma
+        def get_many_by_open_ids(self, open_ids):
+            docs = repo.get_many_by_open_ids(open_ids)
+            Document.objects.filter(id=doc.id).update(status='signed')
+            return docs
+
+    use_case = ApplyZapSignWebhookBatchUseCase(document_commands=repo, document_queries=StaleQueries())
+    summary = use_case.execute([{"open_id": "oid-1", "status": "sent", "token": "tok"}])
+
+    doc.refresh_from_db()
+    assert (doc.status, doc.token) == ('signed', 'tok')
+    assert summary.updated == 1
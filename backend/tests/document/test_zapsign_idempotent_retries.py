@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from modules.company.infrastructure.repositories.company_repository_django import DjangoCompanyRepository
+from modules.document.application.dtos import ZapSignCreateResult
+from modules.document.application.use_cases.send_document_to_sign import SendDocumentToSignUseCase
+from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
+from modules.document.infrastructure.adapters.zapsign_rate_limiter import DbTokenBucketLimiter
+from modules.document.infrastructure.repositories.document_repository_django import DjangoDocumentRepository
+from modules.signer.infrastructure.repositories.signer_repository_django import DjangoSignerRepository
+
+
+class FakeZapSignApi:
+    """ZapSign en memoria: guarda documentos por external_id y permite inyectar fallos por POST."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict] = {}
+        self.posts = 0
+        self.lookups = 0
+        # Por número de POST: 'slow' (crea y tarda más que el timeout) o un status HTTP
+        self.faults: dict[int, object] = {}
+        # Listado: status HTTP forzado, si ignora el filtro external_id y tamaño de página
+        self.lookup_status: int | None = None
+        self.ignore_filter = False
+        self.page_size = 50
+
+
+@pytest.fixture()
+def zapsign():
+    api = FakeZapSignApi()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, code: int, payload) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # noqa: N802
+            api.lookups += 1
+            if api.lookup_status:
+                self._reply(api.lookup_status, {'detail': 'upstream error'})
+                return
+            query = parse_qs(urlparse(self.path).query)
+            external_id = query.get('external_id', [None])[0]
+            page = int(query.get('page', ['1'])[0])
+            results = [d for d in api.docs.values() if api.ignore_filter or d['external_id'] == external_id]
+            start = (page - 1) * api.page_size
+            has_next = start + api.page_size < len(results)
+            self._reply(200, {'count': len(results), 'results': results[start:start + api.page_size],
+                              'next': f'/docs/?page={page + 1}' if has_next else None})
+
+        def do_POST(self):  # noqa: N802
+            data = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            api.posts += 1
+            fault = api.faults.get(api.posts)
+            if isinstance(fault, int):
+                self._reply(fault, {'detail': 'upstream error'})
+                return
+            doc = {'open_id': 100 + api.posts, 'token': f'tok-{api.posts}', 'status': 'pending',
+                   'external_id': data.get('external_id')}
+            api.docs[doc['token']] = doc
+            if fault == 'slow':
+                time.sleep(0.5)
+            self._reply(200, doc)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', api
+    server.shutdown()
+
+
+def _client(url: str) -> HttpZapSignClient:
+    return HttpZapSignClient(
+        base_url=url,
+        timeout_seconds=0.2,
+        rate_limiter=DbTokenBucketLimiter(rate_per_second=0),
+        sleep=lambda s: None,
+    )
+
+
+SIGNERS = [{'name': 'A', 'email': 'a@e.com'}]
+
+
+def test_timeout_after_upstream_created_doc_reuses_it_instead_of_reposting(zapsign):
+    url, api = zapsign
+    api.faults[1] = 'slow'
+
+    result = _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS, external_id='key-1')
+
+    assert result.open_id == 101
+    assert api.posts == 1
+    assert api.lookups == 1
+
+
+def test_server_error_is_retried_with_same_external_id(zapsign):
+    url, api = zapsign
+    api.faults[1] = 503
+
+    result = _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS, external_id='key-2')
+
+    assert result.open_id == 102
+    assert api.posts == 2
+    assert [d['external_id'] for d in api.docs.values()] == ['key-2']
+
+
+def test_client_errors_and_missing_external_id_are_not_retried(zapsign):
+    url, api = zapsign
+    api.faults[1] = 400
+    api.faults[2] = 503
+
+    assert _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS, external_id='k').open_id is None
+    assert _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS).open_id is None
+    assert api.posts == 2
+    assert api.lookups == 0
+
+
+def test_lookup_failure_does_not_block_the_send(zapsign):
+    url, api = zapsign
+    api.lookup_status = 500
+
+    result = _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS,
+                                        external_id='key-3', check_existing=True)
+
+    assert result.open_id == 101
+    assert api.lookups == 1
+    assert api.posts == 1
+
+
+def test_lookup_pages_through_a_listing_that_ignores_the_filter(zapsign):
+    url, api = zapsign
+    api.ignore_filter = True
+    api.page_size = 2
+    for i in range(3):
+        api.docs[f'other-{i}'] = {'open_id': i, 'token': f'other-{i}', 'status': 'pending', 'external_id': f'x-{i}'}
+    api.docs['mine'] = {'open_id': 7, 'token': 'mine', 'status': 'pending', 'external_id': 'key-4'}
+
+    result = _client(url).send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', SIGNERS,
+                                        external_id='key-4', check_existing=True)
+
+    assert result.open_id == 7
+    assert api.lookups == 2
+    assert api.posts == 0
+
+
+class RecordingZapSign:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def send_for_sign(self, api_token, name, pdf_url, signers, external_id=None, check_existing=False):
+        self.calls.append((external_id, check_existing))
+        return ZapSignCreateResult(open_id=None, token=None, status=None)
+
+
+@pytest.mark.django_db
+def test_use_case_reuses_stored_key_and_checks_existing_on_resubmit():
+    company = DjangoCompanyRepository().create(name='Acme', api_token='t')
+    doc = DjangoDocumentRepository().create(company_id=company.id, name='Contrato', pdf_url='https://e.com/a.pdf')
+    DjangoSignerRepository().create(document_id=doc.id, name='Alice', email='alice@example.com')
+    zap = RecordingZapSign()
+    use_case = SendDocumentToSignUseCase(
+        document_commands=DjangoDocumentRepository(),
+        document_queries=DjangoDocumentRepository(),
+        company_queries=DjangoCompanyRepository(),
+        signer_queries=DjangoSignerRepository(),
+        zap_sign_client=zap,
+    )
+
+    use_case.execute(doc.id)
+    use_case.execute(doc.id)
+
+    (first_key, first_check), (second_key, second_check) = zap.calls
+    assert first_key and first_key == second_key
+    assert (first_check, second_check) == (False, True)
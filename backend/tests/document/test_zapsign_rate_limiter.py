@@ -0,0 +1,116 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
+from modules.document.infrastructure.adapters.zapsign_rate_limiter import (
+    DbTokenBucketLimiter,
+    RateLimitExceeded,
+    parse_retry_after,
+)
+from modules.shared.infrastructure.metrics import metrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _limiter(clock, **kwargs):
+    params = {'rate_per_second': 2.0, 'burst': 2.0, 'max_wait_seconds': 5.0}
+    params.update(kwargs)
+    return DbTokenBucketLimiter(clock=clock, sleep=clock.sleep, **params)
+
+
+@pytest.mark.django_db
+def test_bucket_allows_burst_then_spaces_reservations():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    waits = [limiter.reserve('tok') for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    # Otra empresa tiene su propio bucket
+    assert limiter.reserve('other') == 0.0
+    clock.now += 10
+    assert limiter.reserve('tok') == 0.0
+
+
+@pytest.mark.django_db
+def test_bucket_rejects_when_wait_exceeds_max_and_honours_retry_after():
+    clock = FakeClock()
+    limiter = _limiter(clock, max_wait_seconds=1.0)
+    limiter.reserve('tok')
+    limiter.reserve('tok')
+
+    limiter.penalize('tok', 3.0)
+    with pytest.raises(RateLimitExceeded):
+        limiter.reserve('tok')
+
+    clock.now += 3.0
+    assert limiter.reserve('tok') == 0.5
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:10 GMT', now=1445412480.0) == 10.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.fixture()
+def zapsign_server():
+    state = {'calls': 0, 'throttle': 1}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            state['calls'] += 1
+            if state['calls'] <= state['throttle']:
+                body, code, extra = b'{"detail": "throttled"}', 429, {'Retry-After': '2'}
+            else:
+                body, code, extra = json.dumps({'open_id': 42, 'token': 'tk', 'status': 'pending'}).encode(), 200, {}
+            self.send_response(code)
+            for k, v in extra.items():
+                self.send_header(k, v)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', state
+    server.shutdown()
+
+
+@pytest.mark.django_db
+def test_client_waits_out_429_and_retries(zapsign_server):
+    url, state = zapsign_server
+    metrics.reset()
+    clock = FakeClock()
+    client = HttpZapSignClient(base_url=url, rate_limiter=_limiter(clock))
+
+    result = client.send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', [{'name': 'A', 'email': 'a@e.com'}])
+
+    assert result.open_id == 42
+    assert state['calls'] == 2
+    # La reintentada espera el Retry-After completo
+    assert clock.slept == [2.0]
+    assert metrics.counter_value('zapsign_rate_limited_total') == 1
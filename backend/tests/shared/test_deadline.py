@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.db import connection
+
+from modules.shared.domain.errors import DeadlineExceeded
+from modules.shared.infrastructure.deadline import deadline_scope, remaining, timeout_for
+from modules.shared.infrastructure.resilience import get_upstream_guard
+
+
+def test_timeout_shrinks_to_remaining_budget_and_nested_scope_cannot_extend_it():
+    assert timeout_for(15.0, 'zapsign') == 15.0
+
+    with deadline_scope(0.5):
+        assert timeout_for(15.0, 'zapsign') <= 0.5
+        with deadline_scope(10):
+            assert remaining() <= 0.5
+        assert timeout_for(0.1, 'zapsign') == 0.1
+
+    assert remaining() is None
+
+
+def test_expired_budget_refuses_outbound_calls():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            timeout_for(15.0, 'n8n')
+
+
+@pytest.mark.django_db
+def test_expired_budget_refuses_db_queries():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+@pytest.mark.django_db
+def test_result_of_a_completed_upstream_call_can_be_persisted_after_the_deadline(settings):
+    settings.DEADLINE_PERSIST_GRACE_SECONDS = 0.2
+    with deadline_scope(0.01):
+        with get_upstream_guard('zapsign').protect():
+            # La llamada termina justo cuando vence el presupuesto
+            time.sleep(0.02)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        with pytest.raises(DeadlineExceeded):
+            timeout_for(15.0, 'zapsign')
+        time.sleep(0.2)
+        with pytest.raises(DeadlineExceeded):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+
+@pytest.mark.django_db
+def test_failed_upstream_call_gets_no_persist_grace():
+    with deadline_scope(0.01):
+        with pytest.raises(ConnectionError):
+            with get_upstream_guard('zapsign').protect():
+                time.sleep(0.02)
+                raise ConnectionError('reset')
+        with pytest.raises(DeadlineExceeded):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+
+@pytest.fixture()
+def slow_zapsign(settings):
+    calls = {'posts': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, payload) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # noqa: N802
+            self._reply({'results': []})
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            calls['posts'] += 1
+            time.sleep(1.0)
+            self._reply({'open_id': 1, 'token': 'tk', 'status': 'pending'})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.ZAPSIGN_API_BASE = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.ZAPSIGN_RATE_LIMIT_PER_SECOND = 0
+    yield calls
+    server.shutdown()
+
+
+@pytest.mark.django_db
+def test_send_to_sign_returns_504_within_client_budget(client, auth_headers, auth_company_id, slow_zapsign):
+    doc = client.post(
+        "/api/documents/",
+        data=json.dumps({"company_id": auth_company_id, "name": "Contrato", "pdf_url": "https://e.com/a.pdf"}),
+        content_type="application/json",
+        **auth_headers,
+    ).json()
+    client.post(
+        "/api/signers/",
+        data=json.dumps({"document_id": doc["id"], "name": "S", "email": "s@example.com"}),
+        content_type="application/json",
+        **auth_headers,
+    )
+
+    started = time.monotonic()
+    resp = client.post(f"/api/documents/{doc['id']}/send_to_sign/", HTTP_X_REQUEST_TIMEOUT='0.3', **auth_headers)
+
+    assert resp.status_code == 504
+    # El timeout de 15 s del adaptador se recortó al presupuesto de la petición
+    assert time.monotonic() - started < 1.0
+    assert slow_zapsign['posts'] == 1
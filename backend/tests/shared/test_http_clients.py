@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.analysis.infrastructure.adapters.automation_notifier_http import HttpAutomationNotifier
+from modules.shared.infrastructure import http_clients
+from modules.shared.infrastructure.http_clients import HttpClientRegistry
+from modules.shared.infrastructure.metrics import metrics
+
+
+@pytest.fixture()
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            status = 503 if self.path == '/down' else 200
+            self.send_response(status)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{srv.server_address[1]}'
+    srv.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    metrics.reset()
+    registry = HttpClientRegistry()
+    monkeypatch.setattr(http_clients, '_registry', registry)
+    yield registry
+    registry.close()
+
+
+def test_registry_shares_one_client_per_origin(server):
+    a = http_clients.get_http_client(f'{server}/docs')
+    b = http_clients.get_http_client(f'{server}/webhook/x')
+    other = http_clients.get_http_client('https://api.example.com/v1')
+
+    assert a is b
+    assert other is not a
+
+
+def test_notifier_reuses_keep_alive_connection(server, settings):
+    settings.AUTOMATION_API_KEY = 'k'
+    notifier = HttpAutomationNotifier(base_url=f'{server}/webhook')
+
+    for i in range(3):
+        notifier.notify_document_created(document_id=i, company_id=1, name='Doc', pdf_url='http://e.com/a.pdf')
+
+    assert metrics.counter_value('http_requests_total', upstream=server) == 3
+    assert metrics.counter_value('http_connections_opened_total', upstream=server) == 1
+    assert metrics.counter_value('http_connection_reuses_total', upstream=server) == 2
+
+
+def test_notifier_raises_on_http_error_when_not_best_effort(server):
+    import httpx
+
+    HttpAutomationNotifier(base_url=f'{server}/down').notify_document_created(
+        document_id=1, company_id=1, name='Doc', pdf_url='http://e.com/a.pdf'
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        HttpAutomationNotifier(base_url=f'{server}/down', best_effort=False).notify_document_created(
+            document_id=1, company_id=1, name='Doc', pdf_url='http://e.com/a.pdf'
+        )
+
+
+def test_close_discards_clients(fresh_registry, server):
+    client = http_clients.get_http_client(server)
+    http_clients.close_all_http_clients()
+
+    assert client.is_closed
+    assert http_clients.get_http_client(server) is not client
@@ -0,0 +1,20 @@
+import pytest
+
+from modules.shared.infrastructure.metrics import metrics
+
+
+@pytest.mark.django_db
+def test_metrics_requires_automation_key(client, settings):
+    settings.AUTOMATION_API_KEY = "secret-key"
+    resp = client.get("/api/metrics/")
+    assert resp.status_code == 401
+
+
+@pytest.mark.django_db
+def test_metrics_exposes_counters(client, settings):
+    settings.AUTOMATION_API_KEY = "secret-key"
+    metrics.inc("amqp_reconnects_total")
+
+    resp = client.get("/api/metrics/", HTTP_X_AUTOMATION_KEY="secret-key")
+    assert resp.status_code == 200
+    assert resp.json()["counters"]["amqp_reconnects_total"] >= 1
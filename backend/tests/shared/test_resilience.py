@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.document.infrastructure.adapters.zapsign_client_http import HttpZapSignClient
+from modules.document.infrastructure.adapters.zapsign_rate_limiter import DbTokenBucketLimiter
+from modules.shared.domain.errors import DeadlineExceeded, UpstreamUnavailable
+from modules.shared.infrastructure.deadline import deadline_scope
+from modules.shared.infrastructure.metrics import metrics
+from modules.shared.infrastructure.resilience import (
+    Bulkhead,
+    CircuitBreaker,
+    UpstreamGuard,
+    get_upstream_guard,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _guard(clock, max_concurrent=5):
+    breaker = CircuitBreaker('svc', window_size=4, minimum_calls=4, failure_rate_threshold=0.5, open_seconds=10, clock=clock)
+    return UpstreamGuard('svc', breaker, Bulkhead('svc', max_concurrent))
+
+
+def _fail(guard):
+    with pytest.raises(RuntimeError):
+        with guard.protect():
+            raise RuntimeError('boom')
+
+
+def test_breaker_opens_on_failure_rate_and_fails_fast():
+    metrics.reset()
+    clock = FakeClock()
+    guard = _guard(clock)
+    for _ in range(2):
+        with guard.protect():
+            pass
+    _fail(guard)
+    assert guard.breaker.state == 'closed'
+
+    _fail(guard)
+
+    assert guard.breaker.state == 'open'
+    assert metrics.gauge_value('circuit_breaker_state', upstream='svc') == 2
+    calls = []
+    with pytest.raises(UpstreamUnavailable) as exc:
+        with guard.protect():
+            calls.append(1)
+    assert calls == []
+    assert exc.value.retry_after_seconds == 10
+    assert metrics.counter_value('circuit_breaker_rejections_total', upstream='svc') == 1
+
+
+def test_half_open_probe_closes_or_reopens_the_circuit():
+    clock = FakeClock()
+    guard = _guard(clock)
+    for _ in range(4):
+        _fail(guard)
+    assert guard.breaker.state == 'open'
+
+    clock.now += 10
+    assert guard.breaker.state == 'half_open'
+    with guard.protect() as call:
+        call.mark_failure()
+    assert guard.breaker.state == 'open'
+
+    clock.now += 10
+    with guard.protect():
+        # Solo pasa una sonda a la vez
+        with pytest.raises(UpstreamUnavailable):
+            with guard.protect():
+                pass
+    assert guard.breaker.state == 'closed'
+    assert metrics.gauge_value('circuit_breaker_state', upstream='svc') == 0
+
+
+def test_bulkhead_rejects_when_full_without_tripping_breaker():
+    guard = _guard(FakeClock(), max_concurrent=1)
+    metrics.reset()
+
+    with guard.protect():
+        for _ in range(5):
+            with pytest.raises(UpstreamUnavailable):
+                with guard.protect():
+                    pass
+
+    assert guard.breaker.state == 'closed'
+    assert metrics.counter_value('bulkhead_rejections_total', upstream='svc') == 5
+    with guard.protect():
+        pass
+
+
+@pytest.fixture()
+def failing_zapsign():
+    state = {'calls': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            state['calls'] += 1
+            body = json.dumps({'detail': 'down'}).encode()
+            self.send_response(503)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', state
+    server.shutdown()
+
+
+@pytest.mark.django_db
+def test_zapsign_adapter_fails_fast_once_circuit_opens(failing_zapsign, settings):
+    settings.CIRCUIT_BREAKER_MIN_CALLS = 3
+    settings.ZAPSIGN_SEND_MAX_ATTEMPTS = 1
+    url, state = failing_zapsign
+    client = HttpZapSignClient(base_url=url, rate_limiter=DbTokenBucketLimiter(rate_per_second=0), sleep=lambda s: None)
+    signers = [{'name': 'A', 'email': 'a@e.com'}]
+
+    for _ in range(3):
+        assert client.send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', signers).open_id is None
+
+    with pytest.raises(UpstreamUnavailable):
+        client.send_for_sign('tok', 'Contrato', 'https://e.com/a.pdf', signers)
+    assert state['calls'] == 3
+    assert get_upstream_guard('zapsign').breaker.state == 'open'
+
+
+@pytest.mark.django_db
+def test_expired_caller_deadline_does_not_trip_the_breaker(failing_zapsign, settings):
+    settings.CIRCUIT_BREAKER_MIN_CALLS = 3
+    url, state = failing_zapsign
+    client = HttpZapSignClient(base_url=url, rate_limiter=DbTokenBucketLimiter(rate_per_second=0), sleep=lambda s: None)
+
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        for _ in range(10):
+            with pytest.raises(DeadlineExceeded):
+                client.get_document('tok', 'doc-token')
+    guard = get_upstream_guard('zapsign')
+    for _ in range(10):
+        with pytest.raises(DeadlineExceeded):
+            with guard.protect():
+                raise DeadlineExceeded('zapsign', 0.0)
+    # Un timeout provocado por el presupuesto del llamante tampoco es culpa del upstream
+    with deadline_scope(0.01):
+        for _ in range(10):
+            with pytest.raises(TimeoutError):
+                with guard.protect():
+                    time.sleep(0.02)
+                    raise TimeoutError('budget exhausted mid-call')
+
+    assert state['calls'] == 0
+    assert guard.breaker.state == 'closed'